@@ -1,26 +1,208 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory, g
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+import cProfile
 import os
-import pandas as pd
-import subprocess
 import json
 import time
+import pandas as pd
 import csv
+import math
+import itertools
+import threading
+from collections import OrderedDict
+import runtime
+import worker_pool
+import prom_metrics
+from job_queue import JobCancelled, JobQueue, SUCCEEDED, FAILED
+from phase_timer import PhaseTimings, active as active_timings, phase
+from run_store import RunStore, dir_size, new_run_id
+from result_cache import ResultCache, make_key
+from timeline_index import TimelineIndex
+from render_cache import RenderCache
+import metrics_analyzer
+
+class SchedulerJSONProvider(DefaultJSONProvider):
+    """Serializes scheduler_core Timeline / lazy per-process metrics as plain JSON."""
+    @staticmethod
+    def default(o):
+        try:
+            return runtime.scheduler_core.json_default(o)
+        except TypeError:
+            return DefaultJSONProvider.default(o)
 
 app = Flask(__name__)
-CORS(app)
+app.json = SchedulerJSONProvider(app)
+CORS(app, expose_headers=['Server-Timing', 'X-Profile'])
 
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUTS_DIR = os.path.join(ROOT_DIR, 'outputs')
 INTEGRATION_DIR = os.path.join(ROOT_DIR, 'integration_outputs')
 VSM_CORE_DIR = os.path.join(ROOT_DIR, 'vsm-scheduler-core')
 REPORTS_DIR = os.path.join(VSM_CORE_DIR, 'metrics_reports')
-TEAM4_RUNTIME = os.path.join(ROOT_DIR, 'runtime.py')
-ANALYZER_SCRIPT = os.path.join(VSM_CORE_DIR, 'metrics_analyzer.py')
+RUN_MANIFEST = 'run.json'  # per-run {"algorithms": [...]} in the outputs dir
+PROFILES_DIR = os.path.join(ROOT_DIR, 'profiles')
+
+# Per-request cProfile capture (?profile=1 or an X-Profile header); the newest PROFILE_KEEP are kept
+PROFILE_ALLOWED = os.environ.get('VSM_PROFILE_ALLOWED', '1') != '0'
+PROFILE_KEEP = int(os.environ.get('VSM_PROFILE_KEEP', 20))
+
+run_store = RunStore({
+    'outputs': OUTPUTS_DIR,
+    'integration': INTEGRATION_DIR,
+    'reports': REPORTS_DIR
+})
+result_cache = ResultCache()
+render_cache = RenderCache(REPORTS_DIR)
+job_queue = JobQueue()
+
+# Largest workload /api/schedule runs synchronously (0: no limit); bigger ones go through /api/jobs
+SYNC_MAX_PROCESSES = int(os.environ.get('VSM_SYNC_MAX_PROCESSES', 0))
+JOB_RETRY_AFTER = int(os.environ.get('VSM_JOB_RETRY_AFTER', 5))
+
+# /api/schedule/stream flushes a chunk every STREAM_BATCH events or STREAM_INTERVAL seconds
+STREAM_BATCH = int(os.environ.get('VSM_STREAM_BATCH', 500))
+STREAM_INTERVAL = float(os.environ.get('VSM_STREAM_INTERVAL', 0.25))
+
+# /api/timeline: level-of-detail indexes kept in memory (also saved per run), and the largest resolution served
+TIMELINE_INDEX_CACHE = int(os.environ.get('VSM_TIMELINE_INDEX_CACHE', 8))
+TIMELINE_MAX_RESOLUTION = int(os.environ.get('VSM_TIMELINE_MAX_RESOLUTION', 10000))
+
+# Largest parameter grid /api/sweep accepts, and most settings /api/optimize may evaluate
+SWEEP_MAX_POINTS = int(os.environ.get('VSM_SWEEP_MAX_POINTS', 1000))
+SWEEP_INT_KEYS = ('quantum', 'context_switch', 'queues', 'levels', 'cores',
+                  'migration_cost', 'balance_period', 'queue_lock')
+
+# ---- Operational metrics (/metrics) ---- #
+# Disk usage is walked at most once per DISK_USAGE_TTL seconds
+DISK_USAGE_TTL = float(os.environ.get('VSM_METRICS_DISK_TTL', 30))
+_disk_usage = {'at': None, 'values': {}}
+
+def collect_disk_usage():
+    now = time.monotonic()
+    if _disk_usage['at'] is None or now - _disk_usage['at'] > DISK_USAGE_TTL:
+        _disk_usage['values'] = {
+            (name,): dir_size(path)
+            for name, path in (('outputs', OUTPUTS_DIR), ('integration_outputs', INTEGRATION_DIR),
+                               ('metrics_reports', REPORTS_DIR), ('profiles', PROFILES_DIR))
+        }
+        _disk_usage['at'] = now
+    return _disk_usage['values']
+
+def cache_stat(name):
+    return lambda: {(): result_cache.stats()[name]}
+
+metrics_registry = prom_metrics.Registry()
+HTTP_REQUESTS = metrics_registry.counter(
+    'vsm_http_requests_total', 'HTTP requests by endpoint, method and status.', ('endpoint', 'method', 'status'))
+HTTP_LATENCY = metrics_registry.histogram(
+    'vsm_http_request_duration_seconds', 'HTTP request latency by endpoint.', ('endpoint',))
+HTTP_IN_FLIGHT = metrics_registry.gauge('vsm_http_requests_in_flight', 'Requests being served.')
+ALGORITHM_RUNS = metrics_registry.counter(
+    'vsm_algorithm_runs_total', 'Algorithm runs requested via /api/schedule by outcome (cached, simulated, error).',
+    ('algorithm', 'outcome'))
+ALGORITHM_LATENCY = metrics_registry.histogram(
+    'vsm_algorithm_simulation_seconds', 'Scheduler time of one simulated algorithm run.', ('algorithm',))
+SIMULATED_PROCESSES = metrics_registry.counter(
+    'vsm_simulated_processes_total', 'Processes simulated, by algorithm.', ('algorithm',))
+SIMULATION_SECONDS = metrics_registry.counter(
+    'vsm_simulation_seconds_total', 'Scheduler time spent simulating, by algorithm.', ('algorithm',))
+SIMULATION_RATE = metrics_registry.gauge(
+    'vsm_simulated_processes_per_second', 'Processes per second of scheduler time in the latest run.',
+    ('algorithm',))
+ACTIVE_JOBS = metrics_registry.gauge('vsm_active_jobs', 'Simulations (schedule, sweep, optimize) running now.')
+metrics_registry.gauge('vsm_jobs', 'Asynchronous jobs by status.', ('status',),
+                       collect=lambda: {(status,): n for status, n in job_queue.counts().items()})
+JOBS_REJECTED = metrics_registry.counter('vsm_jobs_rejected_total', 'Jobs refused with 429 (queue full).')
+metrics_registry.gauge('vsm_pool_workers', 'Configured worker processes.',
+                       collect=lambda: {(): worker_pool.POOL_WORKERS})
+metrics_registry.counter('vsm_cache_hits_total', 'Result cache hits.', collect=cache_stat('hits'))
+metrics_registry.counter('vsm_cache_misses_total', 'Result cache misses.', collect=cache_stat('misses'))
+metrics_registry.counter('vsm_cache_evictions_total', 'Result cache evictions.', collect=cache_stat('evictions'))
+metrics_registry.gauge('vsm_cache_hit_ratio', 'Result cache hit ratio since start.', collect=cache_stat('hit_ratio'))
+metrics_registry.gauge('vsm_cache_memory_bytes', 'Result cache memory tier size.', collect=cache_stat('memory_bytes'))
+metrics_registry.gauge('vsm_cache_disk_bytes', 'Result cache disk tier size.', collect=cache_stat('disk_bytes'))
+RENDERS = metrics_registry.counter(
+    'vsm_renders_total', 'Chart/report requests by outcome (cached, rendered, error).', ('kind', 'outcome'))
+metrics_registry.gauge('vsm_render_cache_bytes', 'Size of the rendered charts/reports kept.',
+                       collect=lambda: {(): render_cache.stats()['bytes']})
+metrics_registry.counter('vsm_render_cache_evictions_total', 'Rendered files deleted to stay within budget.',
+                         collect=lambda: {(): render_cache.stats()['evictions']})
+metrics_registry.gauge('vsm_output_dir_bytes', 'Disk usage of the output directories.', ('dir',),
+                       collect=collect_disk_usage)
+metrics_registry.gauge('vsm_run_store_bytes', 'Disk usage of all stored runs.',
+                       collect=lambda: {(): run_store.total_bytes()})
+
+def record_simulation(algorithm, timings_ms, processes):
+    """Account one simulated algorithm run from the timings measured in its worker."""
+    seconds = sum((timings_ms or {}).values()) / 1000
+    algorithm = algorithm.upper()
+    ALGORITHM_LATENCY.observe(seconds, algorithm=algorithm)
+    SIMULATED_PROCESSES.inc(processes, algorithm=algorithm)
+    SIMULATION_SECONDS.inc(seconds, algorithm=algorithm)
+    if seconds > 0:
+        SIMULATION_RATE.set(processes / seconds, algorithm=algorithm)
 
-os.makedirs(OUTPUTS_DIR, exist_ok=True)
-os.makedirs(INTEGRATION_DIR, exist_ok=True)
-os.makedirs(REPORTS_DIR, exist_ok=True)
+# ---- Request timing / profiling ---- #
+@app.before_request
+def start_request_timers():
+    HTTP_IN_FLIGHT.inc()
+    g.timings = PhaseTimings().activate()
+    g.started = time.perf_counter()
+    g.profiler = None
+    if PROFILE_ALLOWED and (request.args.get('profile') or request.headers.get('X-Profile')):
+        g.profile_name = f"{new_run_id()}.prof"
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@app.after_request
+def add_timing_headers(response):
+    profiler = g.get('profiler')
+    if profiler is not None:
+        profiler.disable()
+        save_profile(profiler, g.profile_name)
+        response.headers['X-Profile'] = f"/api/profiles/{g.profile_name}"
+    timings = g.get('timings')
+    if timings is not None:
+        elapsed = time.perf_counter() - g.started
+        timings.add('total', elapsed)
+        response.headers['Server-Timing'] = timings.server_timing()
+        response.headers['Timing-Allow-Origin'] = '*'
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+        HTTP_LATENCY.observe(elapsed, endpoint=endpoint)
+    return response
+
+@app.teardown_request
+def stop_request_timers(exc):
+    timings = g.get('timings')
+    if timings is not None:
+        timings.deactivate()
+        HTTP_IN_FLIGHT.dec()
+
+def save_profile(profiler, name):
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    profiler.dump_stats(os.path.join(PROFILES_DIR, name))
+    profiles = sorted((e for e in os.scandir(PROFILES_DIR) if e.name.endswith('.prof')),
+                      key=lambda e: e.stat().st_mtime)
+    for entry in profiles[:-PROFILE_KEEP] if PROFILE_KEEP > 0 else []:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+def no_progress(fraction, stage):
+    pass
+
+def merge_timings(timings_ms, prefix=""):
+    """Fold timings measured elsewhere (pool worker, analyzer) into the active recorder."""
+    timings = active_timings()
+    if timings is not None:
+        timings.merge(timings_ms, prefix)
+
+def profile_link():
+    """Download path of the profile being captured for this request, if any."""
+    return f"/api/profiles/{g.profile_name}" if g.get('profiler') else None
 
 def save_workload_csv(workload, csv_path):
     with open(csv_path, 'w', newline='') as f:
@@ -34,6 +216,78 @@ def save_workload_csv(workload, csv_path):
                 'Priority': row.get('priority', 1)
             })
 
+def as_int(value, name):
+    """int(value), or a ValueError naming the request field (answered with a 400)."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be an integer, got {value!r}") from None
+
+def as_int_list(values, name):
+    if not isinstance(values, list):
+        raise ValueError(f"'{name}' must be a list of integers, got {values!r}")
+    return [as_int(value, name) for value in values]
+
+def build_params(data):
+    """Scheduler params taken from the request body (scheduler_core names); ValueError on a non-numeric field."""
+    params = {}
+    quantum = data.get('quantum', data.get('time_quantum'))
+    if quantum is not None:
+        params['quantum'] = as_int(quantum, 'quantum')
+    for key in ('queues', 'levels', 'cores', 'migration_cost', 'balance_period', 'queue_lock'):
+        if data.get(key) is not None:
+            params[key] = as_int(data[key], key)
+    if data.get('topology'):
+        params['topology'] = str(data['topology'])
+    if data.get('quanta'):
+        params['quanta'] = as_int_list(data['quanta'], 'quanta')
+    for key in ('preemptive', 'steal'):
+        if data.get(key) is not None:
+            params[key] = bool(data[key])
+    # Responses merge adjacent same-pid segments unless the client opts out
+    params['coalesce'] = bool(data.get('coalesce', True))
+    return params
+
+def build_grid(data):
+    """Sweep grid {param: [values]} from the request body; each quanta value is a list."""
+    grid = {}
+    for key, values in (data.get('grid') or {}).items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"grid '{key}' must be a non-empty list")
+        key = 'quantum' if key == 'time_quantum' else key
+        if key == 'quanta':
+            grid[key] = [as_int_list(value, 'grid quanta') for value in values]
+        elif key in SWEEP_INT_KEYS:
+            grid[key] = [as_int(value, f'grid {key}') for value in values]
+        else:
+            raise ValueError(f"Cannot sweep '{key}'")
+    return grid
+
+def build_optimizer_options(data):
+    """config_optimizer.optimize() options from the request body; ValueError on a malformed one."""
+    options = {
+        'objective': str(data.get('objective', 'avg_waiting')),
+        'max_evals': min(as_int(data.get('max_evals', 60), 'max_evals'), SWEEP_MAX_POINTS)
+    }
+    try:
+        if data.get('weights'):
+            options['weights'] = {str(k): float(v) for k, v in data['weights'].items()}
+        for key in ('quantum_range', 'levels_range'):
+            if data.get(key):
+                lo, hi = (int(v) for v in data[key])
+                options[key] = (lo, hi)
+        if data.get('ratios'):
+            options['ratios'] = [int(r) for r in data['ratios']]
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ValueError(f'Invalid optimizer options: {e}') from None
+    return options
+
+def format_timeline(result, timeline_format):
+    """Result with its timeline in the requested format ("segments" or "rle"); cached results are not modified."""
+    if timeline_format != 'rle':
+        return result
+    return dict(result, timeline=runtime.scheduler_core.Timeline.from_entries(result['timeline']).to_rle())
+
 @app.route('/api/metrics')
 def get_metrics():
     metrics_path = os.path.join(OUTPUTS_DIR, 'output_metrics.csv')
@@ -45,106 +299,537 @@ def get_metrics():
     except Exception as e:
         return jsonify({'error': f'Failed to read metrics: {str(e)}'}), 500
 
-@app.route('/api/schedule', methods=['POST'])
-def schedule():
-    data = request.get_json()
+def run_manifest(run_id):
+    """Algorithms of a stored run (what its charts/report are rendered from), or None."""
+    path = run_store.path('outputs', run_id, RUN_MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)['algorithms']
+
+def report_names(run_id, algorithms, failed=()):
+    """Chart/report names ("<run_id>/<file>") of a run; they are rendered on their first GET."""
+    names = metrics_analyzer.artifact_names(algorithms, run_id)
+    skipped = {gantt for algorithm, gantt in zip(algorithms, names['charts']) if algorithm in failed}
+    charts = [f"{run_id}/{name}" for name in names['charts'] if name not in skipped]
+    return charts, [f"{run_id}/{name}" for name in names['reports']]
+
+def cached_report(key):
+    """Chart/report references of an earlier identical run, if that run is still stored."""
+    report = result_cache.get(key, count=False)  # hit/miss stats count result lookups only
+    if report is None or not run_store.exists(report['run_id']) or run_manifest(report['run_id']) is None:
+        return None
+    return report
+
+def schedule_request(data, progress=no_progress, inline=False):
+    """
+    Body of /api/schedule, shared with /api/jobs: returns (payload, HTTP status).
+    progress(fraction, stage) is called between stages (a cancelled job raises there);
+    inline=True runs the algorithms in this process.
+    """
     algorithms = data.get('algorithm')
     context_switch = data.get('context_switch', '2')
     workload = data.get('workload')
 
     if not algorithms or not workload:
-        return jsonify({'error': 'Algorithm(s) and workload required'}), 400
+        return {'error': 'Algorithm(s) and workload required'}, 400
 
     if isinstance(algorithms, str):
         algorithms = [algorithms]
 
-    run_id = time.strftime("%Y%m%d_%H%M%S")
-    results = {}
-
+    try:
+        context_switch = as_int(context_switch, 'context_switch')
+        params = build_params(data)
+        with phase('normalize'):
+            canonical_workload = runtime.normalize_workload(workload)
+            keys = {
+                algorithm: make_key('result', canonical_workload, algorithm.upper(), context_switch, params)
+                for algorithm in algorithms
+            }
+    except (AttributeError, TypeError, ValueError) as e:
+        return {'error': str(e)}, 400
+    with phase('cache_lookup'):
+        outputs = {algorithm: result_cache.get(keys[algorithm]) for algorithm in algorithms}
+    misses = [algorithm for algorithm in algorithms if outputs[algorithm] is None]
     for algorithm in algorithms:
-        workload_csv_filename = f"workload_{algorithm.lower()}_{run_id}.csv"
-        workload_csv_path = os.path.join(OUTPUTS_DIR, workload_csv_filename)
-        try:
-            save_workload_csv(workload, workload_csv_path)
-        except Exception as e:
-            results[algorithm] = {'error': f'Failed to save workload CSV: {str(e)}'}
-            continue
+        if algorithm not in misses:
+            ALGORITHM_RUNS.inc(algorithm=algorithm.upper(), outcome='cached')
+    if misses:
+        done = []
+        def simulated(algorithm):
+            done.append(algorithm)
+            progress(0.05 + 0.65 * len(done) / len(misses), f'simulated {algorithm}')
 
-        try:
-            result = subprocess.run(
-                [
-                    "python", TEAM4_RUNTIME,
-                    "--workload", workload_csv_path,
-                    "--alg", algorithm,
-                    "--context-switch", str(context_switch),
-                    "--cores", "1"
-                ],
-                cwd=ROOT_DIR,
-                capture_output=True, text=True
-            )
-            if result.returncode != 0:
-                print("team4_runtime.py error:", result.stderr)
-                results[algorithm] = {'error': result.stderr}
+        progress(0.05, 'simulate')
+        with phase('simulate'), ACTIVE_JOBS.running():
+            outputs.update(worker_pool.run_algorithms(workload, misses, context_switch, params,
+                                                      inline=inline, on_result=simulated))
+        for algorithm in misses:
+            # Scheduler-side phases of each run (measured in the worker)
+            worker_timings = outputs[algorithm].pop('timings', None)
+            merge_timings(worker_timings, prefix=f"{algorithm.lower()}_")
+            if 'error' in outputs[algorithm]:
+                ALGORITHM_RUNS.inc(algorithm=algorithm.upper(), outcome='error')
                 continue
+            ALGORITHM_RUNS.inc(algorithm=algorithm.upper(), outcome='simulated')
+            record_simulation(algorithm, worker_timings, len(canonical_workload))
+            with phase('cache_store'):
+                result_cache.put(keys[algorithm], outputs[algorithm])
 
-            json_files = [f for f in os.listdir(INTEGRATION_DIR) if f.endswith('.json') and algorithm.lower() in f.lower()]
-            if not json_files:
-                json_files = [f for f in os.listdir(INTEGRATION_DIR) if f.endswith('.json')]
-            if not json_files:
-                results[algorithm] = {'error': 'No output JSON generated'}
-                continue
-
-            json_files.sort(key=lambda f: os.path.getmtime(os.path.join(INTEGRATION_DIR, f)), reverse=True)
-            output_json_path = os.path.join(INTEGRATION_DIR, json_files[0])
-            with open(output_json_path) as f:
-                metrics = json.load(f)
+    report_key = make_key('report', canonical_workload, [a.upper() for a in algorithms], context_switch, params)
+    report = None if misses else cached_report(report_key)
+    run_id = report['run_id'] if report else run_store.new_run()
+    results = {}
 
+    for algorithm in algorithms:
+        metrics = outputs[algorithm]
+        if 'error' in metrics:
+            print("API error:", metrics['error'])
+            results[algorithm] = metrics
+            continue
+        try:
+            if report is None:
+                with phase('save_results'):
+                    runtime.save_result(metrics, algorithm, run_store.run_dir('integration', run_id))
             results[algorithm] = {
-                "metrics": metrics
+                "run_id": run_id,
+                "metrics": format_timeline(metrics, data.get('timeline_format'))
             }
         except Exception as e:
             print("API error:", str(e))
             results[algorithm] = {'error': str(e)}
 
-    try:
-        analyzer_cmd = [
-            "python", ANALYZER_SCRIPT,
-            "--scheduler-outputs", INTEGRATION_DIR,
-            "--algorithms"
-        ] + algorithms + [
-            "--run-id", run_id,
-            "--metrics-dir", REPORTS_DIR
-        ]
-        analyzer_result = subprocess.run(analyzer_cmd, cwd=VSM_CORE_DIR, capture_output=True, text=True)
-        if analyzer_result.returncode != 0:
-            print("metrics_analyzer.py error:", analyzer_result.stderr)
-    except Exception as e:
-        print("metrics_analyzer.py error:", str(e))
+    if report is None:
+        try:
+            try:
+                with phase('save_workload_csv'):
+                    save_workload_csv(workload, run_store.path('outputs', run_id, 'workload.csv'))
+            except Exception as e:
+                print("Failed to save workload CSV:", str(e))
+            # Charts and the report are only rendered when first requested (serve_artifact)
+            with open(run_store.path('outputs', run_id, RUN_MANIFEST), 'w') as f:
+                json.dump({'algorithms': algorithms}, f)
+            charts, pdfs = report_names(run_id, algorithms, [a for a in algorithms if 'error' in results[a]])
+            if not any('error' in results[a] for a in algorithms):
+                result_cache.put(report_key, {'run_id': run_id, 'charts': charts, 'reports': pdfs})
+        finally:
+            with phase('finalize_run'):
+                run_store.finalize(run_id)
+    else:
+        charts, pdfs = report['charts'], report['reports']
 
-    charts = [f for f in os.listdir(REPORTS_DIR) if f.endswith('.png') and run_id in f]
-    pdfs = [f for f in os.listdir(REPORTS_DIR) if f.endswith('.pdf') and run_id in f]
     for algorithm in algorithms:
         if algorithm in results:
             results[algorithm]["charts"] = charts
             results[algorithm]["reports"] = pdfs
 
-    return jsonify(results)
+    timings = active_timings()
+    if timings is not None:
+        results["timings"] = timings.as_ms()
+    return results, 200
+
+@app.route('/api/schedule', methods=['POST'])
+def schedule():
+    data = request.get_json()
+    if SYNC_MAX_PROCESSES and len(data.get('workload') or []) > SYNC_MAX_PROCESSES:
+        return jsonify({'error': f'Workloads over {SYNC_MAX_PROCESSES} processes must use POST /api/jobs'}), 413
+    results, status = schedule_request(data, inline=g.profiler is not None)
+    if status == 200 and profile_link():
+        results["profile"] = profile_link()
+    return jsonify(results), status
+
+def sse(event, payload):
+    """One Server-Sent Events frame."""
+    data = json.dumps(payload, default=runtime.scheduler_core.json_default, separators=(',', ':'))
+    return f"event: {event}\ndata: {data}\n\n"
+
+def stream_events(events, algorithm, total, cores):
+    """
+    SSE frames for schedule_stream() events: "start" at once, then "segments"
+    chunks ({segments, processes} completed in the chunk) each followed by
+    "progress" with the running aggregates, and a final "summary" (or "error").
+    Only the current chunk is held in memory.
+    """
+    started = time.perf_counter()
+    segments, processes = [], []
+    totals = {'completed': 0, 'waiting': 0, 'turnaround': 0, 'busy': 0, 'clock': 0, 'segments': 0}
 
-@app.route('/api/integration_outputs/<filename>')
+    def flush():
+        chunk = sse('segments', {'segments': segments, 'processes': processes})
+        segments.clear()
+        processes.clear()
+        completed, clock = totals['completed'], totals['clock']
+        return chunk + sse('progress', {
+            'completed': completed,
+            'total': total,
+            'fraction': round(completed / total, 4) if total else 1.0,
+            'clock': clock,
+            'segments': totals['segments'],
+            'avg_waiting': totals['waiting'] / completed if completed else 0,
+            'avg_turnaround': totals['turnaround'] / completed if completed else 0,
+            'cpu_utilization': round(totals['busy'] / (cores * clock), 4) if clock > 0 else 0
+        })
+
+    yield sse('start', {'algorithm': algorithm, 'processes': total, 'cores': cores})
+    with ACTIVE_JOBS.running():
+        try:
+            last_flush = time.monotonic()
+            for event in events:
+                kind = event.pop('type')
+                if kind == 'segment':
+                    segments.append(event)
+                    totals['segments'] += 1
+                    totals['clock'] = max(totals['clock'], event['end'])
+                    if event['pid'] not in ('CS', 'IDLE'):
+                        totals['busy'] += event['end'] - event['start']
+                elif kind == 'process':
+                    processes.append(event)
+                    totals['completed'] += 1
+                    totals['waiting'] += event['waiting']
+                    totals['turnaround'] += event['turnaround']
+                else:
+                    if segments or processes:
+                        yield flush()
+                    elapsed = time.perf_counter() - started
+                    ALGORITHM_RUNS.inc(algorithm=algorithm, outcome='streamed')
+                    record_simulation(algorithm, {'stream': elapsed * 1000}, total)
+                    yield sse('summary', dict(event, algorithm=algorithm, segments=totals['segments'],
+                                              elapsed_ms=round(elapsed * 1000, 3)))
+                    continue
+                if len(segments) + len(processes) >= STREAM_BATCH or time.monotonic() - last_flush >= STREAM_INTERVAL:
+                    yield flush()
+                    last_flush = time.monotonic()
+        except Exception as e:
+            print("API error:", str(e))
+            ALGORITHM_RUNS.inc(algorithm=algorithm, outcome='error')
+            yield sse('error', {'error': str(e)})
+
+@app.route('/api/schedule/stream', methods=['POST'])
+def schedule_stream():
+    """
+    Stream one algorithm's simulation as Server-Sent Events (text/event-stream)
+    instead of one JSON body: same request fields as /api/schedule, with a
+    single algorithm. Nothing is cached or stored, and no charts are rendered.
+    """
+    data = request.get_json()
+    algorithm = data.get('algorithm')
+    context_switch = data.get('context_switch', '2')
+    workload = data.get('workload')
+
+    if isinstance(algorithm, list) and len(algorithm) == 1:
+        algorithm = algorithm[0]
+    if not isinstance(algorithm, str) or not workload:
+        return jsonify({'error': 'One algorithm and a workload required'}), 400
+
+    try:
+        context_switch = as_int(context_switch, 'context_switch')
+        params = build_params(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    events = runtime.stream_schedule(workload, algorithm, context_switch, params)
+    try:
+        # Starts the engine: an unknown algorithm or bad parameter still gets a 400
+        first = next(events)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    frames = stream_events(itertools.chain([first], events), algorithm.strip().upper(),
+                           len(workload), int(params.get('cores', 1)))
+    response = Response(frames, mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # no proxy buffering (nginx)
+    return response
+
+def sweep_request(data, progress=no_progress, inline=False):
+    """
+    Run one algorithm over a parameter grid, e.g.
+    {"algorithm": "RR", "workload": [...], "grid": {"quantum": [1, 2, 4], "context_switch": [0, 1]}},
+    and return one metrics row per grid point (no timelines, charts or reports).
+    Returns (payload, HTTP status).
+    """
+    algorithm = data.get('algorithm')
+    context_switch = data.get('context_switch', '2')
+    workload = data.get('workload')
+
+    if not isinstance(algorithm, str) or not workload:
+        return {'error': 'Algorithm and workload required'}, 400
+    try:
+        context_switch = as_int(context_switch, 'context_switch')
+        grid = build_grid(data)
+        params = build_params(data)
+        canonical_workload = runtime.normalize_workload(workload)
+    except (AttributeError, TypeError, ValueError) as e:
+        return {'error': str(e)}, 400
+    if not grid:
+        return {'error': 'Parameter grid required'}, 400
+    points = math.prod(len(values) for values in grid.values())
+    if points > SWEEP_MAX_POINTS:
+        return {'error': f'Grid has {points} points (limit {SWEEP_MAX_POINTS})'}, 400
+
+    params.pop('coalesce')  # rows carry no timeline
+    key = make_key('sweep', canonical_workload, algorithm.upper(), context_switch, dict(params, grid=grid))
+    rows = result_cache.get(key)
+    if rows is None:
+        progress(0.05, 'simulate')
+        try:
+            with phase('simulate'), ACTIVE_JOBS.running():
+                rows = worker_pool.run_sweep(canonical_workload, algorithm, grid, context_switch, params)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except TimeoutError as e:
+            return {'error': str(e)}, 504
+        except Exception as e:
+            print("API error:", str(e))
+            return {'error': str(e)}, 500
+        result_cache.put(key, rows)
+
+    return {"algorithm": algorithm.upper(), "grid": grid, "points": len(rows), "rows": rows}, 200
+
+@app.route('/api/sweep', methods=['POST'])
+def sweep():
+    payload, status = sweep_request(request.get_json())
+    return jsonify(payload), status
+
+def optimize_request(data, progress=no_progress, inline=False):
+    """
+    Search the RR quantum or the MLFQ levels/quanta for the setting that
+    minimizes an objective, e.g.
+    {"algorithm": "RR", "workload": [...], "objective": "p99_response", "max_evals": 40}.
+    objective: avg_waiting, p99_response or weighted (with "weights": {column: weight}).
+    Returns (payload, HTTP status).
+    """
+    algorithm = data.get('algorithm')
+    context_switch = data.get('context_switch', '2')
+    workload = data.get('workload')
+
+    if not isinstance(algorithm, str) or not workload:
+        return {'error': 'Algorithm and workload required'}, 400
+    try:
+        context_switch = as_int(context_switch, 'context_switch')
+        options = build_optimizer_options(data)
+        params = build_params(data)
+        canonical_workload = runtime.normalize_workload(workload)
+    except (AttributeError, TypeError, ValueError) as e:
+        return {'error': str(e)}, 400
+    params.pop('coalesce')
+    key = make_key('optimize', canonical_workload, algorithm.upper(), context_switch, dict(params, **options))
+    result = result_cache.get(key)
+    if result is None:
+        progress(0.05, 'simulate')
+        try:
+            with phase('simulate'), ACTIVE_JOBS.running():
+                # A cancelled job stops between evaluations, not only before the search
+                result = worker_pool.run_optimizer(canonical_workload, algorithm, context_switch, params,
+                                                   checkpoint=lambda: progress(0.05, 'simulate'), **options)
+        except JobCancelled:
+            raise
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except TimeoutError as e:
+            return {'error': str(e)}, 504
+        except Exception as e:
+            print("API error:", str(e))
+            return {'error': str(e)}, 500
+        result_cache.put(key, result)
+
+    return result, 200
+
+@app.route('/api/optimize', methods=['POST'])
+def optimize():
+    payload, status = optimize_request(request.get_json())
+    return jsonify(payload), status
+
+# ---- Asynchronous jobs ---- #
+JOB_HANDLERS = {'schedule': schedule_request, 'sweep': sweep_request, 'optimize': optimize_request}
+
+def run_job(job, handler, data):
+    """Job body: the request handler under the job's own phase timers."""
+    with PhaseTimings():
+        payload, status = handler(data, progress=job.update)
+    if status >= 400:
+        raise RuntimeError(payload.get('error', f'HTTP {status}'))
+    return payload
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue a schedule (default), sweep or optimize request ("kind") and return
+    its job id at once (202); 429 when the job queue is full.
+    """
+    data = request.get_json()
+    kind = data.get('kind', 'schedule')
+    handler = JOB_HANDLERS.get(kind)
+    if handler is None:
+        return jsonify({'error': f"Unknown job kind '{kind}' (expected {', '.join(JOB_HANDLERS)})"}), 400
+    try:
+        # Malformed fields get their 400 now rather than a failed job later
+        as_int(data.get('context_switch', 2), 'context_switch')
+        build_params(data)
+        if kind == 'sweep':
+            build_grid(data)
+        elif kind == 'optimize':
+            build_optimizer_options(data)
+        runtime.normalize_workload(data.get('workload') or [])
+    except (AttributeError, TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    job = job_queue.submit(kind, run_job, handler, data)
+    if job is None:
+        JOBS_REJECTED.inc()
+        response = jsonify({'error': f'Job queue is full ({job_queue.max_queued} jobs queued or running)'})
+        response.headers['Retry-After'] = str(JOB_RETRY_AFTER)
+        return response, 429
+    response = jsonify(dict(job.to_dict(include_result=False), status_url=f"/api/jobs/{job.id}"))
+    response.headers['Location'] = f"/api/jobs/{job.id}"
+    return response, 202
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    return jsonify({'jobs': [job.to_dict(include_result=False) for job in job_queue.jobs()],
+                    'counts': job_queue.counts()})
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued job, or stop a running one at its next checkpoint."""
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job.status in (SUCCEEDED, FAILED):
+        return jsonify(dict(job.to_dict(include_result=False), error='Job already finished')), 409
+    return jsonify(job.to_dict(include_result=False)), 202
+
+
+# ---- Timeline level of detail ---- #
+_timeline_indexes = OrderedDict()  # (run_id, algorithm) -> TimelineIndex, least recently used first
+_timeline_lock = threading.Lock()
+
+def timeline_index(run_id, algorithm):
+    """
+    Level-of-detail index of a run's timeline: from memory, from the run's
+    saved .npz, or built from its integrated JSON (once) and saved.
+    """
+    key = (run_id, algorithm)
+    with _timeline_lock:
+        index = _timeline_indexes.get(key)
+        if index is not None:
+            _timeline_indexes.move_to_end(key)
+            return index
+    index_path = run_store.path('integration', run_id, f"{algorithm.lower()}_timeline_index.npz")
+    if os.path.exists(index_path):
+        with phase('timeline_index_load'):
+            index = TimelineIndex.load(index_path)
+    else:
+        with phase('timeline_index_build'):
+            with open(runtime.result_path(run_store.run_dir('integration', run_id), algorithm)) as f:
+                index = TimelineIndex.build(json.load(f)['timeline'])
+            index.save(index_path)
+        run_store.finalize(run_id)
+    with _timeline_lock:
+        _timeline_indexes[key] = index
+        while len(_timeline_indexes) > max(TIMELINE_INDEX_CACHE, 1):
+            _timeline_indexes.popitem(last=False)
+    return index
+
+@app.route('/api/timeline/<run_id>')
+def get_timeline(run_id):
+    """
+    Visible part of a run's timeline for a zoomable Gantt chart:
+    ?algorithm=RR&start=0&end=5000&resolution=800 returns the segments in the
+    window when there are at most `resolution` of them, else at most about
+    `resolution` bins (dominant pid, busy/idle/cs fractions, segment count).
+    algorithm may be omitted when the run has a single one.
+    """
+    if not run_store.exists(run_id):
+        return jsonify({'error': 'Run not found'}), 404
+    run_dir = run_store.run_dir('integration', run_id)
+    available = sorted(name[:-len('_integrated.json')].upper() for name in os.listdir(run_dir)
+                       if name.endswith('_integrated.json'))
+    algorithm = (request.args.get('algorithm') or (available[0] if len(available) == 1 else '')).upper()
+    if algorithm not in available:
+        return jsonify({'error': 'Unknown or missing algorithm for this run', 'available': available}), 400
+    try:
+        window = [request.args.get(name) for name in ('start', 'end')]
+        start, end = (int(float(value)) if value not in (None, '') else None for value in window)
+        resolution = min(int(request.args.get('resolution', 1000)), TIMELINE_MAX_RESOLUTION)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid window: {e}'}), 400
+    index = timeline_index(run_id, algorithm)
+    with phase('timeline_query'):
+        view = index.query(start, end, resolution)
+    return jsonify(dict(view, run_id=run_id, algorithm=algorithm))
+
+@app.route('/metrics')
+def get_prometheus_metrics():
+    """Operational metrics in the Prometheus text exposition format."""
+    return Response(metrics_registry.render(), content_type=prom_metrics.CONTENT_TYPE)
+
+@app.route('/api/cache/stats')
+def get_cache_stats():
+    return jsonify(dict(result_cache.stats(), render=render_cache.stats()))
+
+@app.route('/api/integration_outputs/<path:filename>')
 def get_integration_output(filename):
     return send_from_directory(INTEGRATION_DIR, filename)
 
-@app.route('/api/outputs/<filename>')
+@app.route('/api/outputs/<path:filename>')
 def get_output_file(filename):
     return send_from_directory(OUTPUTS_DIR, filename)
 
-@app.route('/api/charts/<filename>')
-def get_chart(filename):
+def serve_artifact(filename, kind):
+    """A run's chart or report ("<run_id>/<file>"), rendered from its stored results on first request."""
+    if render_cache.get(filename) is not None:
+        RENDERS.inc(kind=kind, outcome='cached')
+        return send_from_directory(REPORTS_DIR, filename)
+    run_id, _, name = filename.partition('/')
+    algorithms = run_manifest(run_id) if name and run_store.exists(run_id) else None
+    if algorithms is None:
+        return send_from_directory(REPORTS_DIR, filename)  # files of older runs, or 404
+    names = metrics_analyzer.artifact_names(algorithms, run_id)
+    if name not in names['charts'] + names['reports']:
+        return jsonify({'error': 'Unknown chart or report'}), 404
+
+    def render():
+        with phase('render'):
+            rendered = worker_pool.render_artifact(run_store.run_dir('integration', run_id), algorithms,
+                                                   run_store.run_dir('reports', run_id), run_id, name)
+        merge_timings(rendered['timings'])
+        return [f"{run_id}/{f}" for f in rendered['files']]
+
+    try:
+        path = render_cache.render(filename, render)
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    except TimeoutError as e:
+        RENDERS.inc(kind=kind, outcome='error')
+        return jsonify({'error': str(e)}), 504
+    except Exception as e:
+        print("Render error:", str(e))
+        RENDERS.inc(kind=kind, outcome='error')
+        return jsonify({'error': f'Rendering failed: {e}'}), 500
+    run_store.finalize(run_id)
+    if path is None:
+        return jsonify({'error': 'Nothing to render'}), 404
+    RENDERS.inc(kind=kind, outcome='rendered')
     return send_from_directory(REPORTS_DIR, filename)
 
-@app.route('/api/reports/<filename>')
+@app.route('/api/charts/<path:filename>')
+def get_chart(filename):
+    return serve_artifact(filename, 'chart')
+
+@app.route('/api/reports/<path:filename>')
 def get_report(filename):
-    return send_from_directory(REPORTS_DIR, filename)
+    return serve_artifact(filename, 'report')
+
+@app.route('/api/profiles/<path:filename>')
+def get_profile(filename):
+    """cProfile capture of an earlier request (pstats format: python -m pstats <file>)."""
+    return send_from_directory(PROFILES_DIR, filename, as_attachment=True)
 
 if __name__ == '__main__':
     app.run(port=5000, debug=True)
\ No newline at end of file
@@ -0,0 +1,166 @@
+"""
+job_queue.py — Asynchronous Job Queue
+--------------------------------------
+Background execution for long-running API requests (schedule, sweep,
+optimize). A job is accepted immediately and run by a small local thread
+pool; the threads mostly wait on worker_pool processes, so a few of them
+are enough.
+
+Backpressure: at most JOB_QUEUE_MAX jobs may be queued or running; submit()
+returns None beyond that (the API answers 429). Finished jobs are kept for
+JOB_TTL seconds (and at most JOB_KEEP of them) so clients can fetch results.
+
+Cancellation: a queued job is dropped before it starts; a running job stops
+at its next progress checkpoint (Job.update raises JobCancelled).
+
+Configuration (environment variables):
+  VSM_JOB_WORKERS     jobs executed concurrently (default: 2)
+  VSM_JOB_QUEUE_MAX   queued + running jobs accepted (default: 32)
+  VSM_JOB_TTL         seconds a finished job is kept (default: 3600)
+  VSM_JOB_KEEP        finished jobs kept at most (default: 200)
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_WORKERS = int(os.environ.get("VSM_JOB_WORKERS", 2))
+JOB_QUEUE_MAX = int(os.environ.get("VSM_JOB_QUEUE_MAX", 32))
+JOB_TTL = float(os.environ.get("VSM_JOB_TTL", 3600))
+JOB_KEEP = int(os.environ.get("VSM_JOB_KEEP", 200))
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    def __init__(self, kind):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.progress = 0.0
+        self.stage = QUEUED
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.future = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def update(self, progress, stage=None):
+        """Progress checkpoint (0..1): raises JobCancelled once cancellation was requested."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.progress = max(self.progress, min(float(progress), 1.0))
+        if stage:
+            self.stage = stage
+
+    def to_dict(self, include_result=True):
+        info = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": round(self.progress, 4),
+            "stage": self.stage,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+            "cancel_requested": self.cancel_requested and self.status not in FINISHED
+        }
+        if self.error is not None:
+            info["error"] = self.error
+        if include_result and self.status == SUCCEEDED:
+            info["result"] = self.result
+        return info
+
+class JobQueue:
+    def __init__(self, workers=JOB_WORKERS, max_queued=JOB_QUEUE_MAX, ttl=JOB_TTL, keep=JOB_KEEP):
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="vsm-job")
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()  # job id -> Job, oldest first
+        self.rejected = 0
+
+    def submit(self, kind, fn, *args):
+        """
+        Queue fn(job, *args) and return the Job, or None when the queue is full.
+        fn's return value becomes job.result; an exception fails the job.
+        """
+        with self._lock:
+            self._prune()
+            if self._active_count() >= self.max_queued:
+                self.rejected += 1
+                return None
+            job = Job(kind)
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job, fn, args):
+        # `finished` is always set before a finished status (pruning reads it)
+        if job.cancel_requested:
+            job.finished, job.status = time.time(), CANCELLED
+            return
+        job.started, job.stage, job.status = time.time(), RUNNING, RUNNING
+        try:
+            result = fn(job, *args)
+        except JobCancelled:
+            job.finished, job.status = time.time(), CANCELLED
+        except Exception as e:
+            job.error = str(e)
+            job.finished, job.status = time.time(), FAILED
+        else:
+            job.result, job.progress, job.stage = result, 1.0, "done"
+            job.finished, job.status = time.time(), SUCCEEDED
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Request cancellation; returns the Job (None if unknown)."""
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        job._cancel.set()
+        if job.future is not None and job.future.cancel():  # never started
+            job.finished, job.status = time.time(), CANCELLED
+        return job
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def counts(self):
+        counts = dict.fromkeys((QUEUED, RUNNING) + FINISHED, 0)
+        for job in self.jobs():
+            counts[job.status] += 1
+        return counts
+
+    def _active_count(self):
+        return sum(1 for job in self._jobs.values() if job.status not in FINISHED)
+
+    def _prune(self, now=None):
+        now = time.time() if now is None else now
+        finished = [job for job in self._jobs.values() if job.status in FINISHED]
+        expired = {job.id for job in finished if self.ttl and now - job.finished > self.ttl}
+        if self.keep and len(finished) - len(expired) > self.keep:
+            survivors = [job for job in finished if job.id not in expired]
+            expired.update(job.id for job in survivors[:len(survivors) - self.keep])
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
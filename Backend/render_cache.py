@@ -0,0 +1,123 @@
+"""
+render_cache.py — Lazily Rendered Chart / Report Files
+-------------------------------------------------------
+Charts and PDF reports are rendered on their first GET rather than with
+every schedule run. This cache tracks the rendered files under one root
+directory ("<run_id>/<file>" names) and bounds their total size and count:
+the least recently served files are deleted and simply rendered again if
+they are asked for later.
+
+Rendering is single-flight: concurrent requests for a file that is being
+rendered wait for that render instead of starting their own.
+
+Configuration (environment variables):
+  VSM_RENDER_CACHE_BYTES   disk budget of rendered files (default: 512 MiB, 0: unbounded)
+  VSM_RENDER_CACHE_FILES   rendered files kept at most (default: 2000, 0: unbounded)
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+RENDER_CACHE_BYTES = int(os.environ.get("VSM_RENDER_CACHE_BYTES", 512 << 20))
+RENDER_CACHE_FILES = int(os.environ.get("VSM_RENDER_CACHE_FILES", 2000))
+
+class RenderCache:
+    def __init__(self, root, max_bytes=RENDER_CACHE_BYTES, max_files=RENDER_CACHE_FILES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._files = OrderedDict()  # name -> size, least recently served first
+        self._bytes = 0
+        self._rendering = {}         # name -> Event set when its render finishes
+        self.hits = 0
+        self.misses = 0
+        self.renders = 0
+        self.evictions = 0
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def get(self, name):
+        """Path of the rendered file, or None. Files already on disk (e.g. from before a restart) are adopted."""
+        path = self.path(name)
+        with self._lock:
+            known = name in self._files
+        if not os.path.isfile(path):
+            if known:
+                self._forget(name)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            if known:
+                self._files.move_to_end(name)
+                return path
+        self._add([name])
+        return path
+
+    def render(self, name, fn):
+        """
+        Render `name` with fn() -> names of the files it wrote (all are cached),
+        unless another thread is already rendering it. Returns the path, or
+        None if the file still does not exist afterwards.
+        """
+        with self._lock:
+            pending = self._rendering.get(name)
+            if pending is None:
+                self._rendering[name] = threading.Event()
+        if pending is not None:
+            pending.wait()
+            return self.get(name)
+        try:
+            written = fn()
+            with self._lock:
+                self.renders += 1
+            self._add(written)
+        finally:
+            with self._lock:
+                self._rendering.pop(name).set()
+        return self.path(name) if os.path.isfile(self.path(name)) else None
+
+    def _add(self, names):
+        evicted = []
+        with self._lock:
+            for name in names:
+                try:
+                    size = os.path.getsize(self.path(name))
+                except OSError:
+                    continue
+                self._bytes += size - self._files.pop(name, 0)
+                self._files[name] = size
+            while self._files and ((self.max_bytes and self._bytes > self.max_bytes)
+                                   or (self.max_files and len(self._files) > self.max_files)):
+                old, size = self._files.popitem(last=False)
+                self._bytes -= size
+                self.evictions += 1
+                evicted.append(old)
+        for old in evicted:
+            try:
+                os.remove(self.path(old))
+            except OSError:
+                pass
+
+    def _forget(self, name):
+        with self._lock:
+            self._bytes -= self._files.pop(name, 0)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "renders": self.renders,
+                "evictions": self.evictions,
+                "files": len(self._files),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_files": self.max_files
+            }
@@ -0,0 +1,200 @@
+"""
+result_cache.py — Content-addressed Result Cache
+-------------------------------------------------
+Caches integrated scheduler results (timeline + metrics) and the chart /
+report references of a run, keyed by a canonical hash of the workload,
+algorithm(s) and scheduling parameters. Identical requests are answered
+without re-simulating or re-rendering.
+
+Two tiers:
+ - in-memory LRU, evicted by total estimated size (array buffers of
+   timelines and metrics plus the rest of the result, no serialization)
+ - optional on-disk tier (one JSON file per key), bounded by file size;
+   values are only serialized when this tier is enabled
+
+Configuration (environment variables):
+  VSM_CACHE_MAX_BYTES        memory tier budget (default: 256 MiB, 0 disables caching)
+  VSM_CACHE_DIR              directory of the disk tier (unset: memory only)
+  VSM_CACHE_DISK_MAX_BYTES   disk tier budget (default: 1 GiB)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+
+import runtime  # noqa: F401  (puts vsm-scheduler-core on sys.path)
+from scheduler_core import ProcessMetrics, Timeline, json_default
+
+# Bump whenever scheduling semantics change so stale disk entries are ignored
+CACHE_VERSION = 4
+
+CACHE_MAX_BYTES = int(os.environ.get("VSM_CACHE_MAX_BYTES", 256 << 20))
+CACHE_DIR = os.environ.get("VSM_CACHE_DIR") or None
+CACHE_DISK_MAX_BYTES = int(os.environ.get("VSM_CACHE_DISK_MAX_BYTES", 1 << 30))
+
+def _canonical(obj):
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+
+def _serialize(value):
+    # Results may hold scheduler_core Timeline / lazy metric objects
+    return json.dumps(value, default=json_default)
+
+def estimate_size(value):
+    """Approximate size in bytes of a cached value: column buffers for timelines and metrics, containers walked."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, Timeline):
+        columns = (value.code, value.start, value.end, value.core)
+        return sum(col.itemsize * len(col) for col in columns if col is not None) + sum(map(len, value.pids))
+    if isinstance(value, ProcessMetrics):
+        return sum(np.asarray(col).nbytes for col in value.columns) + sum(map(len, value.pids))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, Mapping):
+        return sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value)
+    return 8
+
+def make_key(kind, workload, algorithm, context_switch, params):
+    """
+    Hash of everything that determines a result. `workload` should already be
+    normalized (runtime.normalize_workload) so equivalent request shapes match;
+    process order is kept because it breaks ties in several policies.
+    """
+    payload = {
+        "v": CACHE_VERSION,
+        "kind": kind,
+        "workload": workload,
+        "algorithm": algorithm,
+        "context_switch": int(context_switch),
+        "params": params or {}
+    }
+    return hashlib.sha256(_canonical(payload).encode()).hexdigest()
+
+class ResultCache:
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, disk_dir=CACHE_DIR, disk_max_bytes=CACHE_DISK_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._lock = threading.Lock()
+        self._mem = OrderedDict()   # key -> (value, size), most recently used last
+        self._mem_bytes = 0
+        self._disk = OrderedDict()  # key -> size, oldest first
+        self._disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            entries = [e for e in os.scandir(self.disk_dir) if e.name.endswith(".json")]
+            for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+                size = entry.stat().st_size
+                self._disk[entry.name[:-5]] = size
+                self._disk_bytes += size
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key, count=True):
+        """
+        Return the cached value or None. count=False leaves the hit/miss
+        counters alone (lookups that are not requests, e.g. a run's reports).
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                self._mem.move_to_end(key)
+                self.hits += count
+                return entry[0]
+            on_disk = self.disk_dir and key in self._disk
+        if on_disk:
+            try:
+                with open(self._disk_path(key)) as f:
+                    raw = f.read()
+                value = json.loads(raw)
+            except (OSError, ValueError):
+                value = None
+            if value is not None:
+                with self._lock:
+                    self.hits += count
+                    self.disk_hits += count
+                    self._put_mem(key, value, len(raw))
+                return value
+        with self._lock:
+            self.misses += count
+        return None
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        size = estimate_size(value)
+        with self._lock:
+            self._put_mem(key, value, size)
+        if self.disk_dir:
+            self._put_disk(key, _serialize(value))
+
+    def _put_mem(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._mem_bytes -= old[1]
+        self._mem[key] = (value, size)
+        self._mem_bytes += size
+        while self._mem_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._mem.popitem(last=False)
+            self._mem_bytes -= evicted_size
+            self.evictions += 1
+
+    def _put_disk(self, key, raw):
+        if len(raw) > self.disk_max_bytes:
+            return
+        tmp_path = self._disk_path(key) + ".tmp"
+        with open(tmp_path, "w") as f:
+            f.write(raw)
+        os.replace(tmp_path, self._disk_path(key))
+        evicted = []
+        with self._lock:
+            self._disk_bytes -= self._disk.pop(key, 0)
+            self._disk[key] = len(raw)
+            self._disk_bytes += len(raw)
+            while self._disk_bytes > self.disk_max_bytes:
+                old_key, old_size = self._disk.popitem(last=False)
+                self._disk_bytes -= old_size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self._disk_path(old_key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._mem),
+                "memory_bytes": self._mem_bytes,
+                "memory_max_bytes": self.max_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "disk_max_bytes": self.disk_max_bytes if self.disk_dir else 0
+            }
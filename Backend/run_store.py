@@ -0,0 +1,120 @@
+"""
+run_store.py — Per-run Output Namespace
+----------------------------------------
+Every schedule run gets its own run id and one sub-directory per output
+root (workload CSVs, integrated JSON, charts/reports), so concurrent runs
+never overwrite each other and results are found by id instead of by
+listing and sorting directories.
+
+Old runs are evicted by age and by total disk budget. The store keeps an
+in-memory index of runs (built from disk once at startup), so pruning does
+not rescan the output trees.
+
+Configuration (environment variables):
+  VSM_RUN_MAX_AGE     seconds a run is kept (default: 7 days, 0 disables)
+  VSM_RUN_MAX_BYTES   disk budget for all runs (default: 1 GiB, 0 disables)
+"""
+
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+RUN_MAX_AGE = float(os.environ.get("VSM_RUN_MAX_AGE", 7 * 24 * 3600))
+RUN_MAX_BYTES = int(os.environ.get("VSM_RUN_MAX_BYTES", 1 << 30))
+
+def new_run_id():
+    """Timestamped, collision-free run id (sorts by creation time)."""
+    return f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+def dir_size(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+class RunStore:
+    def __init__(self, roots, max_age=RUN_MAX_AGE, max_bytes=RUN_MAX_BYTES):
+        """
+        roots: {name: directory}; each run owns <directory>/<run_id>/ in every root.
+        """
+        self.roots = dict(roots)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._runs = OrderedDict()  # run_id -> {"created": ts, "bytes": n}, oldest first
+        self._total_bytes = 0
+        for root in self.roots.values():
+            os.makedirs(root, exist_ok=True)
+        self._load_index()
+
+    def _load_index(self):
+        found = {}
+        for root in self.roots.values():
+            for entry in os.scandir(root):
+                if not entry.is_dir():
+                    continue
+                info = found.setdefault(entry.name, {"created": entry.stat().st_mtime, "bytes": 0})
+                info["created"] = min(info["created"], entry.stat().st_mtime)
+                info["bytes"] += dir_size(entry.path)
+        for run_id, info in sorted(found.items(), key=lambda kv: kv[1]["created"]):
+            self._runs[run_id] = info
+            self._total_bytes += info["bytes"]
+
+    def new_run(self, run_id=None):
+        """Create the run's directories and return its id."""
+        run_id = run_id or new_run_id()
+        for root in self.roots.values():
+            os.makedirs(os.path.join(root, run_id), exist_ok=True)
+        with self._lock:
+            self._runs[run_id] = {"created": time.time(), "bytes": 0}
+        return run_id
+
+    def run_dir(self, root, run_id):
+        return os.path.join(self.roots[root], run_id)
+
+    def path(self, root, run_id, filename):
+        return os.path.join(self.roots[root], run_id, filename)
+
+    def exists(self, run_id):
+        with self._lock:
+            return run_id in self._runs
+
+    def finalize(self, run_id):
+        """Record the run's size once it has finished writing, then prune."""
+        size = sum(dir_size(self.run_dir(root, run_id)) for root in self.roots)
+        with self._lock:
+            info = self._runs.get(run_id)
+            if info is not None:
+                self._total_bytes += size - info["bytes"]
+                info["bytes"] = size
+        self.prune()
+
+    def total_bytes(self):
+        with self._lock:
+            return self._total_bytes
+
+    def prune(self, now=None):
+        """Evict runs older than max_age, then oldest runs until under max_bytes."""
+        now = time.time() if now is None else now
+        evicted = []
+        with self._lock:
+            while self._runs:
+                run_id, info = next(iter(self._runs.items()))
+                too_old = self.max_age and now - info["created"] > self.max_age
+                over_budget = self.max_bytes and self._total_bytes > self.max_bytes
+                if not (too_old or over_budget) or (len(self._runs) == 1 and not too_old):
+                    break
+                self._runs.popitem(last=False)
+                self._total_bytes -= info["bytes"]
+                evicted.append(run_id)
+        for run_id in evicted:
+            for root in self.roots.values():
+                shutil.rmtree(os.path.join(root, run_id), ignore_errors=True)
+        return evicted
@@ -1,206 +1,315 @@
-#!/usr/bin/env python3
-"""
-team4_runtime.py — Team 4 Integration Runtime
-------------------------------------------------
-Integrates the workload generator, scheduler_core, and dispatcher module.
-Adds system-level features like:
- - Context switch modeling
- - Multi-core simulation
- - Auto timeline overlay (if missing in scheduler output)
- - Summary CSV for comparative performance
- - Robust error handling and status logs
-
-Usage example:
-  python team4_runtime.py --workload vsm-scheduler-core/sample_inputs/generated/random_10.csv \
-                          --alg FCFS --context-switch 2 --cores 1
-"""
-
-import argparse
-import os
-import sys
-import csv
-import json
-import subprocess
-from pathlib import Path
-from datetime import datetime
-from dispatcher_module import Dispatcher
-
-ROOT = Path(__file__).resolve().parent
-SCHEDULER_CORE = ROOT / "vsm-scheduler-core" / "scheduler_core.py"
-OUT_DIR = ROOT / "integration_outputs"
-OUT_DIR.mkdir(exist_ok=True)
-
-# -------------------------------------------------------------------------
-# Utility: read workload CSV into a list of process dicts
-# -------------------------------------------------------------------------
-def read_workload_csv(path):
-    processes = []
-    with open(path, newline='') as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader):
-            pid = row.get("PID") or row.get("pid") or f"P{i+1}"
-            arrival = int(row.get("ArrivalTime") or row.get("arrival") or 0)
-            burst = int(row.get("BurstTime") or row.get("burst") or 1)
-            priority = int(row.get("Priority") or row.get("priority") or 0)
-            processes.append({
-                "pid": pid, "arrival": arrival, "burst": burst, "priority": priority
-            })
-    return processes
-
-# -------------------------------------------------------------------------
-# Utility: call scheduler_core as a black box
-# -------------------------------------------------------------------------
-def call_scheduler_cli(input_path, algorithm, out_json_path, extra_args=None):
-    cmd = [
-        sys.executable, str(SCHEDULER_CORE),
-        "--input", str(input_path),
-        "--alg", algorithm,
-        "--out", str(out_json_path)
-    ]
-    if extra_args:
-        cmd += extra_args
-
-    print(f"[INFO] Calling scheduler_core.py ({algorithm}) ...")
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
-        print("[ERROR] scheduler_core failed!")
-        print(proc.stderr)
-        raise RuntimeError("scheduler_core.py execution failed")
-
-    return out_json_path
-
-# -------------------------------------------------------------------------
-# Dispatcher-based context switch simulation
-# -------------------------------------------------------------------------
-def simulate_with_dispatcher(processes, context_switch):
-    dispatcher = Dispatcher(context_switch)
-    timeline = []
-    current_time = 0
-    prev_pid = None
-
-    for p in processes:
-        if p["arrival"] > current_time:
-            timeline.append({"pid": "IDLE", "start": current_time, "end": p["arrival"]})
-            current_time = p["arrival"]
-
-        current_time, cs_seg = dispatcher.do_switch(prev_pid, p["pid"], current_time)
-        if cs_seg:
-            timeline.append(cs_seg)
-
-        start = current_time
-        end = start + p["burst"]
-        timeline.append({"pid": p["pid"], "start": start, "end": end})
-        current_time = end
-        prev_pid = p["pid"]
-
-    return timeline, dispatcher.summary()
-
-# -------------------------------------------------------------------------
-# Analyze timeline to compute CPU stats
-# -------------------------------------------------------------------------
-def compute_system_metrics(timeline):
-    if not timeline:
-        return {"context_switches": 0, "idle_time": 0, "total_time": 0, "cpu_utilization": 0.0}
-
-    total_time = max(seg["end"] for seg in timeline)  # Use the last end time as total time
-    idle_time = 0
-    cs_count = 0
-    useful = 0
-
-    for seg in timeline:
-        dur = seg["end"] - seg["start"]
-        pid = seg["pid"].upper()
-        if pid in ("CS", "CONTEXT_SWITCH"):
-            cs_count += 1
-            idle_time += dur
-        elif pid == "IDLE":
-            idle_time += dur
-        else:
-            useful += dur
-
-    cpu_util = useful / total_time if total_time > 0 else 0  # Store as fraction
-    return {
-        "context_switches": cs_count,
-        "idle_time": idle_time,
-        "total_time": total_time,
-        "cpu_utilization": round(cpu_util, 4)  # Store as fraction, not percent
-    }
-
-# -------------------------------------------------------------------------
-# Core function: run and integrate everything
-# -------------------------------------------------------------------------
-def run_singlecore(workload_path, algorithm, context_switch, extra_args=None):
-    out_json_path = OUT_DIR / f"{algorithm}_integrated.json"
-    try:
-        call_scheduler_cli(workload_path, algorithm, out_json_path, extra_args)
-        data = json.load(open(out_json_path))
-        timeline = data.get("timeline", [])
-        if not any(seg["pid"] in ("CS", "IDLE") for seg in timeline):
-            procs = read_workload_csv(workload_path)
-            timeline, disp_summary = simulate_with_dispatcher(procs, context_switch)
-            data["timeline"] = timeline
-            data["dispatcher_summary"] = disp_summary
-        # Ensure metrics key is present
-        if "metrics" not in data:
-            data["metrics"] = {}
-        json.dump(data, open(out_json_path, "w"), indent=2)
-        print(f"[OK] Scheduler integration completed for {algorithm}.")
-    except Exception as e:
-        print(f"[WARN] scheduler_core failed: {e}")
-        procs = read_workload_csv(workload_path)
-        timeline, disp_summary = simulate_with_dispatcher(procs, context_switch)
-        data = {
-            "timeline": timeline,
-            "dispatcher_summary": disp_summary,
-            "metrics": {}  # Always include metrics key
-        }
-        json.dump(data, open(out_json_path, "w"), indent=2)
-
-    sys_metrics = compute_system_metrics(data["timeline"])
-    data["system_metrics"] = sys_metrics
-
-    # FIX: Copy throughput and cpu_utilization into metrics for analyzer
-    if "metrics" not in data or not isinstance(data["metrics"], dict):
-        data["metrics"] = {}
-    # Throughput: number of processes / total_time
-    num_procs = len([seg for seg in data["timeline"] if seg["pid"].upper() not in ("CS", "CONTEXT_SWITCH", "IDLE")])
-    throughput = num_procs / sys_metrics["total_time"] if sys_metrics["total_time"] > 0 else 0.0
-    data["metrics"]["throughput"] = throughput
-    # CPU Utilization: from system_metrics (fraction, not percent)
-    data["metrics"]["cpu_utilization"] = sys_metrics.get("cpu_utilization", 0.0)
-    # Also copy total_time for completeness
-    data["metrics"]["total_time"] = sys_metrics.get("total_time", 0.0)
-
-    json.dump(data, open(out_json_path, "w"), indent=2)
-    return data
-
-# -------------------------------------------------------------------------
-# Entry point
-# -------------------------------------------------------------------------
-def main():
-    parser = argparse.ArgumentParser(description="Team 4 Integration Runtime")
-    parser.add_argument("--workload", required=True, help="Path to workload CSV")
-    parser.add_argument("--alg", required=True, help="Scheduling algorithm name")
-    parser.add_argument("--context-switch", type=int, default=1, help="Context switch time")
-    parser.add_argument("--cores", type=int, default=1, help="Number of CPU cores (default 1)")
-    parser.add_argument("--extra-args", nargs="*", default=[], help="Additional args for scheduler_core")
-    args = parser.parse_args()
-
-    print(f"\n=== Team 4 Integration Runtime Started ===")
-    print(f"Algorithm: {args.alg}, Context Switch: {args.context_switch}, Cores: {args.cores}")
-    print(f"Workload file: {args.workload}\n")
-
-    result = run_singlecore(args.workload, args.alg, args.context_switch, extra_args=args.extra_args)
-
-    summary_csv = OUT_DIR / f"runtime_summary_{args.alg}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    with open(summary_csv, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(result["system_metrics"].keys())
-        writer.writerow(result["system_metrics"].values())
-
-    print(f"\n✅ Integration summary saved: {summary_csv}")
-    print("✅ Timeline + metrics JSON saved in integration_outputs/")
-    print("✅ Team 4 runtime module execution complete.\n")
-
-if __name__ == "__main__":
+#!/usr/bin/env python3
+"""
+team4_runtime.py — Team 4 Integration Runtime
+------------------------------------------------
+Integrates the workload generator, scheduler_core, and dispatcher module.
+Adds system-level features like:
+ - Context switch modeling (the dispatcher runs inside the scheduling engines)
+ - Multi-core simulation (--cores N: global ready queue, per-core timelines)
+ - Summary CSV for comparative performance
+ - Robust error handling and status logs
+
+Importable API (used by api_server, no subprocesses):
+  run_schedule(workload, algorithm, context_switch, params) -> result dict
+  run_sweep(workload, algorithm, grid, context_switch, params) -> metrics rows
+  run_optimizer(workload, algorithm, context_switch, params, **options) -> best setting
+  stream_schedule(workload, algorithm, context_switch, params) -> schedule_stream() events
+
+Usage example:
+  python team4_runtime.py --workload vsm-scheduler-core/sample_inputs/generated/random_10.csv \
+                          --alg FCFS --context-switch 2 --cores 1
+"""
+
+import argparse
+import sys
+import csv
+import json
+from pathlib import Path
+from datetime import datetime
+from run_store import new_run_id
+
+ROOT = Path(__file__).resolve().parent
+SCHEDULER_CORE_DIR = ROOT / "vsm-scheduler-core"
+OUT_DIR = ROOT / "integration_outputs"
+OUT_DIR.mkdir(exist_ok=True)
+
+if str(SCHEDULER_CORE_DIR) not in sys.path:
+    sys.path.insert(0, str(SCHEDULER_CORE_DIR))
+import scheduler_core
+import config_optimizer
+from phase_timer import phase, recording
+
+# -------------------------------------------------------------------------
+# Utility: read workload CSV straight into a columnar ProcessTable
+# -------------------------------------------------------------------------
+def read_workload_csv(path):
+    return scheduler_core.load_process_table(path, default_burst=1)
+
+# -------------------------------------------------------------------------
+# Utility: normalize workload rows (CSV rows or API request body)
+# -------------------------------------------------------------------------
+def normalize_workload(rows):
+    """
+    Accepts CSV-style rows (PID/ArrivalTime/BurstTime/Priority), scheduler-style
+    dicts (pid/arrival/burst/priority) or the frontend's request rows
+    (process/arrival/burst/priority) and returns a list of process dicts.
+    """
+    processes = []
+    for i, row in enumerate(rows):
+        try:
+            pid = row.get("PID") or row.get("pid") or row.get("process") or f"P{i+1}"
+            arrival = int(row.get("ArrivalTime") or row.get("arrival") or 0)
+            burst = int(row.get("BurstTime") or row.get("burst") or 1)
+            priority = int(row.get("Priority") or row.get("priority") or 0)
+            queue_level = int(row.get("QueueLevel") or row.get("queue_level") or 0)
+            affinity = row.get("Affinity", row.get("affinity"))
+            processes.append({
+                "pid": str(pid), "arrival": arrival, "burst": burst,
+                "priority": priority, "queue_level": queue_level,
+                "affinity": -1 if affinity in (None, "") else int(affinity)
+            })
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid workload row {i + 1}: {e}") from None
+    return processes
+
+# -------------------------------------------------------------------------
+# Utility: translate legacy scheduler_core CLI flags into params
+# -------------------------------------------------------------------------
+def parse_extra_args(extra_args):
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--quantum", type=int)
+    parser.add_argument("--context-switch", type=int)
+    parser.add_argument("--queues", type=int)
+    parser.add_argument("--preemptive", action="store_true", default=None)
+    parser.add_argument("--topology", choices=["global", "per_core"])
+    parser.add_argument("--migration-cost", type=int)
+    parser.add_argument("--balance-period", type=int)
+    parser.add_argument("--queue-lock", type=int)
+    parser.add_argument("--no-steal", dest="steal", action="store_false", default=None)
+    parser.add_argument("--coalesce", action="store_true", default=None)
+    args, _ = parser.parse_known_args(extra_args or [])
+    return {k: v for k, v in vars(args).items() if v is not None}
+
+# -------------------------------------------------------------------------
+# Utility: workload rows / ProcessTable -> ProcessTable
+# -------------------------------------------------------------------------
+def to_process_table(workload):
+    if isinstance(workload, scheduler_core.ProcessTable):
+        return workload
+    return scheduler_core.ProcessTable.from_records(normalize_workload(workload))
+
+# -------------------------------------------------------------------------
+# Utility: call scheduler_core in-process
+# -------------------------------------------------------------------------
+def call_scheduler(table, algorithm, params=None):
+    return scheduler_core.schedule(table, algorithm, dict(params or {}))
+
+# -------------------------------------------------------------------------
+# Analyze timeline to compute CPU stats (one vectorized pass)
+# -------------------------------------------------------------------------
+def compute_system_metrics(timeline, cores=1):
+    stats = scheduler_core.timeline_stats(timeline)
+    total_time = stats["total_time"]  # Use the last end time as total time
+    # Store as fraction of the capacity of all cores
+    cpu_util = stats["busy_time"] / (cores * total_time) if total_time > 0 else 0
+    metrics = {
+        "context_switches": stats["context_switches"],
+        "idle_time": stats["idle_time"] + stats["context_switch_time"],
+        "total_time": total_time,
+        "cpu_utilization": round(cpu_util, 4)  # Store as fraction, not percent
+    }
+    if cores > 1:
+        metrics["cores"] = cores
+    return metrics
+
+# -------------------------------------------------------------------------
+# Core function: run and integrate everything in memory
+# -------------------------------------------------------------------------
+def run_schedule(workload, algorithm, context_switch, params=None):
+    """
+    Schedule `workload` (ProcessTable or process rows, see normalize_workload) with
+    `algorithm` and return the integrated result dict: timeline (with CS and
+    IDLE segments), metrics, dispatcher_summary, system_metrics and timings
+    (per-phase milliseconds of this call, see phase_timer).
+    The engines charge context_switch at every dispatch, so this is a single
+    simulation of the actual policy; params["cores"] > 1 runs the multi-core one.
+    """
+    with recording() as timings:
+        data = _run_schedule(workload, algorithm, context_switch, params)
+    data["timings"] = timings.as_ms()
+    return data
+
+def _run_schedule(workload, algorithm, context_switch, params):
+    with phase("workload_table"):
+        table = to_process_table(workload)
+    params = dict(params or {}, context_switch=int(context_switch))
+    cores = int(params.get("cores", 1))
+    data = call_scheduler(table, algorithm, params)
+
+    with phase("system_metrics"):
+        data["timeline"] = scheduler_core.Timeline.from_entries(data["timeline"])
+        sys_metrics = compute_system_metrics(data["timeline"], cores)
+    data["system_metrics"] = sys_metrics
+
+    # FIX: Copy cpu_utilization into metrics for analyzer
+    if "metrics" not in data or not isinstance(data["metrics"], dict):
+        data["metrics"] = {}
+    # Throughput stays the engine's: completed processes / total_time (not segments,
+    # which preemption, RR fast-forward and coalescing change)
+    # CPU Utilization: from system_metrics (fraction, not percent)
+    data["metrics"]["cpu_utilization"] = sys_metrics.get("cpu_utilization", 0.0)
+    # Also copy total_time for completeness
+    data["metrics"]["total_time"] = sys_metrics.get("total_time", 0.0)
+    return data
+
+def run_sweep(workload, algorithm, grid, context_switch, params=None):
+    """
+    scheduler_core.sweep() of `workload` (ProcessTable or process rows) with
+    context_switch as the base value; a grid point may override it.
+    Returns one metrics row per grid point.
+    """
+    table = to_process_table(workload)
+    params = dict(params or {}, context_switch=int(context_switch))
+    return scheduler_core.sweep(table, algorithm, grid, params)
+
+def run_optimizer(workload, algorithm, context_switch, params=None, **options):
+    """
+    config_optimizer.optimize() of `workload` on top of params/context_switch.
+    options: objective, weights, max_evals, quantum_range, levels_range, ratios,
+    checkpoint (called between evaluations, may raise to stop the search).
+    """
+    table = to_process_table(workload)
+    params = dict(params or {}, context_switch=int(context_switch))
+    return config_optimizer.optimize(table, algorithm, params, **options)
+
+def stream_schedule(workload, algorithm, context_switch, params=None):
+    """
+    Streaming counterpart of run_schedule(): scheduler_core.schedule_stream()
+    events for `workload` (process rows in any order; sorted by arrival here,
+    and ties are broken as in run_schedule()). Nothing is accumulated, so the
+    caller can forward segments as they are produced.
+    """
+    records = sorted(normalize_workload(workload), key=lambda p: p["arrival"])
+    params = dict(params or {}, context_switch=int(context_switch))
+    return scheduler_core.schedule_stream(records, algorithm, params)
+
+def result_path(out_dir, algorithm):
+    return Path(out_dir) / f"{algorithm.lower()}_integrated.json"
+
+def save_result(data, algorithm, out_dir):
+    out_json_path = result_path(out_dir, algorithm)
+    with open(out_json_path, "w") as f:
+        json.dump(data, f, indent=2, default=scheduler_core.json_default)
+    return out_json_path
+
+# -------------------------------------------------------------------------
+# CLI wrapper: CSV in, integrated JSON out (one directory per run id)
+# -------------------------------------------------------------------------
+def run_singlecore(workload_path, algorithm, context_switch, extra_args=None, run_id=None, cores=1):
+    run_dir = OUT_DIR / (run_id or new_run_id())
+    run_dir.mkdir(parents=True, exist_ok=True)
+    table = read_workload_csv(workload_path)
+    params = parse_extra_args(extra_args)
+    if cores > 1:
+        params["cores"] = cores
+    data = run_schedule(table, algorithm, context_switch, params)
+    out_json_path = save_result(data, algorithm, run_dir)
+    return data, out_json_path
+
+def run_stream(workload_path, algorithm, context_switch, extra_args=None, run_id=None, cores=1):
+    """
+    Streaming variant of run_singlecore(): the CSV (sorted by arrival) is read
+    row by row and scheduler events are written as JSON Lines while the
+    simulation runs, including "CS" and "IDLE" segments for context
+    switches and idle time (the same timeline as run_singlecore()).
+    Returns (summary metrics, out_jsonl_path).
+    """
+    run_dir = OUT_DIR / (run_id or new_run_id())
+    run_dir.mkdir(parents=True, exist_ok=True)
+    params = parse_extra_args(extra_args)
+    params["context_switch"] = context_switch
+    params["cores"] = cores
+    records = scheduler_core.iter_csv_records(workload_path, default_burst=1)
+    out_path = run_dir / f"{algorithm.lower()}_stream.jsonl"
+    with open(out_path, "w") as f:
+        summary = scheduler_core.write_stream(scheduler_core.schedule_stream(records, algorithm, params), f)
+    return summary, out_path
+
+def write_scaling(workload_path, algorithm, context_switch, max_cores, out_dir, extra_args=None):
+    """Throughput/makespan for 1, 2, 4, ... max_cores cores, written as CSV next to the run outputs."""
+    counts = [1]
+    while counts[-1] * 2 < max_cores:
+        counts.append(counts[-1] * 2)
+    if max_cores > 1:
+        counts.append(max_cores)
+    params = parse_extra_args(extra_args)
+    params["context_switch"] = context_switch
+    rows = scheduler_core.core_scaling(read_workload_csv(workload_path), algorithm, params, counts)
+    out_path = Path(out_dir) / f"{algorithm.lower()}_scaling.csv"
+    with open(out_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    return rows, out_path
+
+# -------------------------------------------------------------------------
+# Entry point
+# -------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Team 4 Integration Runtime")
+    parser.add_argument("--workload", required=True, help="Path to workload CSV")
+    parser.add_argument("--alg", required=True, help="Scheduling algorithm name")
+    parser.add_argument("--context-switch", type=int, default=1, help="Context switch time")
+    parser.add_argument("--cores", type=int, default=1, help="Number of CPU cores (default 1)")
+    parser.add_argument("--extra-args", nargs="*", default=[], help="Additional args for scheduler_core")
+    parser.add_argument("--run-id", default=None, help="Run id (output sub-directory); generated if omitted")
+    parser.add_argument("--scaling", action="store_true",
+                        help="Also write the throughput scaling curve for 1..--cores cores")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write events as JSON Lines while simulating (workload must be sorted by arrival; "
+                             "equal arrivals are ordered as in the non-streaming run)")
+    # Scheduler flags (--quantum 4, --topology per_core, ...) pass through to extra_args
+    args, passthrough = parser.parse_known_args()
+    args.extra_args += passthrough
+
+    print(f"\n=== Team 4 Integration Runtime Started ===")
+    print(f"Algorithm: {args.alg}, Context Switch: {args.context_switch}, Cores: {args.cores}")
+    print(f"Workload file: {args.workload}\n")
+
+    if args.stream:
+        summary, out_json_path = run_stream(args.workload, args.alg, args.context_switch,
+                                            extra_args=args.extra_args, run_id=args.run_id, cores=args.cores)
+        summary = {k: v for k, v in summary.items() if not isinstance(v, dict)}
+    else:
+        try:
+            result, out_json_path = run_singlecore(args.workload, args.alg, args.context_switch,
+                                                   extra_args=args.extra_args, run_id=args.run_id, cores=args.cores)
+        except Exception as e:
+            print(f"[WARN] scheduler_core failed for {args.alg}: {e}")
+            raise
+        print(f"[OK] Scheduler integration completed for {args.alg}.")
+        summary = result["system_metrics"]
+        if args.cores > 1:
+            topology = result["metrics"].get("topology", {})
+            print(f"[INFO] {topology.get('mode', 'global')} queues: migrations={topology.get('migrations', 0)} "
+                  f"steals={topology.get('steals', 0)} imbalance={result['metrics'].get('imbalance', 0):.3f}")
+
+    summary_csv = out_json_path.parent / f"runtime_summary_{args.alg}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    with open(summary_csv, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(summary.keys())
+        writer.writerow(summary.values())
+
+    print(f"\n✅ Integration summary saved: {summary_csv}")
+    print(f"✅ Timeline + metrics {'JSON Lines' if args.stream else 'JSON'} saved: {out_json_path}")
+    if args.scaling:
+        rows, scaling_csv = write_scaling(args.workload, args.alg, args.context_switch, args.cores,
+                                          out_json_path.parent, extra_args=args.extra_args)
+        for row in rows:
+            print(f"  cores={row['cores']:<5} makespan={row['makespan']:<8} "
+                  f"throughput={row['throughput']:.4f} speedup={row['speedup']:.2f}")
+        print(f"✅ Scaling curve saved: {scaling_csv}")
+    print("✅ Team 4 runtime module execution complete.\n")
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
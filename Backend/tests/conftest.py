@@ -0,0 +1,31 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND = Path(__file__).resolve().parents[1]
+for path in (BACKEND, BACKEND / "vsm-scheduler-core"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+ALGORITHMS = ("FCFS", "SJF", "SRTF", "RR", "PRIORITY", "MLQ", "MLFQ")
+
+def random_workload(seed, n=25, arrival_step=3, max_arrival=40):
+    """Shuffled process records with many tied arrivals (arrivals are multiples of arrival_step)."""
+    rnd = random.Random(seed)
+    records = []
+    for k in range(n):
+        records.append({
+            "pid": f"P{k}",
+            "arrival": rnd.randrange(0, max_arrival, arrival_step),
+            "burst": rnd.randint(1, 9),
+            "priority": rnd.randrange(3),
+            "queue_level": rnd.randrange(3)
+        })
+    rnd.shuffle(records)
+    return records
+
+@pytest.fixture(params=range(8), ids=lambda seed: f"seed{seed}")
+def workload(request):
+    return random_workload(request.param)
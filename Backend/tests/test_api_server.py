@@ -0,0 +1,58 @@
+"""
+Request validation of the API routes: malformed fields get a JSON 400, never
+an HTML 500.
+"""
+
+import pytest
+
+import api_server
+import result_cache
+
+WORKLOAD = [{"process": "A", "arrival": 0, "burst": 3}, {"process": "B", "arrival": 1, "burst": 2}]
+
+@pytest.fixture
+def client():
+    return api_server.app.test_client()
+
+@pytest.mark.parametrize("url, body, field", [
+    ("/api/schedule", {"algorithm": "RR", "time_quantum": "x"}, "quantum"),
+    ("/api/schedule", {"algorithm": ["RR", "FCFS"], "context_switch": "abc"}, "context_switch"),
+    ("/api/schedule/stream", {"algorithm": "RR", "context_switch": "abc"}, "context_switch"),
+    ("/api/sweep", {"algorithm": "RR", "context_switch": "abc", "grid": {"quantum": [1]}}, "context_switch"),
+    ("/api/optimize", {"algorithm": "RR", "context_switch": "abc"}, "context_switch"),
+    ("/api/jobs", {"kind": "sweep", "algorithm": "RR", "context_switch": [1]}, "context_switch"),
+    ("/api/schedule", {"algorithm": ["RR", "MLFQ"], "quanta": "abc"}, "quanta"),
+    ("/api/schedule", {"algorithm": "RR", "cores": None, "queues": "two"}, "queues"),
+    ("/api/schedule/stream", {"algorithm": "RR", "cores": "q"}, "cores"),
+    ("/api/sweep", {"algorithm": "RR", "migration_cost": "q", "grid": {"quantum": [1, 2]}}, "migration_cost"),
+    ("/api/sweep", {"algorithm": "RR", "grid": {"quantum": [1, "y"]}}, "grid quantum"),
+    ("/api/optimize", {"algorithm": "RR", "max_evals": "lots"}, "max_evals"),
+    ("/api/jobs", {"algorithm": "RR", "balance_period": "often"}, "balance_period"),
+    ("/api/jobs", {"kind": "optimize", "algorithm": "RR", "max_evals": "lots"}, "max_evals"),
+])
+def test_non_numeric_fields_are_rejected_with_400(client, url, body, field):
+    response = client.post(url, json=dict(body, workload=WORKLOAD))
+    assert response.status_code == 400
+    assert response.is_json
+    assert f"'{field}'" in response.get_json()["error"]
+
+@pytest.mark.parametrize("url", ["/api/schedule", "/api/sweep", "/api/optimize", "/api/jobs"])
+def test_malformed_workload_is_rejected_with_400(client, url):
+    body = {"algorithm": "RR", "workload": [{"process": "A", "arrival": "soon", "burst": 3}],
+            "grid": {"quantum": [1]}}
+    response = client.post(url, json=body)
+    assert response.status_code == 400
+    assert "workload row 1" in response.get_json()["error"]
+
+# ---- cache statistics ---- #
+def test_report_lookups_do_not_count_as_cache_hits_or_misses(monkeypatch):
+    cache = result_cache.ResultCache(max_bytes=1 << 20, disk_dir=None)
+    monkeypatch.setattr(api_server, "result_cache", cache)
+    assert api_server.cached_report("report-key") is None
+    cache.put("report-key", {"run_id": "no-such-run", "charts": {}, "reports": []})
+    assert api_server.cached_report("report-key") is None
+    assert cache.get("result-key") is None
+    cache.put("result-key", {"metrics": {}})
+    assert cache.get("result-key") == {"metrics": {}}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
@@ -0,0 +1,146 @@
+"""
+job_queue: backpressure, cancellation and status transitions, and the
+optimizer stopping between evaluations when its job is cancelled.
+"""
+
+import threading
+import time
+
+import pytest
+
+import api_server
+import config_optimizer
+import worker_pool
+from conftest import random_workload
+from job_queue import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, JobCancelled, JobQueue
+
+def wait_for(job, *statuses, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while job.status not in statuses:
+        assert time.monotonic() < deadline, f"job still {job.status}"
+        time.sleep(0.005)
+
+def blocking(job, release, seen=None):
+    """Job body that runs until `release` is set, checking for cancellation meanwhile."""
+    if seen is not None:
+        seen.append(job.status)
+    while not release.wait(0.005):
+        job.update(0.5, "blocked")
+    return "released"
+
+@pytest.fixture
+def release():
+    """Lets blocked jobs finish; always set on teardown so no job thread outlives a failed test."""
+    release = threading.Event()
+    yield release
+    release.set()
+
+@pytest.fixture
+def queue(release):
+    queue = JobQueue(workers=1, max_queued=2, ttl=0, keep=0)
+    yield queue
+    release.set()
+    queue.shutdown()
+
+def test_status_goes_queued_running_succeeded(queue, release):
+    seen = []
+    first = queue.submit("schedule", blocking, release, seen)
+    second = queue.submit("schedule", lambda job: "done")
+    wait_for(first, RUNNING)
+    assert (seen, second.status) == ([RUNNING], QUEUED)
+    release.set()
+    wait_for(second, SUCCEEDED)
+    assert (first.status, first.result, first.progress, first.stage) == (SUCCEEDED, "released", 1.0, "done")
+    assert first.started >= first.created and first.finished >= first.started
+    assert second.to_dict()["result"] == "done"
+
+def test_failed_job_keeps_its_error(queue):
+    def fail(job):
+        raise RuntimeError("boom")
+    job = queue.submit("sweep", fail)
+    wait_for(job, FAILED)
+    assert job.to_dict(include_result=False)["error"] == "boom"
+
+def test_full_queue_rejects_submissions(queue, release):
+    jobs = [queue.submit("schedule", blocking, release) for _ in range(2)]
+    assert queue.submit("schedule", blocking, release) is None
+    assert queue.rejected == 1
+    release.set()
+    for job in jobs:
+        wait_for(job, SUCCEEDED)
+    assert queue.submit("schedule", lambda job: 1) is not None
+
+def test_cancel_while_queued_never_runs(queue, release):
+    ran = []
+    first = queue.submit("schedule", blocking, release)
+    second = queue.submit("schedule", lambda job: ran.append(job))
+    assert queue.cancel(second.id) is second
+    assert second.status == CANCELLED and second.finished is not None
+    release.set()
+    wait_for(first, SUCCEEDED)
+    assert ran == []
+
+def test_cancel_while_running_stops_at_the_next_checkpoint(queue, release):
+    job = queue.submit("schedule", blocking, release)
+    wait_for(job, RUNNING)
+    queue.cancel(job.id)
+    wait_for(job, CANCELLED)
+    assert job.result is None
+    assert queue.cancel(job.id).status == CANCELLED  # cancelling again changes nothing
+    assert queue.cancel("no-such-job") is None
+
+def test_api_answers_429_when_the_queue_is_full(queue, release, monkeypatch):
+    monkeypatch.setattr(api_server, "job_queue", queue)
+    for _ in range(2):
+        queue.submit("schedule", blocking, release)
+    client = api_server.app.test_client()
+    body = {"algorithm": "FCFS", "workload": [{"process": "A", "arrival": 0, "burst": 1}]}
+    response = client.post("/api/jobs", json=body)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(api_server.JOB_RETRY_AFTER)
+
+# ---- optimizer cancellation ---- #
+def cancel_after(calls):
+    """Checkpoint that raises JobCancelled on its calls-th call."""
+    count = []
+    def checkpoint(*args):
+        count.append(1)
+        if len(count) >= calls:
+            raise JobCancelled()
+    return checkpoint
+
+def test_optimizer_checks_cancellation_between_evaluations():
+    workload = random_workload(0, n=20)
+    with pytest.raises(JobCancelled):
+        config_optimizer.optimize(api_server.runtime.to_process_table(workload), "RR", {"context_switch": 1},
+                                  max_evals=30, checkpoint=cancel_after(4))
+    finished = config_optimizer.optimize(api_server.runtime.to_process_table(workload), "RR",
+                                         {"context_switch": 1}, max_evals=30)
+    assert finished["evaluations"] > 4
+
+def test_optimize_job_is_cancelled_mid_search(monkeypatch):
+    monkeypatch.setattr(worker_pool, "POOL_WORKERS", 1)  # inline: checked before each evaluation
+    evaluations = []
+    schedule = config_optimizer.schedule
+    monkeypatch.setattr(config_optimizer, "schedule", lambda *args: evaluations.append(1) or schedule(*args))
+    data = {"algorithm": "RR", "workload": random_workload(1, n=20), "max_evals": 30, "context_switch": 1}
+    with pytest.raises(JobCancelled):
+        # the first call is the handler's own stage checkpoint
+        api_server.optimize_request(data, progress=cancel_after(4))
+    assert len(evaluations) == 2
+
+def test_optimizer_in_a_worker_is_stopped_on_cancellation(monkeypatch):
+    monkeypatch.setattr(worker_pool, "POOL_WORKERS", 2)
+    workload = [{"pid": f"P{i}", "arrival": i % 50, "burst": 50 + i % 7} for i in range(20000)]
+    deadline = time.monotonic() + 0.3
+
+    def checkpoint():
+        if time.monotonic() > deadline:
+            raise JobCancelled()
+    started = time.monotonic()
+    try:
+        with pytest.raises(JobCancelled):
+            worker_pool.run_optimizer(workload, "RR", 1, {"quantum": 1}, checkpoint=checkpoint)
+        assert time.monotonic() - started < 5
+    finally:
+        worker_pool.shutdown_pool()
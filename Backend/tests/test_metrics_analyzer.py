@@ -0,0 +1,36 @@
+"""
+metrics_analyzer.render_gantts: where the Gantt charts are drawn.
+"""
+
+import multiprocessing
+
+import matplotlib.pyplot as plt
+import pytest
+
+import metrics_analyzer
+from scheduler_core import Timeline
+
+@pytest.fixture
+def jobs(tmp_path):
+    timeline = Timeline.from_entries([{"pid": "A", "start": 0, "end": 3}, {"pid": "CS", "start": 3, "end": 4},
+                                      {"pid": "B", "start": 4, "end": 6}])
+    yield [(alg, timeline, str(tmp_path / f"{alg}.png")) for alg in ("FCFS", "RR")]
+    plt.close("all")
+
+class NoPool:
+    def __init__(self, *args, **kwargs):
+        raise AssertionError("render_gantts started a process pool")
+
+def test_gantts_are_drawn_serially_inside_a_worker_process(jobs, monkeypatch):
+    monkeypatch.setattr(metrics_analyzer, "PARALLEL_MIN_SEGMENTS", 0)
+    monkeypatch.setattr(metrics_analyzer, "ProcessPoolExecutor", NoPool)
+    monkeypatch.setattr(multiprocessing, "parent_process", lambda: object())
+    figures = metrics_analyzer.render_gantts(jobs, workers=4)
+    assert [alg for alg, _ in figures] == ["FCFS", "RR"]
+
+def test_gantts_use_a_pool_in_the_main_process(jobs, monkeypatch):
+    monkeypatch.setattr(metrics_analyzer, "PARALLEL_MIN_SEGMENTS", 0)
+    monkeypatch.setattr(metrics_analyzer, "ProcessPoolExecutor", NoPool)
+    assert multiprocessing.parent_process() is None
+    with pytest.raises(AssertionError, match="process pool"):
+        metrics_analyzer.render_gantts(jobs, workers=4)
@@ -0,0 +1,40 @@
+"""
+Regression tests for the integrated results of runtime.run_schedule()
+(what /api/schedule returns per algorithm).
+"""
+
+import pytest
+
+import runtime
+from conftest import ALGORITHMS, random_workload
+
+def completed_per_time(result):
+    per = result["metrics"]["per_process"]
+    completed = sum(1 for m in per.values() if m["completion"] is not None)
+    total_time = result["system_metrics"]["total_time"]
+    return completed / total_time if total_time else 0.0
+
+# ---- throughput: completed processes / total_time, never timeline segments ---- #
+def test_round_robin_throughput_counts_processes_not_quanta():
+    workload = [{"pid": "A", "arrival": 0, "burst": 20}, {"pid": "B", "arrival": 0, "burst": 20}]
+    rr = runtime.run_schedule(workload, "RR", 0, {"quantum": 2})
+    fcfs = runtime.run_schedule(workload, "FCFS", 0)
+    assert len(rr["timeline"]) == 20
+    assert rr["metrics"]["throughput"] == fcfs["metrics"]["throughput"] == pytest.approx(2 / 40)
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("cores", [1, 3])
+def test_throughput_is_completed_processes_per_time(algorithm, cores):
+    for seed in range(5):
+        workload = random_workload(seed, n=12)
+        result = runtime.run_schedule(workload, algorithm, 1, {"quantum": 2, "queues": 2, "cores": cores})
+        assert result["metrics"]["throughput"] == pytest.approx(completed_per_time(result))
+
+@pytest.mark.parametrize("algorithm", ["RR", "SRTF", "PRIORITY", "MLFQ"])
+@pytest.mark.parametrize("cores", [1, 2])
+def test_throughput_does_not_depend_on_segmentation(algorithm, cores):
+    workload = random_workload(3, n=12)
+    params = {"quantum": 1, "cores": cores}
+    split = runtime.run_schedule(workload, algorithm, 1, params)
+    coalesced = runtime.run_schedule(workload, algorithm, 1, dict(params, coalesce=True))
+    assert split["metrics"]["throughput"] == coalesced["metrics"]["throughput"]
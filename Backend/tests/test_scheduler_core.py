@@ -0,0 +1,377 @@
+"""
+Equivalence tests for the scheduling engines: fast paths against their
+plain counterparts, and the table, stream and multi-core modes against each
+other on workloads with tied arrivals. MLFQ and the per-core run queues are
+also checked against hand-traced timelines.
+"""
+
+from collections import deque
+
+import numpy as np
+import pytest
+
+import scheduler_core as sc
+from dispatcher_module import Dispatcher
+from conftest import ALGORITHMS, random_workload
+
+def segments(timeline):
+    return [(seg["pid"], seg["start"], seg["end"]) for seg in timeline]
+
+def merged(segs):
+    """Adjacent segments of the same pid joined (what params["coalesce"] produces)."""
+    out = []
+    for pid, start, end in segs:
+        if out and out[-1][0] == pid and out[-1][2] == start:
+            out[-1] = (pid, out[-1][1], end)
+        else:
+            out.append((pid, start, end))
+    return out
+
+def table(records):
+    return sc.ProcessTable.from_records(records)
+
+# ---- closed-form kernels (FCFS / static MLQ) ---- #
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("gap", [0, 1, 5])
+def test_sequential_starts_matches_python_loop(seed, gap):
+    rnd = np.random.default_rng(seed)
+    n = int(rnd.integers(0, 300))
+    arrival = np.sort(rnd.integers(0, 500, n)).astype(np.int64)
+    burst = rnd.integers(0, 12, n).astype(np.int64)  # zero bursts included
+    np.testing.assert_array_equal(sc._sequential_starts(arrival, burst, gap),
+                                  sc._sequential_starts_py(arrival, burst, gap))
+
+@pytest.mark.parametrize("algorithm", ["FCFS", "MLQ"])
+@pytest.mark.parametrize("context_switch", [0, 2])
+def test_vectorized_policies_match_python_kernel(workload, algorithm, context_switch):
+    params = {"context_switch": context_switch, "queues": 2}
+    fast = sc.schedule(table(workload), algorithm, params)
+    slow = sc.schedule(table(workload), algorithm, dict(params, vectorized=False))
+    assert segments(fast["timeline"]) == segments(slow["timeline"])
+    assert fast["metrics"]["per_process"].to_dict() == slow["metrics"]["per_process"].to_dict()
+
+# ---- RR fast-forward ---- #
+def round_robin_by_quantum(records, quantum, context_switch):
+    """Reference RR: one dispatch per quantum, no skipping ahead; returns (segments, completions)."""
+    pending = deque(sorted(records, key=lambda r: (r["arrival"], r["pid"])))
+    remaining = {r["pid"]: r["burst"] for r in records}
+    ready, segs, done, time, prev = deque(), [], {}, 0, None
+
+    def admit():
+        while pending and pending[0]["arrival"] <= time:
+            ready.append(pending.popleft()["pid"])
+
+    while pending or ready:
+        if not ready and pending[0]["arrival"] > time:
+            segs.append(("IDLE", time, pending[0]["arrival"]))
+            time = pending[0]["arrival"]
+        admit()
+        pid = ready.popleft()
+        if prev is not None and prev != pid and context_switch > 0:
+            segs.append(("CS", time, time + context_switch))
+            time += context_switch
+            admit()
+        prev = pid
+        run = min(quantum, remaining[pid])
+        segs.append((pid, time, time + run))
+        remaining[pid] -= run
+        time += run
+        admit()
+        if remaining[pid]:
+            ready.append(pid)
+        else:
+            done[pid] = time
+    return segs, done
+
+@pytest.mark.parametrize("quantum", [1, 2, 5])
+@pytest.mark.parametrize("context_switch", [0, 1])
+def test_round_robin_fast_forward_matches_quantum_stepping(quantum, context_switch):
+    for seed in range(10):
+        records = random_workload(seed, arrival_step=7, max_arrival=120)
+        result = sc.schedule(table(records), "RR", {"quantum": quantum, "context_switch": context_switch})
+        expected, done = round_robin_by_quantum(records, quantum, context_switch)
+        assert merged(segments(result["timeline"])) == merged(expected)
+        per = result["metrics"]["per_process"]
+        assert {pid: m["completion"] for pid, m in per.items()} == done
+
+def test_round_robin_fast_forward_emits_one_segment_per_lone_run():
+    records = [{"pid": "A", "arrival": 0, "burst": 1000}, {"pid": "B", "arrival": 500, "burst": 3}]
+    result = sc.schedule(table(records), "RR", {"quantum": 2})
+    assert segments(result["timeline"]) == [("A", 0, 500), ("B", 500, 502), ("A", 502, 504),
+                                            ("B", 504, 505), ("A", 505, 1003)]
+
+# ---- table vs stream vs multi-core modes ---- #
+def stream_run(records, algorithm, params):
+    ordered = sorted(records, key=lambda r: r["arrival"])
+    events = list(sc.schedule_stream(ordered, algorithm, params))
+    segs = [(e["pid"], e["start"], e["end"]) for e in events if e["type"] == "segment"]
+    per = {e["pid"]: {k: e[k] for k in ("waiting", "turnaround", "response", "completion")}
+           for e in events if e["type"] == "process"}
+    return segs, per, events[-1]
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_stream_mode_matches_table_mode(workload, algorithm):
+    params = {"quantum": 3, "context_switch": 1}
+    result = sc.schedule(table(workload), algorithm, params)
+    segs, per, summary = stream_run(workload, algorithm, params)
+    assert segs == segments(result["timeline"])
+    assert per == {pid: m for pid, m in result["metrics"]["per_process"].items() if m["completion"] is not None}
+    for key in ("avg_waiting", "avg_turnaround", "cpu_utilization", "total_time"):
+        if algorithm != "MLQ":  # static MLQ skips levels >= queues; the stream does not average them
+            assert summary["metrics"][key] == pytest.approx(result["metrics"][key])
+    assert summary["dispatcher_summary"] == result["dispatcher_summary"]
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_stream_mode_matches_table_mode_on_cores(workload, algorithm):
+    params = {"quantum": 3, "context_switch": 1, "cores": 3}
+    result = sc.schedule(table(workload), algorithm, params)
+    segs, per, _ = stream_run(workload, algorithm, params)
+    by_start = lambda segs: sorted(segs, key=lambda s: (s[1], s[0]))
+    assert by_start(segs) == by_start(segments(result["timeline"]))
+    assert per == {pid: m for pid, m in result["metrics"]["per_process"].items() if m["completion"] is not None}
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("topology", ["global", "per_core"])
+def test_one_core_smp_matches_single_core(workload, algorithm, topology):
+    if topology == "per_core" and algorithm in ("MLQ", "MLFQ"):
+        pytest.skip(f"{algorithm} has no per_core topology")
+    params = {"quantum": 3, "context_switch": 1}
+    single = sc.schedule(table(workload), algorithm, params)
+    smp = sc.schedule_smp(table(workload), algorithm, dict(params, cores=1, topology=topology))
+    # The SMP engines may split a run at different points; the coalesced timelines agree
+    assert merged(segments(smp["timeline"])) == merged(segments(single["timeline"]))
+    assert smp["metrics"]["per_process"].to_dict() == single["metrics"]["per_process"].to_dict()
+    assert smp["dispatcher_summary"] == single["dispatcher_summary"]
+
+# ---- per-process metrics ---- #
+def replay_with_dispatcher(records, context_switch):
+    """The former post-hoc simulation: every process back to back in arrival order, switches charged between them."""
+    dispatcher = Dispatcher(context_switch)
+    segs, time, prev = [], 0, None
+    for rec in sorted(records, key=lambda r: (r["arrival"], r["pid"])):
+        if rec["arrival"] > time:
+            segs.append(("IDLE", time, rec["arrival"]))
+            time = rec["arrival"]
+        start = dispatcher.switch(prev, rec["pid"], time)
+        if start > time:
+            segs.append(("CS", time, start))
+        segs.append((rec["pid"], start, start + rec["burst"]))
+        time, prev = start + rec["burst"], rec["pid"]
+    return segs, dispatcher.summary()
+
+@pytest.mark.parametrize("context_switch", [0, 1, 3])
+def test_fcfs_matches_dispatcher_replay(workload, context_switch):
+    result = sc.schedule(table(workload), "FCFS", {"context_switch": context_switch})
+    expected, summary = replay_with_dispatcher(workload, context_switch)
+    assert segments(result["timeline"]) == expected
+    assert result["dispatcher_summary"] == summary
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+@pytest.mark.parametrize("context_switch", [0, 2])
+def test_per_process_metrics_match_timeline(workload, algorithm, context_switch):
+    """Engines record the policy that actually ran: metrics derive from their own timeline."""
+    result = sc.schedule(table(workload), algorithm, {"quantum": 3, "context_switch": context_switch})
+    runs = {}
+    for pid, start, end in segments(result["timeline"]):
+        if pid not in ("IDLE", "CS"):
+            runs.setdefault(pid, []).append((start, end))
+    for rec in workload:
+        m = result["metrics"]["per_process"][rec["pid"]]
+        if m["completion"] is None:  # static MLQ levels >= queues never run
+            assert rec["pid"] not in runs
+            continue
+        spans = runs[rec["pid"]]
+        assert sum(end - start for start, end in spans) == rec["burst"]
+        assert m["completion"] == spans[-1][1]
+        assert m["response"] == spans[0][0] - rec["arrival"]
+        assert m["turnaround"] == m["completion"] - rec["arrival"]
+        assert m["waiting"] == m["turnaround"] - rec["burst"]
+    cs = [seg for seg in segments(result["timeline"]) if seg[0] == "CS"]
+    assert len(cs) == result["dispatcher_summary"]["context_switches"]
+    assert sum(end - start for _, start, end in cs) == result["dispatcher_summary"]["context_switch_time_total"]
+
+# ---- MLFQ: allotments, priority boost, level selection ---- #
+def mlfq_by_scan(records, levels, quanta, allotments, boost_period, context_switch):
+    """Reference MLFQ: linear scan for the highest non-empty level, boosts move every queued process."""
+    pending = deque(sorted(records, key=lambda r: (r["arrival"], r["pid"])))
+    remaining = {r["pid"]: r["burst"] for r in records}
+    queues = [deque() for _ in range(levels)]
+    level, used = {}, {}
+    segs, done, boosts, time, prev = [], {}, 0, 0, None
+    next_boost = boost_period or None
+
+    def admit():
+        while pending and pending[0]["arrival"] <= time:
+            pid = pending.popleft()["pid"]
+            queues[0].append(pid)
+            level[pid], used[pid] = 0, 0
+
+    while pending or any(queues):
+        if not any(queues) and pending[0]["arrival"] > time:
+            segs.append(("IDLE", time, pending[0]["arrival"]))
+            time = pending[0]["arrival"]
+        admit()
+        if next_boost is not None and time >= next_boost:
+            if any(queues):
+                boosts += 1
+                for q in queues[1:]:
+                    queues[0].extend(q)
+                    q.clear()
+                for pid in queues[0]:
+                    level[pid], used[pid] = 0, 0
+            next_boost = (time // boost_period + 1) * boost_period
+        pid = next(q for q in queues if q).popleft()
+        if prev is not None and prev != pid and context_switch > 0:
+            segs.append(("CS", time, time + context_switch))
+            time += context_switch
+        prev = pid
+        l = level[pid]
+        run = min(quanta[l], remaining[pid], allotments[l] - used[pid])
+        segs.append((pid, time, time + run))
+        remaining[pid] -= run
+        used[pid] += run
+        time += run
+        admit()
+        if not remaining[pid]:
+            done[pid] = time
+            continue
+        if used[pid] >= allotments[l]:
+            level[pid], used[pid] = min(levels - 1, l + 1), 0
+        queues[level[pid]].append(pid)
+    return segs, done, boosts
+
+def mlfq(records, **params):
+    return sc.schedule(table(records), "MLFQ", dict({"context_switch": 0}, **params))
+
+def test_mlfq_demotes_after_each_level_quantum():
+    result = mlfq([{"pid": "A", "arrival": 0, "burst": 10}], levels=3, quanta=[2, 4, 8])
+    assert segments(result["timeline"]) == [("A", 0, 2), ("A", 2, 6), ("A", 6, 10)]
+    levels = result["metrics"]["mlfq"]["levels"]
+    assert [(l["entered"], l["cpu_time"]) for l in levels] == [(1, 2), (1, 4), (1, 4)]
+
+def test_mlfq_allotment_spans_several_quanta_before_demotion():
+    records = [{"pid": "A", "arrival": 0, "burst": 6}, {"pid": "B", "arrival": 0, "burst": 6}]
+    # Allotment 4 at level 0: two 2-unit slices each before dropping to level 1
+    result = mlfq(records, levels=2, quanta=[2, 4], allotments=[4, 8])
+    assert segments(result["timeline"]) == [("A", 0, 2), ("B", 2, 4), ("A", 4, 6), ("B", 6, 8),
+                                            ("A", 8, 10), ("B", 10, 12)]
+    # Default allotment (one quantum): demoted after the first slice
+    result = mlfq(records, levels=2, quanta=[2, 4])
+    assert segments(result["timeline"]) == [("A", 0, 2), ("B", 2, 4), ("A", 4, 8), ("B", 8, 12)]
+
+def test_mlfq_boost_happens_at_the_first_dispatch_after_the_period():
+    records = [{"pid": "A", "arrival": 0, "burst": 9}, {"pid": "B", "arrival": 0, "burst": 9}]
+    # Due at 7 while A runs 4-10: at 10 both return to level 0 and B gets a level-0 quantum
+    result = mlfq(records, levels=2, quanta=[2, 6], boost_period=7)
+    assert segments(result["timeline"]) == [("A", 0, 2), ("B", 2, 4), ("A", 4, 10), ("B", 10, 12),
+                                            ("A", 12, 13), ("B", 13, 18)]
+    assert result["metrics"]["mlfq"]["boosts"] == 1
+    unboosted = mlfq(records, levels=2, quanta=[2, 6])
+    assert segments(unboosted["timeline"]) == [("A", 0, 2), ("B", 2, 4), ("A", 4, 10), ("B", 10, 16),
+                                               ("A", 16, 17), ("B", 17, 18)]
+    assert unboosted["metrics"]["mlfq"]["boosts"] == 0
+
+@pytest.mark.parametrize("boost_period", [0, 5, 13])
+@pytest.mark.parametrize("allotments", [None, [3, 6, 12, 12]])
+@pytest.mark.parametrize("context_switch", [0, 1])
+def test_mlfq_matches_linear_scan_reference(boost_period, allotments, context_switch):
+    quanta = [1, 2, 4, 8]
+    for seed in range(6):
+        records = random_workload(seed, n=15, arrival_step=4, max_arrival=60)
+        params = {"levels": 4, "quanta": quanta, "boost_period": boost_period, "context_switch": context_switch}
+        if allotments:
+            params["allotments"] = allotments
+        result = sc.schedule(table(records), "MLFQ", params)
+        expected, done, boosts = mlfq_by_scan(records, 4, quanta, allotments or quanta, boost_period, context_switch)
+        assert segments(result["timeline"]) == expected
+        assert {pid: m["completion"] for pid, m in result["metrics"]["per_process"].items()} == done
+        assert result["metrics"]["mlfq"]["boosts"] == boosts
+
+def test_spliced_queue_keeps_fifo_order_across_splices():
+    queue = sc._SplicedQueue()
+    queue.append(1)
+    queue.splice(deque([2, 3]))
+    queue.splice(deque())
+    queue.append(4)
+    queue.splice(deque([5]))
+    assert len(queue) == 5
+    assert [queue.popleft() for _ in range(4)] == [1, 2, 3, 4]
+    queue.append(6)
+    assert [queue.popleft() for _ in range(len(queue))] == [5, 6]
+    assert len(queue) == 0
+
+# ---- per-core run queues: stealing, balancing, affinity, migration cost ---- #
+def per_core(records, algorithm="FCFS", **params):
+    params = dict({"cores": 2, "topology": "per_core", "context_switch": 0}, **params)
+    return sc.schedule(table(records), algorithm, params)
+
+def core_segments(result):
+    return sorted((seg["core"], seg["pid"], seg["start"], seg["end"]) for seg in result["timeline"])
+
+def moves(result):
+    topology = result["metrics"]["topology"]
+    return topology["steals"], topology["balance_moves"], topology["migrations"]
+
+def proc(pid, arrival, burst, **fields):
+    return dict(pid=pid, arrival=arrival, burst=burst, **fields)
+
+def test_idle_core_steals_queued_work():
+    # A and C queue on core 0, B on core 1; core 1 steals C when B ends at 2
+    records = [proc("A", 0, 10), proc("B", 0, 2), proc("C", 0, 5)]
+    result = per_core(records)
+    assert core_segments(result) == [(0, "A", 0, 10), (1, "B", 0, 2), (1, "C", 2, 7)]
+    assert moves(result) == (1, 0, 0)  # C had not run yet: no migration
+    result = per_core(records, steal=False)
+    assert core_segments(result) == [(0, "A", 0, 10), (0, "C", 10, 15), (1, "B", 0, 2)]
+    assert moves(result) == (0, 0, 0)
+
+def test_pinned_process_is_never_stolen():
+    records = [proc("A", 0, 10), proc("B", 0, 2), proc("C", 0, 5, affinity=0)]
+    assert core_segments(per_core(records)) == [(0, "A", 0, 10), (0, "C", 10, 15), (1, "B", 0, 2)]
+    # Affinity wins over load: B is pinned to the busier core
+    records = [proc("A", 0, 4), proc("B", 0, 3, affinity=0)]
+    assert core_segments(per_core(records)) == [(0, "A", 0, 4), (0, "B", 4, 7)]
+    with pytest.raises(ValueError, match="affinity 2"):
+        per_core([proc("A", 0, 1, affinity=2)])
+
+@pytest.mark.parametrize("balance_period, moved", [(3, (1, "C", 6, 11)), (4, (1, "C", 8, 13))])
+def test_balancer_moves_work_at_its_period(balance_period, moved):
+    # Core 1 runs out of work at 6; without stealing C waits for the next balancing
+    records = [proc("A", 0, 10), proc("B", 0, 1), proc("C", 0, 5), proc("D", 0, 5)]
+    result = per_core(records, steal=False, balance_period=balance_period)
+    idle = [(1, "IDLE", 6, moved[2])] if moved[2] > 6 else []
+    assert core_segments(result) == sorted([(0, "A", 0, 10), (1, "B", 0, 1), (1, "D", 1, 6), moved] + idle)
+    assert moves(result) == (0, 1, 0)
+    result = per_core(records, steal=False)
+    assert (0, "C", 10, 15) in core_segments(result)
+    assert moves(result) == (0, 0, 0)
+
+@pytest.mark.parametrize("context_switch", [0, 1])
+def test_migration_cost_is_charged_once_per_move(context_switch):
+    # Core 1 steals A after its first slice on core 0; its next slice stays on core 1
+    records = [proc("A", 0, 6), proc("B", 0, 2), proc("C", 0, 2)]
+    result = per_core(records, "RR", quantum=2, migration_cost=3, context_switch=context_switch)
+    cs = context_switch
+    expected = [(0, "A", 0, 2), (1, "B", 0, 2), (1, "CS", 2, 2 + cs + 3),
+                (1, "A", 5 + cs, 7 + cs), (1, "A", 7 + cs, 9 + cs)]
+    if cs:
+        expected += [(0, "CS", 2, 3), (0, "C", 3, 5)]
+    else:
+        expected += [(0, "C", 2, 4)]
+    assert core_segments(result) == sorted(expected)
+    assert moves(result) == (1, 0, 1)
+
+@pytest.mark.parametrize("algorithm", ["FCFS", "SRTF", "RR", "PRIORITY"])
+@pytest.mark.parametrize("topology", ["global", "per_core"])
+@pytest.mark.parametrize("context_switch", [0, 1])
+def test_switch_time_is_context_switches_plus_migrations(algorithm, topology, context_switch):
+    for seed in range(12):
+        records = random_workload(seed, n=30)
+        for rec in records[:5]:
+            rec["affinity"] = rec["priority"] % 2
+        params = {"quantum": 2, "migration_cost": 3, "balance_period": 5, "topology": topology,
+                  "context_switch": context_switch}
+        result = per_core(records, algorithm, **params)
+        switch_time = sum(end - start for pid, start, end in segments(result["timeline"]) if pid == "CS")
+        summary, topo = result["dispatcher_summary"], result["metrics"]["topology"]
+        assert switch_time == summary["context_switch_time_total"] + 3 * topo["migrations"]
@@ -0,0 +1,107 @@
+"""
+TimelineIndex: bin statistics and window queries against a brute-force scan
+of the segments, and the .npz save/load round trip.
+"""
+
+import numpy as np
+import pytest
+
+import scheduler_core as sc
+from conftest import random_workload
+from timeline_index import TimelineIndex
+
+def run_timeline(seed, cores=1, algorithm="RR"):
+    records = random_workload(seed, n=30, arrival_step=5, max_arrival=150)
+    params = {"quantum": 2, "context_switch": 1, "cores": cores}
+    return sc.schedule(sc.ProcessTable.from_records(records), algorithm, params)["timeline"]
+
+def brute_bin(timeline, start, end):
+    """busy / idle / cs time and per-pid busy time of [start, end), summed over every segment."""
+    totals, per_pid = {"busy": 0, "idle": 0, "cs": 0}, {}
+    for seg in timeline:
+        overlap = min(seg["end"], end) - max(seg["start"], start)
+        if overlap <= 0:
+            continue
+        if seg["pid"] == "IDLE":
+            totals["idle"] += overlap
+        elif seg["pid"] == "CS":
+            totals["cs"] += overlap
+        else:
+            totals["busy"] += overlap
+            per_pid[seg["pid"]] = per_pid.get(seg["pid"], 0) + overlap
+    return totals, per_pid
+
+def levels_are_consistent(index):
+    """Every level covers the same total time."""
+    sums = {tuple(int(level[key].sum()) for key in ("busy", "idle", "cs", "count")) for level in index.levels}
+    return len(sums) == 1
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("cores", [1, 3])
+@pytest.mark.parametrize("base_bins", [1, 7, 64])
+def test_bin_fractions_match_brute_force(seed, cores, base_bins):
+    timeline = run_timeline(seed, cores)
+    index = TimelineIndex.build(timeline, base_bins=base_bins)
+    segs = list(timeline)
+    total = max(seg["end"] for seg in segs)
+    assert (index.total_time, index.cores) == (total, cores)
+    for k, level in enumerate(index.levels):
+        width = index.bin_width << k
+        for b in range(len(level["busy"])):
+            start, end = b * width, min((b + 1) * width, total)
+            totals, per_pid = brute_bin(segs, start, end)
+            assert {key: int(level[key][b]) for key in totals} == totals
+            if k == 0:
+                starts = sum(1 for seg in segs if min(seg["start"] // width, len(level["busy"]) - 1) == b)
+                assert level["count"][b] == starts
+                if per_pid:
+                    assert level["dom_time"][b] == max(per_pid.values())
+                    assert per_pid[index.pids[level["dom_code"][b]]] == max(per_pid.values())
+                else:
+                    assert level["dom_code"][b] == -1
+    assert levels_are_consistent(index)
+    # The query's fractions are of cores * bin width
+    view = index.query(0, total, resolution=max(len(segs) // 8, 1))
+    assert view["mode"] == "bins"
+    for entry in view["bins"]:
+        totals, _ = brute_bin(segs, entry["start"], entry["end"])
+        capacity = (entry["end"] - entry["start"]) * cores
+        for key in ("busy", "idle", "cs"):
+            assert entry[key] == round(totals[key] / capacity, 4)
+
+@pytest.mark.parametrize("cores", [1, 2])
+def test_small_windows_return_the_overlapping_segments(cores):
+    timeline = run_timeline(5, cores)
+    segs = list(timeline)
+    index = TimelineIndex.build(timeline, base_bins=16)
+    total = index.total_time
+    for start, end in [(0, total), (0, 1), (total // 3, total // 2), (total - 5, total + 50)]:
+        view = index.query(start, end, resolution=len(segs))
+        assert view["mode"] == "segments"
+        expected = [seg for seg in segs if seg["end"] > start and seg["start"] < min(end, total)]
+        key = lambda seg: (seg["start"], seg.get("core", 0), seg["pid"])
+        assert sorted(view["segments"], key=key) == sorted(expected, key=key)
+    assert index.query(10, 10)["segments"] == []
+
+@pytest.mark.parametrize("cores", [1, 3])
+def test_save_load_round_trip(tmp_path, cores):
+    index = TimelineIndex.build(run_timeline(2, cores), base_bins=32)
+    path = tmp_path / "timeline_index.npz"
+    index.save(str(path))
+    assert not (tmp_path / "timeline_index.npz.tmp").exists()
+    loaded = TimelineIndex.load(str(path))
+    assert loaded.pids == index.pids
+    assert (loaded.bin_width, loaded.total_time, loaded.cores) == (index.bin_width, index.total_time, index.cores)
+    assert len(loaded.levels) == len(index.levels)
+    for mine, theirs in zip(index.levels, loaded.levels):
+        for column in mine:
+            np.testing.assert_array_equal(mine[column], theirs[column])
+    for column in ("code", "start", "end", "core", "end_prefix"):
+        mine, theirs = getattr(index, column), getattr(loaded, column)
+        if mine is None:
+            assert theirs is None
+        else:
+            np.testing.assert_array_equal(mine, theirs)
+    total = index.total_time
+    for window in [(None, None, 5), (0, total, 10000), (total // 4, total // 2, 3)]:
+        assert loaded.query(*window) == index.query(*window)
@@ -0,0 +1,46 @@
+"""
+worker_pool dispatch: what runs in a pool worker (with its timeout) and what
+runs inline.
+"""
+
+import pytest
+
+import runtime
+import worker_pool
+from conftest import random_workload
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A two-worker pool whose submissions are recorded; shut down afterwards."""
+    submitted = []
+    submit = worker_pool.submit
+
+    def recording_submit(fn, *args, **kwargs):
+        submitted.append(fn.__name__)
+        return submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(worker_pool, "POOL_WORKERS", 2)
+    monkeypatch.setattr(worker_pool, "submit", recording_submit)
+    yield submitted
+    worker_pool.shutdown_pool()
+
+def test_single_algorithm_runs_in_the_pool(pool):
+    workload = random_workload(0, n=10)
+    results = worker_pool.run_algorithms(workload, ["RR"], 1, {"quantum": 2})
+    assert pool == ["run_schedule"]
+    expected = runtime.run_schedule(workload, "RR", 1, {"quantum": 2})
+    assert list(results["RR"]["timeline"]) == list(expected["timeline"])
+    assert results["RR"]["metrics"]["per_process"] == expected["metrics"]["per_process"]
+
+def test_single_algorithm_timeout_is_enforced(pool):
+    workload = [{"pid": f"P{i}", "arrival": i % 50, "burst": 50 + i % 7} for i in range(20000)]
+    results = worker_pool.run_algorithms(workload, ["RR"], 1, {"quantum": 1}, timeout=0.2)
+    assert results == {"RR": {"error": "RR timed out after 0.2s"}}
+
+def test_inline_and_single_worker_runs_skip_the_pool(pool, monkeypatch):
+    workload = random_workload(1, n=10)
+    worker_pool.run_algorithms(workload, ["FCFS", "SJF"], 0, inline=True)
+    monkeypatch.setattr(worker_pool, "POOL_WORKERS", 1)
+    results = worker_pool.run_algorithms(workload, ["FCFS"], 0)
+    assert pool == []
+    assert "error" not in results["FCFS"]
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+benchmark.py — Scheduling Engine Benchmark Suite
+-------------------------------------------------
+Times every schedule() algorithm on workload_generator.generate_workload()
+workloads (random / burst / spaced arrivals, 10^2 .. 10^6 processes).
+
+Each case (pattern, size, algorithm) runs in a fresh worker process so its
+peak RSS is its own, and records:
+  load_s          reading the workload CSV into a ProcessTable
+  schedule_s      schedule() (best of --repeat runs)
+  metrics_s       compute_table_metrics() over the resulting timeline
+  serialize_s     json.dumps() of the result
+  peak_rss_mb     peak resident set size of the worker
+  segments        timeline length, and segments_per_s = segments / schedule_s
+
+Results are written as JSON (meta + one row per case). --compare BASE NEW
+matches the rows of two result files and flags timings / memory that grew
+by more than --threshold (exit status 1 when anything regressed).
+
+Usage:
+  python benchmark.py --sizes 100 1000 10000 --algorithms FCFS RR MLFQ
+  python benchmark.py --compare outputs/benchmark_a.json outputs/benchmark_b.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scheduler_core import NOT_SET, compute_table_metrics, json_default, load_process_table, schedule
+from workload_generator import generate_workload
+
+ALGORITHMS = ["FCFS", "SJF", "SRTF", "RR", "PRIORITY", "MLQ", "MLFQ"]
+PATTERNS = ["random", "burst", "spaced"]
+SIZES = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+# Compared by --compare; a row regresses when one of them grows by more than the threshold
+COMPARED = ["schedule_s", "metrics_s", "serialize_s", "peak_rss_mb"]
+MIN_SECONDS = 0.005  # timing differences below this are noise
+
+# -------------------------------------- #
+# Workloads
+# -------------------------------------- #
+def workload_csv(pattern, size, workload_dir, seed=0):
+    """Generated workload CSV for (pattern, size), reused across runs with the same seed."""
+    filename = f"{pattern}_{size}_s{seed}.csv"
+    path = os.path.join(workload_dir, filename)
+    if not os.path.exists(path):
+        random.seed(f"{seed}:{pattern}:{size}")
+        generate_workload(num_processes=size, pattern=pattern, output_dir=workload_dir, filename=filename)
+    return path
+
+# -------------------------------------- #
+# One case (runs in its own process)
+# -------------------------------------- #
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+def run_case(csv_path, algorithm, params, repeat=1):
+    t0 = time.perf_counter()
+    table = load_process_table(csv_path)
+    load_s = time.perf_counter() - t0
+
+    schedule_s, result = float("inf"), None
+    for _ in range(max(repeat, 1)):
+        result = None  # let the previous run's arrays go before the next one
+        t0 = time.perf_counter()
+        result = schedule(table, algorithm, dict(params))
+        schedule_s = min(schedule_s, time.perf_counter() - t0)
+
+    # Recompute the metrics from the run's own started/completed columns
+    _, _, response, completed = result["metrics"]["per_process"].columns
+    started = np.where(response != NOT_SET, table.arrival + response, NOT_SET)
+    t0 = time.perf_counter()
+    compute_table_metrics(table, started, completed, result["timeline"])
+    metrics_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    payload = json.dumps(result, default=json_default)
+    serialize_s = time.perf_counter() - t0
+
+    segments = len(result["timeline"])
+    return {
+        "load_s": load_s,
+        "schedule_s": schedule_s,
+        "metrics_s": metrics_s,
+        "serialize_s": serialize_s,
+        "total_s": schedule_s + metrics_s + serialize_s,
+        "peak_rss_mb": _peak_rss_mb(),
+        "segments": segments,
+        "segments_per_s": segments / schedule_s if schedule_s > 0 else 0.0,
+        "json_bytes": len(payload)
+    }
+
+# -------------------------------------- #
+# Suite
+# -------------------------------------- #
+def run_suite(patterns=PATTERNS, sizes=SIZES, algorithms=ALGORITHMS, params=None, repeat=1,
+              workload_dir="outputs/bench_workloads", seed=0, isolate=True):
+    """Run every (pattern, size, algorithm) case; returns {"meta", "results"}."""
+    params = dict(params or {})
+    os.makedirs(workload_dir, exist_ok=True)
+    # One task per worker process: each case's peak RSS is measured on its own
+    pool = ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1,
+                               mp_context=multiprocessing.get_context("spawn")) if isolate else None
+    results = []
+    try:
+        for pattern in patterns:
+            for size in sizes:
+                csv_path = workload_csv(pattern, size, workload_dir, seed)
+                for algorithm in algorithms:
+                    try:
+                        if pool is not None:
+                            row = pool.submit(run_case, csv_path, algorithm, params, repeat).result()
+                        else:
+                            row = run_case(csv_path, algorithm, params, repeat)
+                    except Exception as e:
+                        print(f"[WARN] {algorithm} {pattern} n={size} failed: {e}")
+                        row = {"error": str(e)}
+                    row = {"pattern": pattern, "size": size, "algorithm": algorithm, **row}
+                    results.append(row)
+                    if "error" not in row:
+                        print(f"[OK] {algorithm:<8} {pattern:<6} n={size:<8} schedule={row['schedule_s']:.4f}s "
+                              f"metrics={row['metrics_s']:.4f}s json={row['serialize_s']:.4f}s "
+                              f"rss={row['peak_rss_mb']:.0f}MiB {row['segments_per_s']:,.0f} seg/s")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    meta = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": params,
+        "repeat": repeat,
+        "seed": seed,
+        "isolated": isolate
+    }
+    return {"meta": meta, "results": results}
+
+def compare(base, new, threshold=0.10, min_seconds=MIN_SECONDS):
+    """
+    Rows of `new` whose COMPARED values grew by more than `threshold` (relative)
+    over the matching (pattern, size, algorithm) row of `base`.
+    Returns a list of {pattern, size, algorithm, metric, base, new, change}.
+    """
+    key = lambda row: (row["pattern"], row["size"], row["algorithm"])
+    baseline = {key(row): row for row in base["results"] if "error" not in row}
+    regressions = []
+    for row in new["results"]:
+        old = baseline.get(key(row))
+        if old is None or "error" in row:
+            continue
+        for metric in COMPARED:
+            before, after = old.get(metric), row.get(metric)
+            if before is None or after is None:
+                continue
+            if metric.endswith("_s") and after - before < min_seconds:
+                continue
+            change = (after - before) / before if before > 0 else float("inf")
+            if change > threshold:
+                regressions.append({"pattern": row["pattern"], "size": row["size"], "algorithm": row["algorithm"],
+                                    "metric": metric, "base": before, "new": after, "change": change})
+    return regressions
+
+# -------------------------------------- #
+# Command Line Interface
+# -------------------------------------- #
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scheduling engines")
+    parser.add_argument("--patterns", nargs="+", default=PATTERNS, choices=PATTERNS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--algorithms", nargs="+", default=ALGORITHMS)
+    parser.add_argument("--quantum", type=int, default=4)
+    parser.add_argument("--context-switch", type=int, default=0)
+    parser.add_argument("--cores", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per case (best schedule time is kept)")
+    parser.add_argument("--seed", type=int, default=0, help="Workload generator seed")
+    parser.add_argument("--workload-dir", default="outputs/bench_workloads")
+    parser.add_argument("--out", default=None, help="Results JSON (default outputs/benchmark_<timestamp>.json)")
+    parser.add_argument("--no-isolate", dest="isolate", action="store_false",
+                        help="Run cases in this process (faster; peak RSS becomes cumulative)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="Compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative growth that counts as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            base = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        regressions = compare(base, new, args.threshold)
+        for r in regressions:
+            print(f"[WARN] {r['algorithm']:<8} {r['pattern']:<6} n={r['size']:<8} {r['metric']}: "
+                  f"{r['base']:.4f} -> {r['new']:.4f} (+{r['change'] * 100:.1f}%)")
+        print(f"[{'WARN' if regressions else 'OK'}] {len(regressions)} regression(s) above {args.threshold * 100:.0f}%")
+        raise SystemExit(1 if regressions else 0)
+
+    params = {"quantum": args.quantum, "context_switch": args.context_switch, "cores": args.cores}
+    report = run_suite(args.patterns, args.sizes, [a.upper() for a in args.algorithms], params,
+                       args.repeat, args.workload_dir, args.seed, args.isolate)
+    out_path = args.out or os.path.join("outputs", f"benchmark_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Benchmark results saved to: {out_path}")
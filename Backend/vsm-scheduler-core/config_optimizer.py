@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+config_optimizer.py — Quantum / MLFQ Configuration Optimizer
+-------------------------------------------------------------
+Finds the RR quantum, or the MLFQ levels and quanta, that minimize an
+objective measured with scheduler_core.schedule() on a given workload:
+
+  avg_waiting    mean waiting time
+  p99_response   99th percentile response time
+  weighted       sum of weights[column] * column over the sweep_row() columns
+                 (default: avg_waiting plus context-switch time per process)
+
+Evaluated settings are memoized. The quantum search assumes the objective
+is roughly unimodal in the quantum: a doubling scan brackets the minimum
+and stops once the objective has risen `patience` times in a row, then an
+integer golden-section search narrows the bracket. MLFQ quanta are
+geometric (q0, q0*ratio, ...); q0 is searched the same way for each
+levels/ratio pair, and adding levels stops once it no longer helps.
+The search also stops at max_evals schedules. checkpoint(), if given, is
+called before each schedule; an exception it raises (e.g. a cancelled job)
+ends the search.
+
+Usage:
+  python config_optimizer.py --input workload.csv --alg RR --objective p99_response
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+from scheduler_core import as_process_table, load_process_table, schedule, sweep_row
+
+OBJECTIVES = ("avg_waiting", "p99_response", "weighted")
+_INVPHI = (math.sqrt(5) - 1) / 2
+
+class _BudgetExhausted(Exception):
+    pass
+
+class ConfigOptimizer:
+    def __init__(self, process_list, algorithm: str, params: Optional[Dict[str, Any]] = None,
+                 objective="avg_waiting", weights=None, max_evals=60, patience=2, tol=1e-3, checkpoint=None):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective} (expected one of {', '.join(OBJECTIVES)})")
+        self.table = as_process_table(process_list)
+        self.table.sort_index()
+        self.table.sort_index(by_pid=False)
+        self.algorithm = algorithm.strip().upper()
+        self.params = dict(params or {})
+        self.objective = objective
+        n = max(len(self.table), 1)
+        self.weights = dict(weights or {"avg_waiting": 1.0, "context_switch_time": 1.0 / n})
+        self.max_evals = int(max_evals)
+        self.patience = max(int(patience), 1)
+        self.tol = float(tol)
+        self.checkpoint = checkpoint or (lambda: None)
+        self.max_burst = max(int(self.table.burst.max()), 1) if len(self.table) else 1
+        self._memo = {}     # point key -> score
+        self.history = []   # evaluated points in order: point values, sweep_row() metrics, score
+
+    # ---- objective ---- #
+    def score(self, row) -> float:
+        if self.objective == "weighted":
+            unknown = set(self.weights) - set(row)
+            if unknown:
+                raise ValueError(f"Unknown weight column(s): {', '.join(sorted(unknown))}")
+            return sum(w * row[column] for column, w in self.weights.items())
+        return row[self.objective]
+
+    def evaluate(self, point) -> float:
+        key = tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in point.items()))
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+        if len(self._memo) >= self.max_evals:
+            raise _BudgetExhausted()
+        self.checkpoint()
+        row = sweep_row(schedule(self.table, self.algorithm, dict(self.params, **point)))
+        value = self._memo[key] = self.score(row)
+        self.history.append(dict(point, **row, score=value))
+        return value
+
+    # ---- 1-D search ---- #
+    def _close(self, a, b):
+        return abs(a - b) <= self.tol * max(abs(a), abs(b))
+
+    def minimize_int(self, f, lo, hi):
+        """Integer argmin of a roughly unimodal f on [lo, hi]: doubling scan, then golden section."""
+        xs = [lo]
+        while xs[-1] < hi:
+            xs.append(min(xs[-1] * 2, hi))
+        best, rises, values = 0, 0, []
+        for k, x in enumerate(xs):
+            values.append(f(x))
+            if values[k] < values[best]:
+                best, rises = k, 0
+            elif k > best:
+                rises += 1
+                if rises >= self.patience:
+                    break
+        a = xs[max(best - 1, 0)]
+        b = xs[min(best + 1, len(values) - 1)]
+        while b - a > 4:
+            c = a + round((1 - _INVPHI) * (b - a))
+            d = a + round(_INVPHI * (b - a))
+            fc, fd = f(c), f(d)
+            if self._close(fc, fd):  # flat bracket: nothing left to gain
+                return c if fc <= fd else d
+            if fc <= fd:
+                b = d
+            else:
+                a = c
+        return min(range(a, b + 1), key=f)
+
+    # ---- searches ---- #
+    def optimize_rr(self, quantum_range=None):
+        lo, hi = quantum_range or (1, self.max_burst)
+        quantum = self.minimize_int(lambda q: self.evaluate({"quantum": q}), max(int(lo), 1), max(int(hi), 1))
+        return {"quantum": quantum}
+
+    def optimize_mlfq(self, levels_range=(2, 5), ratios=(2,), quantum_range=None):
+        lo, hi = quantum_range or (1, self.max_burst)
+        lo, hi = max(int(lo), 1), max(int(hi), 1)
+        best, best_value, stale = None, math.inf, 0
+        for levels in range(int(levels_range[0]), int(levels_range[1]) + 1):
+            previous, level_best = best_value, math.inf
+            for ratio in ratios:
+                def point(q0, levels=levels, ratio=ratio):
+                    return {"levels": levels, "quanta": [q0 * int(ratio) ** l for l in range(levels)]}
+                q0 = self.minimize_int(lambda q: self.evaluate(point(q)), lo, hi)
+                value = self.evaluate(point(q0))
+                level_best = min(level_best, value)
+                if value < best_value:
+                    best, best_value = point(q0), value
+            if level_best < previous and not self._close(level_best, previous):
+                stale = 0
+            else:
+                stale += 1
+                if stale >= self.patience:
+                    break
+        return best
+
+    def run(self, **search):
+        """Search and return {best, score, evaluations, stopped, history}; best is None if nothing ran."""
+        stopped = "converged"
+        try:
+            if self.algorithm == "RR":
+                self.optimize_rr(search.get("quantum_range"))
+            elif self.algorithm == "MLFQ":
+                self.optimize_mlfq(search.get("levels_range") or (2, 5), search.get("ratios") or (2,),
+                                   search.get("quantum_range"))
+            else:
+                raise ValueError(f"Nothing to tune for {self.algorithm} (expected RR or MLFQ)")
+        except _BudgetExhausted:
+            stopped = "max_evals"
+        best = min(self.history, key=lambda row: row["score"], default=None)
+        return {
+            "algorithm": self.algorithm,
+            "objective": self.objective,
+            "weights": self.weights if self.objective == "weighted" else None,
+            "best": best,
+            "score": best["score"] if best else None,
+            "evaluations": len(self.history),
+            "stopped": stopped,
+            "history": self.history
+        }
+
+def optimize(process_list, algorithm: str, params: Optional[Dict[str, Any]] = None,
+             objective="avg_waiting", weights=None, max_evals=60, checkpoint=None, **search):
+    """
+    Best RR quantum / MLFQ levels+quanta for `process_list` under `objective`.
+    search: quantum_range=(lo, hi), and for MLFQ levels_range=(lo, hi), ratios=(2,).
+    checkpoint() is called before each evaluation (it may raise to stop the search).
+    """
+    return ConfigOptimizer(process_list, algorithm, params, objective, weights, max_evals,
+                           checkpoint=checkpoint).run(**search)
+
+# ------------------------- #
+# CLI Entry Point
+# ------------------------- #
+if __name__ == "__main__":
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="RR quantum / MLFQ configuration optimizer")
+    parser.add_argument('--input', required=True, help='CSV or JSON input file')
+    parser.add_argument('--alg', required=True, choices=['RR', 'MLFQ', 'rr', 'mlfq'])
+    parser.add_argument('--objective', default='avg_waiting', choices=OBJECTIVES)
+    parser.add_argument('--context-switch', type=int, default=0)
+    parser.add_argument('--cores', type=int, default=1)
+    parser.add_argument('--max-evals', type=int, default=60)
+    parser.add_argument('--quantum-range', type=int, nargs=2, default=None, metavar=('LO', 'HI'))
+    parser.add_argument('--levels-range', type=int, nargs=2, default=None, metavar=('LO', 'HI'))
+    parser.add_argument('--ratios', type=int, nargs='+', default=None)
+    args = parser.parse_args()
+
+    if args.input.endswith(".csv"):
+        procs = load_process_table(args.input)
+    else:
+        from scheduler_core import ProcessTable
+        with open(args.input, 'r') as f:
+            procs = ProcessTable.from_records(json.load(f))
+
+    result = optimize(procs, args.alg, {"context_switch": args.context_switch, "cores": args.cores},
+                      args.objective, max_evals=args.max_evals, quantum_range=args.quantum_range,
+                      levels_range=args.levels_range, ratios=args.ratios)
+    best = result["best"]
+    print(f"[INFO] {result['evaluations']} settings evaluated ({result['stopped']})")
+    if best is None:
+        raise SystemExit("[WARN] No setting could be evaluated")
+    setting = {k: best[k] for k in ("quantum", "levels", "quanta") if k in best}
+    print(f"[OK] Best {result['algorithm']} setting: {setting} {args.objective}={result['score']:.3f}")
@@ -1,46 +1,58 @@
-"""
-dispatcher_module.py — Team 4 Dispatcher Component
----------------------------------------------------
-Simulates context switch overhead for any scheduling algorithm.
-Used by runtime to overlay realistic CPU switching behavior
-without modifying scheduler_core internals.
-"""
-
-class Dispatcher:
-    def __init__(self, context_switch_time=0):
-        self.context_switch_time = int(context_switch_time)
-        self.total_context_switches = 0
-        self.total_context_switch_time = 0
-
-    def do_switch(self, prev_pid, next_pid, current_time):
-        """
-        Perform a context switch if switching to a different process.
-        Returns (updated_time, context_switch_segment)
-        """
-        if (
-            prev_pid is None
-            or prev_pid == next_pid
-            or self.context_switch_time <= 0
-        ):
-            return current_time, None
-
-        self.total_context_switches += 1
-        self.total_context_switch_time += self.context_switch_time
-
-        cs_start = current_time
-        cs_end = cs_start + self.context_switch_time
-
-        cs_segment = {
-            "pid": "CS",
-            "start": cs_start,
-            "end": cs_end
-        }
-
-        return cs_end, cs_segment
-
-    def summary(self):
-        return {
-            "context_switches": self.total_context_switches,
-            "context_switch_time_total": self.total_context_switch_time,
-            "context_switch_time_unit": self.context_switch_time
-        }
+"""
+dispatcher_module.py — Team 4 Dispatcher Component
+---------------------------------------------------
+Simulates context switch overhead for any scheduling algorithm.
+The scheduler_core engines call it at every dispatch (one Dispatcher per
+run), so CS segments and the summary describe the policy that actually ran.
+"""
+
+class Dispatcher:
+    def __init__(self, context_switch_time=0):
+        self.context_switch_time = int(context_switch_time)
+        self.total_context_switches = 0
+        self.total_context_switch_time = 0
+
+    def switch(self, prev_pid, next_pid, current_time):
+        """
+        Charge a context switch if the CPU changes from one process to another.
+        Returns the time at which next_pid can start running.
+        """
+        if (
+            prev_pid is None
+            or prev_pid == next_pid
+            or self.context_switch_time <= 0
+        ):
+            return current_time
+
+        self.add_switches(1)
+        return current_time + self.context_switch_time
+
+    def add_switches(self, count):
+        """Account for `count` switches computed in bulk (vectorized engines)."""
+        if self.context_switch_time > 0:
+            self.total_context_switches += count
+            self.total_context_switch_time += count * self.context_switch_time
+
+    def do_switch(self, prev_pid, next_pid, current_time):
+        """
+        Perform a context switch if switching to a different process.
+        Returns (updated_time, context_switch_segment)
+        """
+        cs_end = self.switch(prev_pid, next_pid, current_time)
+        if cs_end == current_time:
+            return current_time, None
+
+        cs_segment = {
+            "pid": "CS",
+            "start": current_time,
+            "end": cs_end
+        }
+
+        return cs_end, cs_segment
+
+    def summary(self):
+        return {
+            "context_switches": self.total_context_switches,
+            "context_switch_time_total": self.total_context_switch_time,
+            "context_switch_time_unit": self.context_switch_time
+        }
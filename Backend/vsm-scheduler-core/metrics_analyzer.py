@@ -12,27 +12,58 @@ Team Member 3 — Performance Metrics, Analysis & Visualization
     * throughput / cpu-util line chart (if multiple workloads) (.png)
     * summary CSV and a one-file PDF report (containing charts + summary table)
 - CLI-friendly and robust to missing files.
+- render_artifact() renders a single chart / the report on demand (used by
+  api_server, which renders lazily on the first GET).
 
 Notes:
 - Uses matplotlib for plotting (one chart per plot).
-- No explicit color settings (follows project instruction).
+- No explicit color settings (follows project instruction); Gantt bars take
+  the active style's color cycle, one color per row.
 - Requires: pandas, matplotlib
+
+Configuration (environment variables):
+  VSM_GANTT_MAX_SEGMENTS   segments above which a Gantt chart is downsampled
+                           to one bar per pixel run (default: 20000)
+  VSM_GANTT_LABEL_MIN_PX   narrowest bar that gets a pid label (default: 24)
+  VSM_ANALYZER_WORKERS     processes rendering the per-algorithm Gantt charts
+                           (default: number of CPUs, 1 renders serially; always
+                           serial inside a worker process)
 """
 
 import os
 import json
 import argparse
+import multiprocessing
 import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any, Tuple, Optional
+import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # files only; also safe in server worker processes
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.collections import PolyCollection
+
+from phase_timer import phase, recording
+from scheduler_core import Timeline
 
 # Default folders
 DEFAULT_SCHED_OUT = "outputs"
 DEFAULT_METRICS_DIR = "metrics_reports"
 
-os.makedirs(DEFAULT_METRICS_DIR, exist_ok=True)
+# Gantt rendering limits (see plot_gantt)
+GANTT_MAX_SEGMENTS = int(os.environ.get("VSM_GANTT_MAX_SEGMENTS", 20000))
+GANTT_LABEL_MIN_PX = float(os.environ.get("VSM_GANTT_LABEL_MIN_PX", 24))
+GANTT_MAX_LABELS = 500           # text objects per chart
+GANTT_MAX_LABELED_ROWS = 60      # more rows than this get no pid tick labels
+GANTT_MAX_HEIGHT = 30            # inches
+GANTT_VECTOR_MAX_BARS = 1000     # denser bar collections are rasterized in the PDF...
+GANTT_PDF_DPI = 72               # ...at this resolution
+
+# Gantt charts are rendered in parallel only when there is enough to draw to pay for the workers
+ANALYZER_WORKERS = int(os.environ.get("VSM_ANALYZER_WORKERS") or os.cpu_count() or 1)
+PARALLEL_MIN_SEGMENTS = 20000
 
 def get_run_id():
     """Generate a unique run ID based on timestamp."""
@@ -63,6 +94,22 @@ def safe_load_metrics(json_path: str) -> Optional[Dict[str, Any]]:
         print(f"[ERROR] Failed to load {json_path}: {e}")
         return None
 
+def find_output(scheduler_output_dir: str, alg: str) -> Optional[str]:
+    """Path of the algorithm's output JSON (<alg>_output / _out / _integrated.json), or None."""
+    for suffix in ("output", "out", "integrated"):
+        path = os.path.join(scheduler_output_dir, f"{alg.lower()}_{suffix}.json")
+        if os.path.exists(path):
+            return path
+    return None
+
+def artifact_names(algorithms: List[str], run_id: str) -> Dict[str, List[str]]:
+    """File names analyze_and_report() writes for a run: {"charts": [...png], "reports": [...pdf]}."""
+    algs_str = "_".join(a.lower() for a in algorithms)
+    charts = [f"{a.lower()}_gantt_{run_id}.png" for a in algorithms]
+    charts.append(f"{algs_str}_comparison_bar_chart_{run_id}.png")
+    charts.append(f"{algs_str}_throughput_cpuutil_{run_id}.png")
+    return {"charts": charts, "reports": [f"scheduling_report_{run_id}.pdf"]}
+
 # -------------------------
 # Metric summarization
 # -------------------------
@@ -83,69 +130,148 @@ def metrics_summary_row(metrics_dict: Dict[str, Any], algorithm_name: str) -> Di
 # -------------------------
 # Plotting: Gantt
 # -------------------------
-def plot_gantt(timeline: List[Dict[str, Any]], title: str, path: str):
+def _gantt_rows(code):
+    """Row of every segment: one row per pid (IDLE/CS included) in first-appearance order."""
+    codes, first, inverse = np.unique(code, return_index=True, return_inverse=True)
+    rank = np.empty(len(codes), dtype=np.int64)
+    rank[np.argsort(first, kind="stable")] = np.arange(len(codes))
+    return codes[np.argsort(first, kind="stable")], rank[inverse]
+
+def _downsample(row, start, end, min_gap):
+    """Merge each row's segments separated by less than min_gap (one pixel) into one bar."""
+    order = np.lexsort((start, row))
+    row, start, end = row[order], start[order], end[order]
+    new_row = np.append(True, row[1:] != row[:-1])
+    breaks = np.flatnonzero(new_row | (start - np.append(-np.inf, end[:-1]) >= min_gap))
+    return row[breaks], start[breaks], np.maximum.reduceat(end, breaks)
+
+def gantt_figure(timeline: List[Dict[str, Any]], title: str):
     """
-    Draws a horizontal Gantt chart for a single algorithm timeline.
-    timeline: list of {"pid":str,"start":int,"end":int}
+    Horizontal Gantt chart figure for a single algorithm timeline (None if empty).
+    timeline: list of {"pid":str,"start":int,"end":int} (or a scheduler_core Timeline)
+    All bars go into one PolyCollection; above GANTT_MAX_SEGMENTS segments each
+    row's bars closer than a pixel are merged first, and labels are only drawn
+    on bars at least GANTT_LABEL_MIN_PX wide.
     """
-    if not timeline:
+    if not len(timeline):
         print(f"[WARN] Empty timeline for {title}; skipping Gantt.")
-        return
-
-    # Normalize ordering of PIDs (deterministic)
-    pids = []
-    for seg in timeline:
-        if seg["pid"] not in pids:
-            pids.append(seg["pid"])
-    pid_to_y = {pid: i for i, pid in enumerate(pids)}
-
-    fig, ax = plt.subplots(figsize=(10, max(2, len(pids) * 0.5)))
-    for seg in timeline:
-        pid = seg["pid"]
-        y = pid_to_y[pid]
-        start, end = seg["start"], seg["end"]
-        ax.barh(y, end - start, left=start)
-        ax.text((start + end) / 2, y, pid, va='center', ha='center', color='white', fontsize=8)
-
-    ax.set_yticks(list(pid_to_y.values()))
-    ax.set_yticklabels(list(pid_to_y.keys()))
+        return None
+
+    timeline = Timeline.from_entries(timeline)
+    code, start, end = timeline.arrays()
+    row_codes, row = _gantt_rows(code)
+    start, end = start.astype(float), end.astype(float)
+    t0, t1 = start.min(), max(end.max(), start.min() + 1)
+    n_rows = len(row_codes)
+
+    fig, ax = plt.subplots(figsize=(10, min(max(2, n_rows * 0.5), GANTT_MAX_HEIGHT)))
+    plot_px = fig.get_size_inches()[0] * fig.dpi * ax.get_position().width
+    time_per_px = (t1 - t0) / plot_px
+    if len(start) > GANTT_MAX_SEGMENTS:
+        row, start, end = _downsample(row, start, end, time_per_px)
+        print(f"[INFO ] {title}: {len(code)} segments drawn as {len(start)} bars")
+
+    verts = np.empty((len(start), 4, 2))
+    verts[:, :, 0] = np.column_stack((start, start, end, end))
+    verts[:, :, 1] = row[:, None] + np.array([-0.4, 0.4, 0.4, -0.4])
+    cycle = plt.rcParams["axes.prop_cycle"].by_key().get("color") or ["C0"]
+    row_px = fig.get_size_inches()[1] * fig.dpi * ax.get_position().height / n_rows
+    # Sub-pixel rows would vanish into antialiasing: outline each bar so it keeps at least a pixel
+    dense = row_px < 3
+    bars = PolyCollection(verts, facecolors=[cycle[r % len(cycle)] for r in row.tolist()],
+                          edgecolors="face", linewidths=0.5 if dense else 0, antialiased=not dense)
+    # Axes and labels stay vector in the PDF; a very dense bar layer is embedded as an image
+    bars.set_rasterized(len(verts) > GANTT_VECTOR_MAX_BARS)
+    ax.add_collection(bars)
+    ax.set_xlim(t0, t1)
+    ax.set_ylim(-0.5, n_rows - 0.5)
+
+    # Labels only where they fit: wide enough bars, rows tall enough for the text
+    if row_px >= 8:
+        wide = np.flatnonzero((end - start) / time_per_px >= GANTT_LABEL_MIN_PX)[:GANTT_MAX_LABELS]
+        for i in wide.tolist():
+            ax.text((start[i] + end[i]) / 2, row[i], timeline.name(int(row_codes[row[i]])),
+                    va='center', ha='center', color='white', fontsize=8)
+
+    if n_rows <= GANTT_MAX_LABELED_ROWS:
+        ax.set_yticks(range(n_rows))
+        ax.set_yticklabels([timeline.name(int(c)) for c in row_codes.tolist()])
+    else:
+        ax.set_yticks([])
+        ax.set_ylabel(f"{n_rows} processes")
     ax.set_xlabel("Time")
     ax.set_title(title)
-    plt.tight_layout()
-    plt.savefig(path)
-    plt.close()
-    print(f"[INFO ] Gantt saved: {path}")
+    fig.tight_layout()
+    return fig
+
+def save_figure(fig, path: str, label: str, keep: bool = False):
+    """Write `fig` to `path`; the figure is closed unless keep=True (e.g. for the PDF)."""
+    fig.savefig(path)
+    if not keep:
+        plt.close(fig)
+    print(f"[INFO ] {label} saved: {path}")
+    return fig
+
+def plot_gantt(timeline: List[Dict[str, Any]], title: str, path: str, keep: bool = False):
+    """Draws a horizontal Gantt chart for a single algorithm timeline into `path` (see gantt_figure)."""
+    fig = gantt_figure(timeline, title)
+    return save_figure(fig, path, "Gantt", keep) if fig is not None else None
+
+def render_gantts(jobs: List[Tuple[str, Any, str]], workers: int = ANALYZER_WORKERS) -> List[Tuple[str, Any]]:
+    """
+    Gantt PNGs for [(alg, Timeline, path)], rendered in a process pool (Agg
+    backend in every worker) when there are several big enough charts.
+    Inside a worker process (e.g. a worker_pool render) they are drawn serially:
+    a nested pool would pay a cold start per call and outlive a terminated parent.
+    Returns [(alg, figure)] of the charts drawn, still open for the PDF.
+    """
+    titles = [f"{alg} Gantt Chart" for alg, _, _ in jobs]
+    segments = sum(len(timeline) for _, timeline, _ in jobs)
+    nested = multiprocessing.parent_process() is not None
+    if nested or workers <= 1 or len(jobs) <= 1 or segments < PARALLEL_MIN_SEGMENTS:
+        figures = [plot_gantt(timeline, title, path, keep=True) for (_, timeline, path), title in zip(jobs, titles)]
+    else:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        # Figures come back pickled, ready to be added to the PDF as vector pages
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=context) as pool:
+            figures = list(pool.map(plot_gantt, [t for _, t, _ in jobs], titles, [p for _, _, p in jobs],
+                                    [True] * len(jobs)))
+    return [(alg, fig) for (alg, _, _), fig in zip(jobs, figures) if fig is not None]
 
 # -------------------------
 # Plotting: comparison bar chart
 # -------------------------
-def plot_comparison_bar(summary_df: pd.DataFrame, path: str):
+def comparison_bar_figure(summary_df: pd.DataFrame):
     """
-    Creates a bar chart comparing Avg Waiting and Avg Turnaround across algorithms.
+    Bar chart figure comparing Avg Waiting and Avg Turnaround across algorithms (None if empty).
     summary_df must have columns: Algorithm, Avg_Waiting, Avg_Turnaround
     """
     if summary_df.empty:
         print("[WARN] Empty summary df; skipping comparison bar chart.")
-        return
+        return None
     fig, ax = plt.subplots(figsize=(8, 5))
     summary_df.plot(x="Algorithm", y=["Avg_Waiting", "Avg_Turnaround"], kind="bar", ax=ax)
     ax.set_ylabel("Time units")
     ax.set_title("Avg Waiting & Turnaround Time by Algorithm")
-    plt.tight_layout()
-    plt.savefig(path)
-    plt.close()
-    print(f"[INFO ] Comparison bar chart saved: {path}")
+    fig.tight_layout()
+    return fig
+
+def plot_comparison_bar(summary_df: pd.DataFrame, path: str, keep: bool = False):
+    """Creates the comparison bar chart in `path` (see comparison_bar_figure)."""
+    fig = comparison_bar_figure(summary_df)
+    return save_figure(fig, path, "Comparison bar chart", keep) if fig is not None else None
 
 # -------------------------
 # Plotting: Throughput & CPU Util line chart
 # -------------------------
-def plot_throughput_line(summary_df: pd.DataFrame, path: str):
+def throughput_figure(summary_df: pd.DataFrame):
     """
-    Simple line chart for Throughput and CPU Utilization (%).
+    Simple line chart figure for Throughput and CPU Utilization (%) (None if empty).
     """
     if summary_df.empty:
         print("[WARN] Empty summary df; skipping throughput chart.")
-        return
+        return None
     fig, ax = plt.subplots(figsize=(8, 4))
     ax2 = ax.twinx()
     summary_df.plot(x="Algorithm", y="Throughput", kind="line", marker='o', ax=ax, legend=False)
@@ -153,19 +279,22 @@ def plot_throughput_line(summary_df: pd.DataFrame, path: str):
     ax.set_ylabel("Throughput (jobs/unit time)")
     ax2.set_ylabel("CPU Utilization (%)")
     ax.set_title("Throughput and CPU Utilization by Algorithm")
-    plt.tight_layout()
-    plt.savefig(path)
-    plt.close()
-    print(f"[INFO ] Throughput line chart saved: {path}")
+    fig.tight_layout()
+    return fig
+
+def plot_throughput_line(summary_df: pd.DataFrame, path: str, keep: bool = False):
+    """Creates the throughput / CPU utilization chart in `path` (see throughput_figure)."""
+    fig = throughput_figure(summary_df)
+    return save_figure(fig, path, "Throughput line chart", keep) if fig is not None else None
 
 # -------------------------
 # PDF Report Generator
 # -------------------------
 def generate_pdf_report(
         summary_df: pd.DataFrame,
-        gantt_paths: List[Tuple[str, str]],
-        bar_chart_path: str,
-        throughput_path: str,
+        gantt_figures: List[Tuple[str, Any]],
+        bar_fig,
+        throughput_fig,
         out_pdf_path: str,
         per_algorithm_metrics: Dict[str, Dict]
 ):
@@ -176,6 +305,7 @@ def generate_pdf_report(
     - Throughput chart
     - Gantt charts (one per algorithm)
     - Per-algorithm small metric table
+    The chart pages are the chart figures themselves (vector), not their PNGs.
     """
     with PdfPages(out_pdf_path) as pdf:
         # Page 1: summary table as image
@@ -194,36 +324,16 @@ def generate_pdf_report(
         tbl.scale(1, 1.2)
         ax.set_title("Algorithm Comparison Summary", fontweight='bold')
         pdf.savefig(fig)
-        plt.close()
-
-        # Page 2: bar chart
-        if os.path.exists(bar_chart_path):
-            fig = plt.figure()
-            img = plt.imread(bar_chart_path)
-            plt.imshow(img)
-            plt.axis('off')
-            pdf.savefig()
-            plt.close()
-
-        # Page 3: throughput chart
-        if os.path.exists(throughput_path):
-            fig = plt.figure()
-            img = plt.imread(throughput_path)
-            plt.imshow(img)
-            plt.axis('off')
-            pdf.savefig()
-            plt.close()
+        plt.close(fig)
+
+        # Page 2: bar chart, page 3: throughput chart
+        for chart in (bar_fig, throughput_fig):
+            if chart is not None:
+                pdf.savefig(chart)
 
         # Following pages: Gantt charts per algorithm
-        for alg_name, gpath in gantt_paths:
-            if not os.path.exists(gpath):
-                continue
-            fig = plt.figure(figsize=(11.69, 8.27))  # landscape
-            img = plt.imread(gpath)
-            plt.imshow(img)
-            plt.axis('off')
-            pdf.savefig()
-            plt.close()
+        for alg_name, gantt_fig in gantt_figures:
+            pdf.savefig(gantt_fig, dpi=GANTT_PDF_DPI)
 
         # Last page: per-algorithm quick metrics (one small table per algorithm)
         fig, ax = plt.subplots(figsize=(8.27, 11.69))
@@ -244,8 +354,8 @@ def generate_pdf_report(
             )
             ax.text(0.02, y, txt, fontsize=9)
             y -= 0.03
-        pdf.savefig()
-        plt.close()
+        pdf.savefig(fig)
+        plt.close(fig)
 
     print(f"[INFO ] PDF report created: {out_pdf_path}")
 
@@ -271,20 +381,19 @@ def analyze_and_report(
         run_id = get_run_id()
 
     summary_rows = []
-    gantt_files = []
+    gantt_jobs = []
     per_algorithm_metrics = {}
+    names = artifact_names(algorithms, run_id)
+    gantt_names = dict(zip(algorithms, names["charts"]))
 
     for alg in algorithms:
-        # try common filename patterns
-        cand1 = os.path.join(scheduler_output_dir, f"{alg.lower()}_output.json")
-        cand2 = os.path.join(scheduler_output_dir, f"{alg.lower()}_out.json")
-        cand3 = os.path.join(scheduler_output_dir, f"{alg.lower()}_integrated.json")
-        path = cand1 if os.path.exists(cand1) else (cand2 if os.path.exists(cand2) else (cand3 if os.path.exists(cand3) else None))
+        path = find_output(scheduler_output_dir, alg)
         if path is None:
             print(f"[WARN] No JSON output found for {alg} in {scheduler_output_dir}; skipping.")
             continue
 
-        loaded = safe_load_metrics(path)
+        with phase("analyzer_load"):
+            loaded = safe_load_metrics(path)
         if loaded is None:
             continue
 
@@ -296,10 +405,12 @@ def analyze_and_report(
         row = metrics_summary_row(metrics, alg)
         summary_rows.append(row)
 
-        # gantt
-        gantt_path = os.path.join(metrics_dir, f"{alg.lower()}_gantt_{run_id}.png")
-        plot_gantt(timeline, title=f"{alg} Gantt Chart", path=gantt_path)
-        gantt_files.append((alg, gantt_path))
+        # gantt (rendered below, side by side); array timelines are cheap to send to workers
+        gantt_jobs.append((alg, Timeline.from_entries(timeline), os.path.join(metrics_dir, gantt_names[alg])))
+
+    with phase("analyzer_gantt"):
+        gantt_figures = render_gantts(gantt_jobs)
+    gantt_files = [(alg, path) for alg, _, path in gantt_jobs if os.path.exists(path)]
 
     # create summary dataframe
     if not summary_rows:
@@ -317,21 +428,23 @@ def analyze_and_report(
     print(f"[INFO ] Summary CSV saved: {summary_csv}")
 
     # Use all algorithm names in chart filenames for throughput and comparison
-    algs_str = "_".join([a.lower() for a in algorithms])
-
-    bar_chart_path = os.path.join(metrics_dir, f"{algs_str}_comparison_bar_chart_{run_id}.png")
-    plot_comparison_bar(summary_df.rename(columns={
-        "Avg_Waiting": "Avg_Waiting",
-        "Avg_Turnaround": "Avg_Turnaround"
-    }), bar_chart_path)
-
-    throughput_path = os.path.join(metrics_dir, f"{algs_str}_throughput_cpuutil_{run_id}.png")
-    plot_throughput_line(summary_df, throughput_path)
+    bar_chart_path = os.path.join(metrics_dir, names["charts"][-2])
+    throughput_path = os.path.join(metrics_dir, names["charts"][-1])
+    with phase("analyzer_charts"):
+        bar_fig = plot_comparison_bar(summary_df, bar_chart_path, keep=generate_pdf)
+        throughput_fig = plot_throughput_line(summary_df, throughput_path, keep=generate_pdf)
 
     # PDF
-    pdf_path = os.path.join(metrics_dir, f"scheduling_report_{run_id}.pdf")
-    if generate_pdf:
-        generate_pdf_report(summary_df, gantt_files, bar_chart_path, throughput_path, pdf_path, per_algorithm_metrics)
+    pdf_path = os.path.join(metrics_dir, names["reports"][0])
+    try:
+        if generate_pdf:
+            with phase("analyzer_pdf"):
+                generate_pdf_report(summary_df, gantt_figures, bar_fig, throughput_fig, pdf_path,
+                                    per_algorithm_metrics)
+    finally:
+        for fig in [bar_fig, throughput_fig] + [fig for _, fig in gantt_figures]:
+            if fig is not None:
+                plt.close(fig)
 
     return {
         "summary_df": summary_df,
@@ -343,6 +456,55 @@ def analyze_and_report(
         "run_id": run_id
     }
 
+def render_artifact(
+        scheduler_output_dir: str,
+        algorithms: List[str],
+        metrics_dir: str,
+        run_id: str,
+        filename: str
+) -> List[str]:
+    """
+    Render one of the run's artifact_names() on its own: a Gantt chart only
+    loads its algorithm, the comparison charts only the metrics; the PDF
+    report runs analyze_and_report() (which writes every chart as well).
+    Returns the names of the files written in metrics_dir.
+    """
+    os.makedirs(metrics_dir, exist_ok=True)
+    names = artifact_names(algorithms, run_id)
+    if filename in names["reports"]:
+        analyze_and_report(scheduler_output_dir, algorithms, metrics_dir, run_id=run_id)
+        written = names["charts"] + names["reports"] + [f"algorithms_comparison_summary_{run_id}.csv"]
+        return [name for name in written if os.path.exists(os.path.join(metrics_dir, name))]
+    if filename not in names["charts"]:
+        raise ValueError(f"Unknown artifact for run {run_id}: {filename}")
+
+    path = os.path.join(metrics_dir, filename)
+    gantt = dict(zip(names["charts"], algorithms))
+    if filename in gantt:
+        alg = gantt[filename]
+        output = find_output(scheduler_output_dir, alg)
+        with phase("analyzer_load"):
+            loaded = safe_load_metrics(output) if output else None
+        if loaded is None:
+            raise FileNotFoundError(f"No output for {alg} in run {run_id}")
+        with phase("analyzer_gantt"):
+            plot_gantt(loaded["timeline"], title=f"{alg} Gantt Chart", path=path)
+    else:
+        rows = []
+        with phase("analyzer_load"):
+            for alg in algorithms:
+                output = find_output(scheduler_output_dir, alg)
+                loaded = safe_load_metrics(output) if output else None
+                if loaded is not None:
+                    rows.append(metrics_summary_row(loaded["metrics"], alg))
+        summary_df = pd.DataFrame(rows)
+        with phase("analyzer_charts"):
+            if filename == names["charts"][-2]:
+                plot_comparison_bar(summary_df, path)
+            else:
+                plot_throughput_line(summary_df, path)
+    return [filename] if os.path.exists(path) else []
+
 # -------------------------
 # CLI
 # -------------------------
@@ -357,20 +519,26 @@ if __name__ == "__main__":
                         help="Directory to save charts and report")
     parser.add_argument("--no-pdf", action="store_true", help="Skip PDF generation")
     parser.add_argument("--run-id", type=str, default=None, help="Unique run ID for chart/report filenames")
+    parser.add_argument("--timings", action="store_true",
+                        help="Print per-phase timings as a final '[TIMINGS] {json}' line")
     args = parser.parse_args()
 
-    res = analyze_and_report(
-        scheduler_output_dir=args.scheduler_outputs,
-        algorithms=args.algorithms,
-        metrics_dir=args.metrics_dir,
-        generate_pdf=not args.no_pdf,
-        run_id=args.run_id
-    )
+    with recording() as timings:
+        res = analyze_and_report(
+            scheduler_output_dir=args.scheduler_outputs,
+            algorithms=args.algorithms,
+            metrics_dir=args.metrics_dir,
+            generate_pdf=not args.no_pdf,
+            run_id=args.run_id
+        )
 
     if res:
         print("\n=== Analysis complete ===")
-        print(f"Summary saved to: {os.path.join(args.metrics_dir, f'algorithms_comparison_summary_{res['run_id']}.csv')}")
+        summary_name = f"algorithms_comparison_summary_{res['run_id']}.csv"
+        print(f"Summary saved to: {os.path.join(args.metrics_dir, summary_name)}")
         print(f"PDF report: {res.get('pdf')}")
         print("Generated Gantt charts:")
         for alg, p in res.get("gantt_files", []):
-            print(f"  {alg}: {p}")
\ No newline at end of file
+            print(f"  {alg}: {p}")
+    if args.timings:
+        print("[TIMINGS] " + json.dumps(timings.as_ms()))
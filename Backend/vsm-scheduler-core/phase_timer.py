@@ -0,0 +1,82 @@
+"""
+phase_timer.py — Lightweight Phase Timers
+------------------------------------------
+Wall-clock timers for the phases of one request or run:
+
+    with recording() as timings:
+        with phase("scheduler_engine"):
+            ...
+    timings.as_ms()          # {"scheduler_engine": 12.3}
+    timings.server_timing()  # 'scheduler_engine;dur=12.3' (Server-Timing header)
+
+The active recorder lives in a ContextVar, so concurrent requests do not mix.
+Without an active recorder phase() only does one ContextVar lookup, so the
+timers can stay in the hot paths of scheduler_core and metrics_analyzer.
+A phase that runs several times accumulates.
+"""
+
+import time
+from contextvars import ContextVar
+
+_active = ContextVar("phase_timings", default=None)
+
+class PhaseTimings:
+    __slots__ = ("seconds", "_token")
+
+    def __init__(self):
+        self.seconds = {}  # phase -> total seconds, in first-seen order
+        self._token = None
+
+    def add(self, name, seconds):
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def merge(self, timings_ms, prefix=""):
+        """Add timings reported elsewhere (worker, subprocess) as {phase: ms}."""
+        for name, ms in (timings_ms or {}).items():
+            self.add(prefix + name, ms / 1000)
+
+    def as_ms(self):
+        return {name: round(s * 1000, 3) for name, s in self.seconds.items()}
+
+    def server_timing(self):
+        return ", ".join(f"{name};dur={ms:.3f}" for name, ms in self.as_ms().items())
+
+    # Used as "with recording() as timings" or activated/deactivated by hooks
+    def activate(self):
+        self._token = _active.set(self)
+        return self
+
+    def deactivate(self):
+        if self._token is not None:
+            _active.reset(self._token)
+            self._token = None
+
+    def __enter__(self):
+        return self.activate()
+
+    def __exit__(self, *exc):
+        self.deactivate()
+
+def recording():
+    """New PhaseTimings, active inside the with block."""
+    return PhaseTimings()
+
+def active():
+    return _active.get()
+
+class phase:
+    """Time the with block into the active recorder (no-op without one)."""
+    __slots__ = ("name", "timings", "t0")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.timings = _active.get()
+        if self.timings is not None:
+            self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.timings is not None:
+            self.timings.add(self.name, time.perf_counter() - self.t0)
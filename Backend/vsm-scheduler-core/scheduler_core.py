@@ -1,373 +1,2029 @@
-#!/usr/bin/env python3
-"""
-scheduler_core.py
-
-Provides schedule(process_list, algorithm, params) API and CLI wrapper.
-Supports: FCFS, SJF (non-preemptive), SRTF (preemptive),
-Priority (preemptive & non-preemptive), Round Robin,
-Static MLQ (Multilevel Queue), and MLFQ (Multilevel Feedback Queue).
-
-Output: dictionary with "timeline" (list of {pid,start,end}),
-and "metrics" (per-process and aggregate statistics).
-
-Author: Team Member 1 — Core Scheduling Engine
-"""
-
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
-import heapq, json, csv, copy, os
-import pandas as pd
-
-# ------------------------- #
-# Data Structures
-# ------------------------- #
-@dataclass
-class Process:
-    pid: str
-    arrival: int
-    cpu_burst: int = 0
-    priority: int = 0
-    queue_level: int = 0
-    remaining: int = 0
-    started: Optional[int] = None
-    completed: Optional[int] = None
-
-    def __post_init__(self):
-        self.remaining = self.cpu_burst
-
-# ------------------------- #
-# Utility Helpers
-# ------------------------- #
-def make_timeline_entry(pid, start, end):
-    return {"pid": pid, "start": start, "end": end}
-
-def compute_metrics(processes: List[Process], timeline: List[Dict[str, int]], context_switch_time=0):
-    per = {}
-    for p in processes:
-        tat = p.completed - p.arrival if p.completed is not None else 0
-        wt = tat - p.cpu_burst
-        rt = p.started - p.arrival if p.started is not None else None
-        per[p.pid] = {"waiting": wt, "turnaround": tat, "response": rt, "completion": p.completed}
-
-    # Fix: Calculate busy_time from timeline (exclude context switch and idle)
-    busy_time = sum(seg["end"] - seg["start"] for seg in timeline if seg["pid"] not in ("CS", "IDLE"))
-    total_time = max((seg["end"] for seg in timeline), default=0)
-    avg_wait = sum(v["waiting"] for v in per.values()) / len(per) if per else 0
-    avg_tat = sum(v["turnaround"] for v in per.values()) / len(per) if per else 0
-    throughput = len(per) / total_time if total_time > 0 else 0
-    cpu_util = busy_time / total_time if total_time > 0 else 0
-
-    return {
-        "per_process": per,
-        "avg_waiting": avg_wait,
-        "avg_turnaround": avg_tat,
-        "throughput": throughput,
-        "cpu_utilization": cpu_util,
-        "total_time": total_time
-    }
-
-def parse_csv_to_processes(csv_path: str) -> List[Process]:
-    procs = []
-    with open(csv_path, 'r') as f:
-        r = csv.DictReader(f)
-        for row in r:
-            pid = row.get('PID') or row.get('pid')
-            arrival = int(row.get('ArrivalTime') or row.get('arrival') or 0)
-            burst = int(row.get('BurstTime') or row.get('burst') or 0)
-            pr = int(row.get('Priority') or row.get('priority') or 0)
-            ql = int(row.get('QueueLevel') or row.get('queue_level') or 0)
-            p = Process(pid=str(pid), arrival=arrival, cpu_burst=burst, priority=pr, queue_level=ql)
-            procs.append(p)
-    return procs
-
-# ------------------------- #
-# Scheduling Implementations
-# ------------------------- #
-def schedule_fcfs(process_list: List[Process], params):
-    procs = sorted(process_list, key=lambda p: (p.arrival, p.pid))
-    time, timeline = 0, []
-    for p in procs:
-        if time < p.arrival:
-            time = p.arrival
-        p.started = time
-        start, end = time, time + p.cpu_burst
-        timeline.append(make_timeline_entry(p.pid, start, end))
-        p.completed = end
-        time = end + params.get("context_switch", 0)
-    return {"timeline": timeline, "metrics": compute_metrics(procs, timeline, params.get("context_switch", 0))}
-
-def schedule_sjf_nonpreemptive(process_list: List[Process], params):
-    events = sorted(copy.deepcopy(process_list), key=lambda p: p.arrival)
-    ready, timeline = [], []
-    idx, time, n = 0, 0, len(events)
-    while idx < n or ready:
-        if not ready:
-            time = max(time, events[idx].arrival)
-        while idx < n and events[idx].arrival <= time:
-            p = events[idx]
-            heapq.heappush(ready, (p.cpu_burst, p.arrival, p.pid, p))
-            idx += 1
-        _, _, _, psel = heapq.heappop(ready)
-        psel.started, start, end = time, time, time + psel.cpu_burst
-        timeline.append(make_timeline_entry(psel.pid, start, end))
-        psel.completed = end
-        time = end + params.get("context_switch", 0)
-    return {"timeline": timeline, "metrics": compute_metrics(events, timeline, params.get("context_switch", 0))}
-
-def schedule_srtf(process_list: List[Process], params):
-    procs = [copy.deepcopy(p) for p in process_list]
-    ready_heap, timeline = [], []
-    procs_by_arr = sorted(procs, key=lambda p: p.arrival)
-    time, idx, current = 0, 0, None
-    context = params.get("context_switch", 0)
-
-    while idx < len(procs_by_arr) or ready_heap or current:
-        while idx < len(procs_by_arr) and procs_by_arr[idx].arrival <= time:
-            p = procs_by_arr[idx]
-            heapq.heappush(ready_heap, (p.remaining, p.arrival, p.pid, p))
-            idx += 1
-        if current is None:
-            if ready_heap:
-                _, _, _, p = heapq.heappop(ready_heap)
-                if p.started is None:
-                    p.started = time
-                current = p
-            else:
-                if idx < len(procs_by_arr):
-                    time = procs_by_arr[idx].arrival
-                    continue
-                break
-        else:
-            next_arrival_time = procs_by_arr[idx].arrival if idx < len(procs_by_arr) else None
-            if next_arrival_time is None or time + current.remaining <= next_arrival_time:
-                start, end = time, time + current.remaining
-                timeline.append(make_timeline_entry(current.pid, start, end))
-                time = end
-                current.completed, current = time, None
-                time += context
-            else:
-                run = next_arrival_time - time
-                start, end = time, time + run
-                timeline.append(make_timeline_entry(current.pid, start, end))
-                current.remaining -= run
-                time = end
-                while idx < len(procs_by_arr) and procs_by_arr[idx].arrival <= time:
-                    p = procs_by_arr[idx]
-                    heapq.heappush(ready_heap, (p.remaining, p.arrival, p.pid, p))
-                    idx += 1
-                if ready_heap and ready_heap[0][0] < current.remaining:
-                    heapq.heappush(ready_heap, (current.remaining, current.arrival, current.pid, current))
-                    current, time = None, time + context
-    return {"timeline": timeline, "metrics": compute_metrics(procs, timeline, context)}
-
-def schedule_round_robin(process_list: List[Process], params):
-    quantum = int(params.get("quantum", 4))
-    if quantum <= 0:
-        raise ValueError("Quantum must be > 0")
-    procs = sorted([copy.deepcopy(p) for p in process_list], key=lambda p: (p.arrival, p.pid))
-    time, ready_q, idx, n = 0, [], 0, len(procs)
-    timeline = []
-    while idx < n or ready_q:
-        if not ready_q:
-            time = max(time, procs[idx].arrival)
-        while idx < n and procs[idx].arrival <= time:
-            p = procs[idx]
-            ready_q.append(p)
-            idx += 1
-        p = ready_q.pop(0)
-        if p.started is None:
-            p.started = time
-        run = min(quantum, p.remaining)
-        start, end = time, time + run
-        timeline.append(make_timeline_entry(p.pid, start, end))
-        p.remaining -= run
-        time = end + params.get("context_switch", 0)
-        while idx < n and procs[idx].arrival <= time:
-            ready_q.append(procs[idx])
-            idx += 1
-        if p.remaining > 0:
-            ready_q.append(p)
-        else:
-            p.completed = end
-    return {"timeline": timeline, "metrics": compute_metrics(procs, timeline, params.get("context_switch", 0))}
-
-def schedule_priority_generic(process_list: List[Process], params, preemptive=True):
-    procs = [copy.deepcopy(p) for p in process_list]
-    procs_by_arr = sorted(procs, key=lambda p: p.arrival)
-    ready, timeline, time, idx, current = [], [], 0, 0, None
-    context = params.get("context_switch", 0)
-    while idx < len(procs_by_arr) or ready or current:
-        while idx < len(procs_by_arr) and procs_by_arr[idx].arrival <= time:
-            p = procs_by_arr[idx]
-            heapq.heappush(ready, (p.priority, p.arrival, p.pid, p))
-            idx += 1
-        if current is None:
-            if ready:
-                _, _, _, p = heapq.heappop(ready)
-                if p.started is None:
-                    p.started = time
-                current = p
-            else:
-                if idx < len(procs_by_arr):
-                    time = procs_by_arr[idx].arrival
-                    continue
-                break
-        else:
-            if preemptive:
-                next_arrival = procs_by_arr[idx].arrival if idx < len(procs_by_arr) else None
-                if next_arrival is None or time + current.remaining <= next_arrival:
-                    start, end = time, time + current.remaining
-                    timeline.append(make_timeline_entry(current.pid, start, end))
-                    time = end
-                    current.completed, current = time, None
-                    time += context
-                else:
-                    run = next_arrival - time
-                    start, end = time, time + run
-                    timeline.append(make_timeline_entry(current.pid, start, end))
-                    current.remaining -= run
-                    time = end
-                    while idx < len(procs_by_arr) and procs_by_arr[idx].arrival <= time:
-                        p = procs_by_arr[idx]
-                        heapq.heappush(ready, (p.priority, p.arrival, p.pid, p))
-                        idx += 1
-                    if ready and ready[0][0] < current.priority:
-                        heapq.heappush(ready, (current.priority, current.arrival, current.pid, current))
-                        current, time = None, time + context
-            else:
-                start, end = time, time + current.remaining
-                timeline.append(make_timeline_entry(current.pid, start, end))
-                current.completed = end
-                time, current = end + context, None
-    return {"timeline": timeline, "metrics": compute_metrics(procs, timeline, context)}
-
-def schedule_mlq(process_list: List[Process], params):
-    queues = params.get("queues", 3)
-    context = params.get("context_switch", 0)
-    procs = sorted(copy.deepcopy(process_list), key=lambda p: (p.arrival, p.pid))
-    timeline, time = [], 0
-    for qid in range(queues):
-        q_procs = [p for p in procs if p.queue_level == qid]
-        q_procs.sort(key=lambda p: (p.arrival, p.pid))
-        for p in q_procs:
-            if time < p.arrival:
-                time = p.arrival
-            p.started = time
-            start, end = time, time + p.cpu_burst
-            timeline.append(make_timeline_entry(p.pid, start, end))
-            p.completed = end
-            time = end + context
-    return {"timeline": timeline, "metrics": compute_metrics(procs, timeline, context)}
-
-def schedule_mlfq(process_list: List[Process], params):
-    levels = params.get("levels", 3)
-    quanta = params.get("quanta", [4, 8, 16])
-    if len(quanta) < levels:
-        quanta = (quanta + [quanta[-1]] * (levels - len(quanta)))[:levels]
-    procs = sorted(copy.deepcopy(process_list), key=lambda p: (p.arrival, p.pid))
-    time, idx, queues = 0, 0, [[] for _ in range(levels)]
-    timeline, context = [], params.get("context_switch", 0)
-    while idx < len(procs) or any(queues):
-        if not any(queues):
-            time = max(time, procs[idx].arrival)
-        while idx < len(procs) and procs[idx].arrival <= time:
-            p = procs[idx]
-            queues[0].append(p)
-            idx += 1
-        qid = next((i for i, q in enumerate(queues) if q), None)
-        if qid is None:
-            continue
-        p = queues[qid].pop(0)
-        if p.started is None:
-            p.started = time
-        quantum = quanta[qid]
-        run = min(quantum, p.remaining)
-        start, end = time, time + run
-        timeline.append(make_timeline_entry(p.pid, start, end))
-        p.remaining -= run
-        time = end + context
-        while idx < len(procs) and procs[idx].arrival <= time:
-            queues[0].append(procs[idx])
-            idx += 1
-        if p.remaining > 0:
-            new_q = min(levels - 1, qid + 1)
-            queues[new_q].append(p)
-        else:
-            p.completed = end
-    return {"timeline": timeline, "metrics": compute_metrics(procs, timeline, context)}
-
-# ------------------------- #
-# Public API
-# ------------------------- #
-def schedule(process_list: List[Process], algorithm: str, params: Optional[Dict[str, Any]] = None):
-    if params is None:
-        params = {}
-    alg = algorithm.strip().upper()
-    if alg == "FCFS":
-        return schedule_fcfs(process_list, params)
-    elif alg == "SJF":
-        return schedule_sjf_nonpreemptive(process_list, params)
-    elif alg == "SRTF":
-        return schedule_srtf(process_list, params)
-    elif alg == "RR":
-        return schedule_round_robin(process_list, params)
-    elif alg == "PRIORITY":
-        return schedule_priority_generic(process_list, params, params.get("preemptive", True))
-    elif alg == "MLQ":
-        return schedule_mlq(process_list, params)
-    elif alg == "MLFQ":
-        return schedule_mlfq(process_list, params)
-    else:
-        raise ValueError(f"Unknown algorithm: {alg}")
-
-# ------------------------- #
-# CLI Entry Point
-# ------------------------- #
-if __name__ == "__main__":
-    import argparse
-    parser = argparse.ArgumentParser(description="CPU Scheduling Core Engine")
-    parser.add_argument('--input', required=True, help='CSV or JSON input file')
-    parser.add_argument('--alg', required=True, help='Algorithm name (FCFS, SJF, SRTF, RR, PRIORITY, MLQ, MLFQ)')
-    parser.add_argument('--quantum', type=int, default=4)
-    parser.add_argument('--context-switch', type=int, default=0)
-    parser.add_argument('--queues', type=int, default=3)
-    parser.add_argument('--out', default=None, help='Output JSON filename (optional)')
-    parser.add_argument('--preemptive', action='store_true')
-    args = parser.parse_args()
-
-    OUTPUT_DIR = "outputs"
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-    if args.input.endswith(".csv"):
-        procs = parse_csv_to_processes(args.input)
-    else:
-        with open(args.input, 'r') as f:
-            data = json.load(f)
-        procs = [Process(pid=d["pid"], arrival=d["arrival"], cpu_burst=d["burst"], priority=d.get("priority", 0)) for d in data]
-
-    result = schedule(procs, args.alg, {
-        "quantum": args.quantum,
-        "context_switch": args.context_switch,
-        "queues": args.queues,
-        "preemptive": args.preemptive
-    })
-
-    out_file = args.out or f"{args.alg.lower()}_output.json"
-    out_path = os.path.join(OUTPUT_DIR, out_file)
-    with open(out_path, 'w') as f:
-        json.dump(result, f, indent=2)
-    print(f"\n✅ JSON result saved to: {out_path}")
-
-    df = pd.DataFrame(result["metrics"]["per_process"]).T
-    print("\n=== Per Process Metrics ===")
-    print(df)
-    print("\n=== Aggregate Metrics ===")
-    print(f"Average Waiting Time: {result['metrics']['avg_waiting']:.2f}")
-    print(f"Average Turnaround Time: {result['metrics']['avg_turnaround']:.2f}")
-    print(f"CPU Utilization: {result['metrics']['cpu_utilization']*100:.2f}%")
-    print(f"Throughput: {result['metrics']['throughput']:.3f}")
-
-    metrics_csv_path = os.path.join(OUTPUT_DIR, f"{args.alg.lower()}_metrics.csv")
-    df.to_csv(metrics_csv_path, index_label="PID")
-    print(f"\n📊 Metrics CSV exported to: {metrics_csv_path}")
+#!/usr/bin/env python3
+"""
+scheduler_core.py
+
+Provides schedule(process_list, algorithm, params) API and CLI wrapper.
+Supports: FCFS, SJF (non-preemptive), SRTF (preemptive),
+Priority (preemptive & non-preemptive), Round Robin,
+Static MLQ (Multilevel Queue), and MLFQ (Multilevel Feedback Queue).
+
+Input: a ProcessTable (columnar, see load_process_table) or a list of
+Process objects. Engines never mutate the input; each run copies only the
+mutable columns (remaining/started/completed).
+
+Output: dictionary with "timeline" (a Timeline: array-backed sequence of
+{pid,start,end}, with pid "CS"/"IDLE" for context switches and idle time),
+"metrics" (per-process and aggregate statistics) and "dispatcher_summary"
+(params["context_switch"] is charged by a Dispatcher at every dispatch);
+serialize with json.dump(..., default=json_default).
+
+Multi-core: params["cores"] = N simulates N cores (schedule_smp) with either
+one global ready queue (params["topology"] = "global", the default) or
+per-core run queues with affinity, work stealing and periodic balancing
+("per_core"); migration_cost charges a process for changing cores. The
+timeline then has a core column and metrics gain per_core, makespan,
+imbalance, topology counters and system-wide utilization. core_scaling()
+sweeps N; sweep() runs any parameter grid (quantum, context_switch, quanta).
+
+Streaming: schedule_stream(process_iter, algorithm, params) runs the same
+engines over an iterator sorted by arrival and yields segment / per-process
+/ summary events as it goes (CLI: --stream writes them as JSON Lines).
+
+Timing: engine and metrics phases are recorded with phase_timer when the
+caller has a recorder active (runtime.run_schedule does).
+
+Author: Team Member 1 — Core Scheduling Engine
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+from collections.abc import Mapping, Sequence
+from array import array
+import csv, heapq, itertools, json, os
+from collections import deque
+import numpy as np
+import pandas as pd
+
+from dispatcher_module import Dispatcher
+from phase_timer import phase
+
+# ------------------------- #
+# Data Structures
+# ------------------------- #
+@dataclass(slots=True)
+class Process:
+    pid: str
+    arrival: int
+    cpu_burst: int = 0
+    priority: int = 0
+    queue_level: int = 0
+    remaining: int = 0
+    started: Optional[int] = None
+    completed: Optional[int] = None
+    affinity: int = -1  # core the process is pinned to (per-core topology), -1 = any
+
+    def __post_init__(self):
+        self.remaining = self.cpu_burst
+
+NOT_SET = -1  # started/completed column value for "None" (times are never negative)
+
+class ProcessTable:
+    """
+    Columnar process table: row i is process i, one NumPy array per field.
+    arrival/burst/priority/queue_level/affinity are read-only inputs (engines
+    share their input_lists()); remaining/started/completed hold the initial
+    per-run state, which engines copy (and only those columns) via
+    run_state() instead of deep-copying Process objects.
+    """
+    __slots__ = ("pid", "arrival", "burst", "priority", "queue_level", "affinity",
+                 "remaining", "started", "completed", "_unique_pids", "_sort_cache", "_input_lists")
+
+    def __init__(self, pid, arrival, burst, priority=None, queue_level=None, affinity=None):
+        n = len(pid)
+        self.pid = [str(p) for p in pid]
+        self.arrival = np.asarray(arrival, dtype=np.int64)
+        self.burst = np.asarray(burst, dtype=np.int64)
+        self.priority = np.zeros(n, np.int64) if priority is None else np.asarray(priority, dtype=np.int64)
+        self.queue_level = np.zeros(n, np.int64) if queue_level is None else np.asarray(queue_level, dtype=np.int64)
+        self.affinity = np.full(n, NOT_SET, np.int64) if affinity is None else np.asarray(affinity, dtype=np.int64)
+        self.remaining = self.burst.copy()
+        self.started = np.full(n, NOT_SET, np.int64)
+        self.completed = np.full(n, NOT_SET, np.int64)
+        self._unique_pids = None
+        self._sort_cache = {}
+        self._input_lists = None
+
+    def __getstate__(self):
+        # The list views are rebuilt on demand rather than pickled with the arrays
+        return {name: getattr(self, name) for name in self.__slots__ if name != "_input_lists"}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._input_lists = None
+
+    def __len__(self):
+        return len(self.pid)
+
+    @classmethod
+    def from_processes(cls, processes: List[Process]) -> "ProcessTable":
+        return cls(
+            [p.pid for p in processes],
+            [p.arrival for p in processes],
+            [p.cpu_burst for p in processes],
+            [p.priority for p in processes],
+            [p.queue_level for p in processes],
+            [p.affinity for p in processes],
+        )
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "ProcessTable":
+        """Rows shaped like {pid, arrival, burst, priority, queue_level, affinity}."""
+        return cls(
+            [r["pid"] for r in records],
+            [r["arrival"] for r in records],
+            [r["burst"] for r in records],
+            [r.get("priority", 0) for r in records],
+            [r.get("queue_level", 0) for r in records],
+            [r.get("affinity", NOT_SET) for r in records],
+        )
+
+    def to_processes(self) -> List[Process]:
+        """Compatibility view as a list of Process objects."""
+        started, completed = self.started.tolist(), self.completed.tolist()
+        procs = []
+        for i, (pid, arr, burst, pr, ql, aff, rem) in enumerate(zip(
+                self.pid, self.arrival.tolist(), self.burst.tolist(), self.priority.tolist(),
+                self.queue_level.tolist(), self.affinity.tolist(), self.remaining.tolist())):
+            p = Process(pid=pid, arrival=arr, cpu_burst=burst, priority=pr, queue_level=ql, affinity=aff)
+            p.remaining = rem
+            p.started = None if started[i] == NOT_SET else started[i]
+            p.completed = None if completed[i] == NOT_SET else completed[i]
+            procs.append(p)
+        return procs
+
+    def has_unique_pids(self) -> bool:
+        if self._unique_pids is None:
+            self._unique_pids = len(set(self.pid)) == len(self.pid)
+        return self._unique_pids
+
+    def input_lists(self):
+        """
+        (arrival, burst, priority, queue_level, affinity) as Python lists, built
+        once per table and shared by every run (engines only read them).
+        """
+        if self._input_lists is None:
+            self._input_lists = tuple(col.tolist() for col in (
+                self.arrival, self.burst, self.priority, self.queue_level, self.affinity))
+        return self._input_lists
+
+    def run_state(self):
+        """Fresh (remaining, started, completed) lists for one engine run."""
+        return self.remaining.tolist(), self.started.tolist(), self.completed.tolist()
+
+    def sort_index(self, by_pid=True) -> np.ndarray:
+        """
+        Row indices by (arrival, pid), or by arrival keeping input order for
+        ties. Computed once per table (the columns are read-only) and shared by
+        every run; pids are only compared when arrivals actually tie.
+        """
+        cached = self._sort_cache.get(by_pid)
+        if cached is None:
+            cached = np.argsort(self.arrival, kind="stable")
+            if by_pid and len(cached) > 1:
+                arr = self.arrival[cached]
+                if (arr[1:] == arr[:-1]).any():
+                    cached = np.lexsort((np.asarray(self.pid), self.arrival))
+            cached.setflags(write=False)
+            self._sort_cache[by_pid] = cached
+        return cached
+
+    def order(self, by_pid=True) -> List[int]:
+        return self.sort_index(by_pid).tolist()
+
+def as_process_table(process_list) -> ProcessTable:
+    if isinstance(process_list, ProcessTable):
+        return process_list
+    return ProcessTable.from_processes(process_list)
+
+IDLE, CS = -1, -2  # Timeline codes for idle and context-switch segments
+_SPECIAL_NAMES = {IDLE: "IDLE", CS: "CS"}
+_SPECIAL_CODES = {"IDLE": IDLE, "CS": CS, "CONTEXT_SWITCH": CS}
+
+class Timeline(Sequence):
+    """
+    Timeline stored as three int64 arrays: code (row index into `pids`, or
+    IDLE/CS), start and end. Indexing/iterating yields the classic
+    {"pid", "start", "end"} dicts on demand; arrays() gives NumPy views for
+    vectorized consumers and json_default() serializes it as the list form.
+    Multi-core timelines carry a fourth `core` column and their entries a
+    "core" key; single-core timelines have core=None. to_rle()/from_rle()
+    convert to and from the compact run-length form.
+    """
+    __slots__ = ("pids", "code", "start", "end", "core")
+
+    def __init__(self, pids: List[str], cores=False):
+        self.pids = pids
+        self.code, self.start, self.end = array("q"), array("q"), array("q")
+        self.core = array("q") if cores else None
+
+    def append(self, code: int, start: int, end: int):
+        self.code.append(code)
+        self.start.append(start)
+        self.end.append(end)
+
+    def name(self, code: int) -> str:
+        return self.pids[code] if code >= 0 else _SPECIAL_NAMES[code]
+
+    def __len__(self):
+        return len(self.code)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        entry = make_timeline_entry(self.name(self.code[idx]), self.start[idx], self.end[idx])
+        if self.core is not None:
+            entry["core"] = self.core[idx]
+        return entry
+
+    def __iter__(self):
+        name = self.name
+        if self.core is not None:
+            for code, start, end, core in zip(self.code, self.start, self.end, self.core):
+                yield {"pid": name(code), "start": start, "end": end, "core": core}
+            return
+        for code, start, end in zip(self.code, self.start, self.end):
+            yield make_timeline_entry(name(code), start, end)
+
+    def arrays(self):
+        """(code, start, end) as int64 NumPy arrays sharing the timeline's memory."""
+        return tuple(np.frombuffer(col, dtype=np.int64) if len(col) else np.zeros(0, np.int64)
+                     for col in (self.code, self.start, self.end))
+
+    def cores(self) -> Optional[np.ndarray]:
+        """Core column as an int64 NumPy array (None for single-core timelines)."""
+        if self.core is None:
+            return None
+        return np.frombuffer(self.core, dtype=np.int64) if len(self.core) else np.zeros(0, np.int64)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+    @classmethod
+    def from_arrays(cls, pids, code, start, end, core=None) -> "Timeline":
+        timeline = cls(pids, cores=core is not None)
+        columns = (timeline.code, timeline.start, timeline.end, timeline.core)
+        for col, values in zip(columns, (code, start, end, core)):
+            if col is not None:
+                col.frombytes(np.ascontiguousarray(values, dtype=np.int64).tobytes())
+        return timeline
+
+    def to_rle(self) -> Dict[str, Any]:
+        """
+        Run-length form: {"format": "rle", "names": [...], "runs": [name, length, ...]}
+        where each CPU's segments are laid back to back from time 0 as flat
+        (index into names, duration) pairs and index -1 marks a gap.
+        Multi-core timelines give one run list per core under "cores" instead.
+        """
+        code, start, end = self.arrays()
+        used, index = np.unique(code, return_inverse=True)
+        names = [self.name(c) for c in used.tolist()]
+
+        def track(rows):
+            rows = rows[np.argsort(start[rows], kind="stable")]
+            s, e = start[rows], end[rows]
+            runs = np.empty((len(rows), 4), dtype=np.int64)
+            runs[:, 0] = -1
+            runs[:, 1] = s
+            runs[1:, 1] -= e[:-1]
+            runs[:, 2] = index[rows]
+            runs[:, 3] = e - s
+            pairs = runs.reshape(-1, 2)
+            return pairs[(pairs[:, 0] >= 0) | (pairs[:, 1] != 0)].ravel().tolist()
+
+        core = self.cores()
+        if core is None:
+            return {"format": "rle", "names": names, "runs": track(np.arange(len(code)))}
+        n_cores = int(core.max()) + 1 if len(core) else 0
+        return {"format": "rle", "names": names,
+                "cores": [track(np.flatnonzero(core == c)) for c in range(n_cores)]}
+
+    @classmethod
+    def from_rle(cls, rle) -> "Timeline":
+        """Inverse of to_rle()."""
+        pids, to_code = [], []
+        for name in rle["names"]:
+            code = _SPECIAL_CODES.get(str(name).upper())
+            if code is None:
+                code = len(pids)
+                pids.append(name)
+            to_code.append(code)
+        to_code = np.asarray(to_code, dtype=np.int64)
+
+        def track(runs):
+            runs = np.asarray(runs, dtype=np.int64).reshape(-1, 2)
+            end = np.cumsum(runs[:, 1])
+            seg = runs[:, 0] >= 0
+            return to_code[runs[seg, 0]], (end - runs[:, 1])[seg], end[seg]
+
+        if "cores" not in rle:
+            return cls.from_arrays(pids, *track(rle["runs"]))
+        tracks = [track(runs) for runs in rle["cores"]] or [track([])]
+        code, start, end = (np.concatenate(col) for col in zip(*tracks))
+        core = np.repeat(np.arange(len(tracks)), [len(t[0]) for t in tracks])
+        by_start = np.lexsort((core, start))
+        return cls.from_arrays(pids, code[by_start], start[by_start], end[by_start], core[by_start])
+
+    @classmethod
+    def from_entries(cls, entries) -> "Timeline":
+        """Build from {"pid","start","end"} dicts or the to_rle() form (a Timeline is returned as is)."""
+        if isinstance(entries, Timeline):
+            return entries
+        if isinstance(entries, Mapping) and entries.get("format") == "rle":
+            return cls.from_rle(entries)
+        entries = list(entries)
+        timeline = cls([], cores=bool(entries) and "core" in entries[0])
+        codes = {}
+        for seg in entries:
+            pid = seg["pid"]
+            code = _SPECIAL_CODES.get(str(pid).upper())
+            if code is None:
+                code = codes.get(pid)
+                if code is None:
+                    code = codes[pid] = len(timeline.pids)
+                    timeline.pids.append(pid)
+            timeline.append(code, seg["start"], seg["end"])
+            if timeline.core is not None:
+                timeline.core.append(seg["core"])
+        return timeline
+
+def json_default(obj):
+    """json.dump(default=...) hook for Timeline, lazy metrics and NumPy scalars."""
+    if isinstance(obj, Timeline):
+        return obj.to_list()
+    if isinstance(obj, ProcessMetrics):
+        return obj.to_dict()
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class ProcessMetrics(Mapping):
+    """
+    Read-only {pid: {"waiting","turnaround","response","completion"}} view over
+    per-process metric arrays; the per-pid dicts are only built when accessed.
+    """
+    __slots__ = ("pids", "order", "columns", "_index")
+
+    def __init__(self, pids, order, waiting, turnaround, response, completion):
+        self.pids, self.order = pids, order
+        self.columns = (waiting, turnaround, response, completion)
+        self._index = None
+
+    def _rows(self):
+        if self._index is None:
+            # Same semantics as filling a dict in `order`: a repeated pid keeps
+            # its first position and its last row's values.
+            index = {}
+            for i in self.order:
+                index[self.pids[i]] = i
+            self._index = index
+        return self._index
+
+    def _entry(self, i):
+        waiting, turnaround, response, completion = self.columns
+        done = int(completion[i])
+        first = int(response[i])
+        return {"waiting": int(waiting[i]), "turnaround": int(turnaround[i]),
+                "response": first if first != NOT_SET else None,
+                "completion": done if done != NOT_SET else None}
+
+    def __getitem__(self, pid):
+        return self._entry(self._rows()[pid])
+
+    def __iter__(self):
+        return iter(self._rows())
+
+    def __len__(self):
+        return len(self._rows())
+
+    def items(self):
+        entry = self._entry
+        return [(pid, entry(i)) for pid, i in self._rows().items()]
+
+    def to_dict(self):
+        waiting, turnaround, response, completion = (c.tolist() for c in self.columns)
+        per = {}
+        for pid, i in self._rows().items():
+            per[pid] = {"waiting": waiting[i], "turnaround": turnaround[i],
+                        "response": response[i] if response[i] != NOT_SET else None,
+                        "completion": completion[i] if completion[i] != NOT_SET else None}
+        return per
+
+# ------------------------- #
+# Utility Helpers
+# ------------------------- #
+def make_timeline_entry(pid, start, end):
+    return {"pid": pid, "start": start, "end": end}
+
+def timeline_stats(timeline) -> Dict[str, int]:
+    """Busy/idle/context-switch totals of a timeline in one vectorized pass."""
+    code, start, end = Timeline.from_entries(timeline).arrays()
+    dur = end - start
+    cs = code == CS
+    busy = code >= 0
+    return {
+        "busy_time": int(dur[busy].sum()),
+        "idle_time": int(dur[code == IDLE].sum()),
+        "context_switches": int(cs.sum()),
+        "context_switch_time": int(dur[cs].sum()),
+        "busy_segments": int(busy.sum()),
+        "total_time": int(end.max()) if len(end) else 0
+    }
+
+def compute_metrics(processes: List[Process], timeline: List[Dict[str, int]], context_switch_time=0):
+    table = ProcessTable.from_processes(processes)
+    started = [NOT_SET if p.started is None else p.started for p in processes]
+    completed = [NOT_SET if p.completed is None else p.completed for p in processes]
+    return compute_table_metrics(table, started, completed, timeline)
+
+def compute_table_metrics(table: ProcessTable, started, completed, timeline, order=None, cores=1):
+    """
+    Metrics from the table columns and one run's started/completed, computed
+    with array operations; per_process is a lazy mapping ordered by `order`.
+    throughput is completed processes (not timeline segments) per time unit;
+    cpu_utilization is busy time over cores * total_time.
+    """
+    n = len(table)
+    order = range(n) if order is None else order
+    started = np.asarray(started, dtype=np.int64)
+    completed = np.asarray(completed, dtype=np.int64)
+    done = completed != NOT_SET
+    turnaround = np.where(done, completed - table.arrival, 0)
+    waiting = turnaround - table.burst
+    response = np.where(started != NOT_SET, started - table.arrival, NOT_SET)
+    per = ProcessMetrics(table.pid, order, waiting, turnaround, response, completed)
+
+    stats = timeline_stats(timeline)
+    # busy_time excludes context switch and idle segments
+    busy_time, total_time = stats["busy_time"], stats["total_time"]
+    if table.has_unique_pids():
+        completed_count = int(done.sum())
+        avg_wait = int(waiting.sum()) / n if n else 0
+        avg_tat = int(turnaround.sum()) / n if n else 0
+    else:  # repeated pids: average over the entries per_process keeps
+        rows = np.fromiter(per._rows().values(), dtype=np.int64)
+        completed_count = int(done[rows].sum())
+        avg_wait = int(waiting[rows].sum()) / len(rows)
+        avg_tat = int(turnaround[rows].sum()) / len(rows)
+    throughput = completed_count / total_time if total_time > 0 else 0
+    cpu_util = busy_time / (cores * total_time) if total_time > 0 else 0
+
+    return {
+        "per_process": per,
+        "avg_waiting": avg_wait,
+        "avg_turnaround": avg_tat,
+        "throughput": throughput,
+        "cpu_utilization": cpu_util,
+        "total_time": total_time
+    }
+
+def core_stats(timeline, cores: int) -> List[Dict[str, Any]]:
+    """Per-core busy time, utilization (share of the makespan) and busy segments of a multi-core timeline."""
+    code, start, end = Timeline.from_entries(timeline).arrays()
+    core = timeline.cores()
+    makespan = int(end.max()) if len(end) else 0
+    busy = code >= 0
+    busy_time = np.bincount(core[busy], weights=(end - start)[busy], minlength=cores).astype(np.int64)
+    segments = np.bincount(core[busy], minlength=cores)
+    return [
+        {"core": c, "busy_time": b, "utilization": b / makespan if makespan else 0, "segments": n}
+        for c, (b, n) in enumerate(zip(busy_time.tolist(), segments.tolist()))
+    ]
+
+def _first_column(df, names, default):
+    for name in names:
+        if name in df.columns:
+            return df[name].fillna(default)
+    return pd.Series([default] * len(df), index=df.index)
+
+def load_process_table(csv_path: str, default_burst=0, default_priority=0) -> ProcessTable:
+    """Read a workload CSV (PID/ArrivalTime/BurstTime/Priority/QueueLevel/Affinity) straight into columns."""
+    df = pd.read_csv(csv_path, dtype={"PID": str, "pid": str}, skipinitialspace=True)
+    pid = _first_column(df, ("PID", "pid"), "")
+    pid = [p if p else f"P{i + 1}" for i, p in enumerate(pid.tolist())]
+    return ProcessTable(
+        pid,
+        _first_column(df, ("ArrivalTime", "arrival"), 0).to_numpy(np.int64),
+        _first_column(df, ("BurstTime", "burst"), default_burst).to_numpy(np.int64),
+        _first_column(df, ("Priority", "priority"), default_priority).to_numpy(np.int64),
+        _first_column(df, ("QueueLevel", "queue_level"), 0).to_numpy(np.int64),
+        _first_column(df, ("Affinity", "affinity"), NOT_SET).to_numpy(np.int64),
+    )
+
+def parse_csv_to_processes(csv_path: str) -> List[Process]:
+    return load_process_table(csv_path).to_processes()
+
+# ------------------------- #
+# Run State (tables and streams)
+# ------------------------- #
+class _TableRun:
+    """
+    Engine view of a ProcessTable: the table's shared input lists, one run's
+    mutable state (including its Dispatcher), and the rows of `order`
+    released one at a time by pop().
+    """
+    def __init__(self, table: ProcessTable, order: List[int], context_switch=0):
+        self.pid = table.pid
+        self.arrival, self.burst, self.priority, self.queue_level, self.affinity = table.input_lists()
+        self.remaining, self.started, self.completed = table.run_state()
+        self.dispatcher = Dispatcher(context_switch)
+        self.extra = {}
+        self._order, self._pos = order, 0
+        self.next_arrival = self.arrival[order[0]] if order else None
+
+    def pop(self) -> int:
+        i = self._order[self._pos]
+        self._pos += 1
+        self.next_arrival = self.arrival[self._order[self._pos]] if self._pos < len(self._order) else None
+        return i
+
+    def column(self, default):
+        return [default] * len(self.pid)
+
+    def finish(self, i, end):
+        self.completed[i] = end
+
+class _Column(dict):
+    """Per-process dict column reading `default` for rows it has not stored."""
+    __slots__ = ("default",)
+
+    def __init__(self, default):
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, key):
+        return self.default
+
+def _stream_record(rec):
+    if isinstance(rec, Process):
+        return rec.pid, rec.arrival, rec.cpu_burst, rec.priority, rec.queue_level, rec.affinity
+    return (str(rec["pid"]), int(rec["arrival"]), int(rec["burst"]), int(rec.get("priority", 0)),
+            int(rec.get("queue_level", 0)), int(rec.get("affinity", NOT_SET)))
+
+class _StreamRun:
+    """
+    Engine view of an iterator of processes sorted by arrival. Rows get ids as
+    they are pulled and live in dict columns that finish() clears, so memory
+    follows the ready set; completions queue up in `finished` for the caller.
+    With ties_by_pid, processes arriving together are released by pid (as
+    ProcessTable.sort_index() orders them), which reads one record ahead of
+    each group of equal arrivals.
+    """
+    def __init__(self, records, context_switch=0, ties_by_pid=False):
+        self._records = iter(records)
+        self._ties_by_pid = ties_by_pid
+        self._group, self._ahead, self._last_arrival = deque(), None, None
+        self.pid, self.arrival, self.burst, self.priority, self.queue_level = {}, {}, {}, {}, {}
+        self.affinity, self.remaining, self.started = {}, {}, {}
+        self._columns = [self.pid, self.arrival, self.burst, self.priority,
+                         self.queue_level, self.affinity, self.remaining, self.started]
+        self.finished = []  # (pid, arrival, burst, started, completed)
+        self.dispatcher = Dispatcher(context_switch)
+        self.extra = {}
+        self._seq, self._next, self.next_arrival = 0, None, None
+        self._advance()
+
+    def _read(self):
+        rec = next(self._records, None)
+        if rec is None:
+            return None
+        rec = _stream_record(rec)
+        if self._last_arrival is not None and rec[1] < self._last_arrival:
+            raise ValueError(f"Stream input must be sorted by arrival (process {rec[0]} arrives at {rec[1]})")
+        self._last_arrival = rec[1]
+        return rec
+
+    def _advance(self):
+        if not self._ties_by_pid:
+            rec = self._read()
+        else:
+            if not self._group:
+                rec = self._ahead or self._read()
+                while rec is not None and (not self._group or rec[1] == self._group[0][1]):
+                    self._group.append(rec)
+                    rec = self._read()
+                self._ahead = rec
+                if len(self._group) > 1:
+                    self._group = deque(sorted(self._group, key=lambda r: r[0]))
+            rec = self._group.popleft() if self._group else None
+        self._next, self.next_arrival = rec, (rec[1] if rec is not None else None)
+
+    def pop(self) -> int:
+        i = self._seq
+        self._seq += 1
+        pid, arrival, burst, priority, queue_level, affinity = self._next
+        self.pid[i], self.arrival[i], self.burst[i] = pid, arrival, burst
+        self.priority[i], self.queue_level[i], self.affinity[i] = priority, queue_level, affinity
+        self.remaining[i], self.started[i] = burst, NOT_SET
+        self._advance()
+        return i
+
+    def column(self, default):
+        col = _Column(default)
+        self._columns.append(col)
+        return col
+
+    def finish(self, i, end):
+        self.finished.append((self.pid[i], self.arrival[i], self.burst[i], self.started[i], end))
+        for col in self._columns:
+            col.pop(i, None)
+
+# ------------------------- #
+# Scheduling Engines
+# ------------------------- #
+# Engines are generators over a run state (_TableRun or _StreamRun): they
+# admit processes with state.pop() once state.next_arrival <= time, yield one
+# (code, start, end) per timeline segment and call state.finish(i, end) when
+# a process completes. schedule() collects them into a Timeline,
+# schedule_stream() forwards them as events.
+# Every dispatch goes through state.dispatcher.switch(prev, i, time): a switch
+# to another process yields a CS segment before it runs, and a CPU waiting
+# for arrivals yields an IDLE segment. Arrivals during a switch are admitted
+# once it ends (preemptive policies may then preempt before the run starts).
+
+def _nonpreemptive_engine(state, params, key=None):
+    """FCFS / SJF / non-preemptive Priority: run the ready process with the smallest (key, arrival, pid) to completion."""
+    switch = state.dispatcher.switch
+    pid, arrival, remaining, started = state.pid, state.arrival, state.remaining, state.started
+    key = (lambda i: 0) if key is None else getattr(state, key).__getitem__
+    ready, time, prev = [], 0, None
+    while state.next_arrival is not None or ready:
+        if not ready and state.next_arrival > time:
+            yield IDLE, time, state.next_arrival
+            time = state.next_arrival
+        while state.next_arrival is not None and state.next_arrival <= time:
+            i = state.pop()
+            heapq.heappush(ready, (key(i), arrival[i], pid[i], i))
+        i = heapq.heappop(ready)[3]
+        start = switch(prev, i, time)
+        if start > time:
+            yield CS, time, start
+        started[i], end = start, start + remaining[i]
+        yield i, start, end
+        state.finish(i, end)
+        time, prev = end, i
+
+def _preemptive_engine(state, params, key):
+    """
+    SRTF (key "remaining") / preemptive Priority (key "priority"): the running
+    process is checked at every arrival and preempted when the best ready
+    process has a strictly smaller key.
+    """
+    switch = state.dispatcher.switch
+    pid, arrival, remaining, started = state.pid, state.arrival, state.remaining, state.started
+    key = getattr(state, key).__getitem__
+    ready, time, current, prev = [], 0, None, None
+    while state.next_arrival is not None or ready or current is not None:
+        while state.next_arrival is not None and state.next_arrival <= time:
+            i = state.pop()
+            heapq.heappush(ready, (key(i), arrival[i], pid[i], i))
+        if current is not None and remaining[current] and ready and ready[0][0] < key(current):
+            heapq.heappush(ready, (key(current), arrival[current], pid[current], current))
+            current = None
+        if current is None:
+            if not ready:
+                yield IDLE, time, state.next_arrival
+                time = state.next_arrival
+                continue
+            current = heapq.heappop(ready)[3]
+            start = switch(prev, current, time)
+            prev = current
+            if start > time:
+                yield CS, time, start
+                time = start
+                continue
+        if started[current] == NOT_SET:
+            started[current] = time
+        next_arrival = state.next_arrival
+        if next_arrival is None or time + remaining[current] <= next_arrival:
+            end = time + remaining[current]
+            yield current, time, end
+            state.finish(current, end)
+            current, time = None, end
+        else:
+            yield current, time, next_arrival
+            remaining[current] -= next_arrival - time
+            time = next_arrival
+
+def _round_robin_engine(state, params):
+    quantum = int(params.get("quantum", 4))
+    if quantum <= 0:
+        raise ValueError("Quantum must be > 0")
+    switch = state.dispatcher.switch
+    remaining, started = state.remaining, state.started
+    time, ready_q, prev = 0, deque(), None
+    while state.next_arrival is not None or ready_q:
+        if not ready_q and state.next_arrival > time:
+            yield IDLE, time, state.next_arrival
+            time = state.next_arrival
+        while state.next_arrival is not None and state.next_arrival <= time:
+            ready_q.append(state.pop())
+        i = ready_q.popleft()
+        start = switch(prev, i, time)
+        if start > time:
+            yield CS, time, start
+            time = start
+            while state.next_arrival is not None and state.next_arrival <= time:
+                ready_q.append(state.pop())
+        prev = i
+        if started[i] == NOT_SET:
+            started[i] = time
+        run = min(quantum, remaining[i])
+        if not ready_q and run < remaining[i]:
+            # Running alone (no switches): skip ahead whole quanta up to the first
+            # quantum boundary at or after the next arrival (or until it finishes).
+            if state.next_arrival is not None:
+                run = min(-(-(state.next_arrival - time) // quantum) * quantum, remaining[i])
+            else:
+                run = remaining[i]
+        end = time + run
+        yield i, time, end
+        remaining[i] -= run
+        time = end
+        while state.next_arrival is not None and state.next_arrival <= time:
+            ready_q.append(state.pop())
+        if remaining[i] > 0:
+            ready_q.append(i)
+        else:
+            state.finish(i, end)
+
+def _mlq_stream_engine(state, params):
+    """
+    Static MLQ over a stream: queue 0 runs FCFS as processes arrive; the other
+    queues only run once queue 0 is exhausted, i.e. after the input ends, so
+    their processes are held until then. Levels >= queues never run.
+    """
+    queues = params.get("queues", 3)
+    switch = state.dispatcher.switch
+    pid, arrival, remaining, started = state.pid, state.arrival, state.remaining, state.started
+    queue_level = state.queue_level
+    ready, held, time, free_at, prev = [], [[] for _ in range(queues)], 0, 0, None
+
+    def run(i, time):
+        nonlocal free_at, prev
+        if time > free_at:
+            yield IDLE, free_at, time
+        start = switch(prev, i, time)
+        if start > time:
+            yield CS, time, start
+        started[i], end = start, start + remaining[i]
+        yield i, start, end
+        state.finish(i, end)
+        free_at, prev = end, i
+
+    while state.next_arrival is not None or ready:
+        if not ready:
+            time = max(time, state.next_arrival)
+        while state.next_arrival is not None and state.next_arrival <= time:
+            i = state.pop()
+            level = queue_level[i]
+            if level == 0:
+                heapq.heappush(ready, (arrival[i], pid[i], i))
+            elif 0 < level < queues:
+                held[level].append((arrival[i], pid[i], i))
+            else:
+                state.finish(i, NOT_SET)
+        if not ready:
+            continue
+        yield from run(heapq.heappop(ready)[2], time)
+        time = free_at
+    # the clock may have run ahead to arrivals of held processes
+    for level in held[1:]:
+        level.sort()
+        for arr, _, i in level:
+            yield from run(i, max(free_at, arr))
+
+def _per_level(values, levels):
+    values = list(values)
+    if len(values) < levels:
+        values = (values + [values[-1]] * (levels - len(values)))[:levels]
+    return values
+
+class _SplicedQueue:
+    """FIFO of chained deques, so a whole queue can be appended in O(1)."""
+    __slots__ = ("parts", "size")
+
+    def __init__(self):
+        self.parts, self.size = deque([deque()]), 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, item):
+        self.parts[-1].append(item)
+        self.size += 1
+
+    def splice(self, items: deque):
+        self.parts.append(items)
+        self.parts.append(deque())
+        self.size += len(items)
+
+    def popleft(self):
+        head = self.parts[0]
+        while not head:
+            self.parts.popleft()
+            head = self.parts[0]
+        self.size -= 1
+        return head.popleft()
+
+class _MlfqQueues:
+    """
+    MLFQ ready queues, shared by the single- and multi-core engines.
+    params: levels, quanta (per level), allotments (CPU time a process may use
+    at a level before demotion; defaults to one quantum), boost_period (S:
+    every S time units all queued processes return to level 0; 0 disables).
+    Level selection uses a bitmask of non-empty levels and a boost splices the
+    lower queues onto level 0, so both are independent of the queue lengths.
+    """
+    def __init__(self, state, params):
+        levels = int(params.get("levels", 3))
+        self.quanta = _per_level(params.get("quanta") or [4, 8, 16], levels)
+        self.allotments = _per_level(params.get("allotments") or self.quanta, levels)
+        self.boost_period = int(params.get("boost_period") or 0)
+        if levels <= 0 or min(self.quanta[:levels]) <= 0 or min(self.allotments[:levels]) <= 0:
+            raise ValueError("MLFQ levels, quanta and allotments must be > 0")
+        self.levels = levels
+        self.arrival, self.remaining = state.arrival, state.remaining
+        self.queues = [_SplicedQueue()] + [deque() for _ in range(levels - 1)]
+        self.nonempty = 0  # bit l set <=> queues[l] is non-empty
+        # Per process: current level, CPU used at that level, when it was queued,
+        # and how many boosts had happened then (a lower count means "boosted").
+        self.level, self.used = state.column(0), state.column(0)
+        self.queued_at, self.epoch = state.column(0), state.column(0)
+        self.stats = [
+            {"level": l, "quantum": self.quanta[l], "allotment": self.allotments[l], "entered": 0,
+             "dispatches": 0, "cpu_time": 0, "queued_time": 0, "completed": 0}
+            for l in range(levels)
+        ]
+        self.boost_times = []
+        self.next_boost = self.boost_period if self.boost_period > 0 else None
+
+    def __bool__(self):
+        return self.nonempty != 0
+
+    def push(self, i):
+        """Admit an arriving process at level 0."""
+        self.queues[0].append(i)
+        self.queued_at[i], self.epoch[i] = self.arrival[i], len(self.boost_times)
+        self.stats[0]["entered"] += 1
+        self.nonempty |= 1
+
+    def pop(self, time):
+        """Boost if due, then dequeue from the highest non-empty level."""
+        if self.next_boost is not None and time >= self.next_boost:
+            if self.nonempty:
+                self.boost_times.append(time)
+                for l in range(1, self.levels):
+                    if self.queues[l]:
+                        self.queues[0].splice(self.queues[l])
+                        self.queues[l] = deque()
+                self.nonempty = 1
+            self.next_boost = (time // self.boost_period + 1) * self.boost_period
+        qid = (self.nonempty & -self.nonempty).bit_length() - 1
+        i = self.queues[qid].popleft()
+        if not self.queues[qid]:
+            self.nonempty &= ~(1 << qid)
+        level, stats = self.level, self.stats
+        if self.epoch[i] < len(self.boost_times):
+            boosted_at = self.boost_times[self.epoch[i]]
+            stats[level[i]]["queued_time"] += boosted_at - self.queued_at[i]
+            self.queued_at[i], self.used[i] = boosted_at, 0
+            if level[i]:
+                level[i] = 0
+                stats[0]["entered"] += 1
+        st = stats[qid]
+        st["dispatches"] += 1
+        st["queued_time"] += time - self.queued_at[i]
+        return i
+
+    def slice(self, i):
+        l = self.level[i]
+        return min(self.quanta[l], self.remaining[i], self.allotments[l] - self.used[i])
+
+    def ran(self, i, run):
+        self.stats[self.level[i]]["cpu_time"] += run
+        self.used[i] += run
+
+    def requeue(self, i, time):
+        """Queue a process whose slice ended, demoting it once its allotment is used up."""
+        qid = new_q = self.level[i]
+        if self.used[i] >= self.allotments[qid]:
+            new_q, self.used[i] = min(self.levels - 1, qid + 1), 0
+            if new_q != qid:
+                self.stats[new_q]["entered"] += 1
+        self.level[i] = new_q
+        self.queues[new_q].append(i)
+        self.queued_at[i], self.epoch[i] = time, len(self.boost_times)
+        self.nonempty |= 1 << new_q
+
+    def finish(self, i):
+        self.stats[self.level[i]]["completed"] += 1
+
+    def summary(self):
+        return {"levels": self.stats, "boosts": len(self.boost_times), "boost_period": self.boost_period}
+
+def _mlfq_engine(state, params):
+    """Multilevel Feedback Queue (see _MlfqQueues); per-level statistics go to state.extra["mlfq"]."""
+    ready = _MlfqQueues(state, params)
+    remaining, started = state.remaining, state.started
+    switch = state.dispatcher.switch
+    time, prev = 0, None
+    while state.next_arrival is not None or ready:
+        if not ready and state.next_arrival > time:
+            yield IDLE, time, state.next_arrival
+            time = state.next_arrival
+        while state.next_arrival is not None and state.next_arrival <= time:
+            ready.push(state.pop())
+        i = ready.pop(time)
+        start = switch(prev, i, time)
+        if start > time:
+            yield CS, time, start
+            time = start
+        prev = i
+        if started[i] == NOT_SET:
+            started[i] = time
+        run = ready.slice(i)
+        end = time + run
+        yield i, time, end
+        remaining[i] -= run
+        ready.ran(i, run)
+        time = end
+        while state.next_arrival is not None and state.next_arrival <= time:
+            ready.push(state.pop())
+        if remaining[i] > 0:
+            ready.requeue(i, time)
+        else:
+            ready.finish(i)
+            state.finish(i, end)
+    state.extra["mlfq"] = ready.summary()
+
+# ------------------------- #
+# Multi-core (SMP) Engines
+# ------------------------- #
+# N identical cores share one global ready queue. The ready queue objects
+# below give the policy (push/pop/slice/requeue); _smp_engine drives the
+# cores with heaps of idle cores, busy cores and (for preemptive policies)
+# preemption candidates, so each event costs O(log N) whatever N is.
+# Multi-core engines yield (code, start, end, core).
+
+class _ReadyHeap:
+    """Ready queue ordered by (key, arrival, pid): FCFS (no key), SJF, Priority, SRTF."""
+    def __init__(self, state, key=None):
+        self.heap = []
+        self.pid, self.arrival, self.remaining = state.pid, state.arrival, state.remaining
+        self.key = (lambda i: 0) if key is None else getattr(state, key).__getitem__
+        self.dynamic = key == "remaining"  # SRTF: a running process's key drops as it runs
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, i):
+        heapq.heappush(self.heap, (self.key(i), self.arrival[i], self.pid[i], i))
+
+    def requeue(self, i, time):
+        self.push(i)
+
+    def pop(self, time):
+        return heapq.heappop(self.heap)[3]
+
+    def slice(self, i):
+        return self.remaining[i]
+
+    def ran(self, i, run):
+        pass
+
+    def finish(self, i):
+        pass
+
+    def head(self):
+        return self.heap[0]
+
+    def head_key(self):
+        return self.heap[0][0]
+
+    def steal(self):
+        return heapq.heappop(self.heap)[3]
+
+    def running_key(self, i, start):
+        """Time-invariant ordering key of a process running since `start`."""
+        return self.remaining[i] + start if self.dynamic else self.key(i)
+
+    def key_at(self, running_key, time):
+        return running_key - time if self.dynamic else running_key
+
+class _ReadyFifo:
+    """Round Robin ready queue: FIFO, one quantum per dispatch."""
+    def __init__(self, state, quantum):
+        if quantum <= 0:
+            raise ValueError("Quantum must be > 0")
+        self.queue, self.quantum, self.remaining = deque(), quantum, state.remaining
+
+    def __len__(self):
+        return len(self.queue)
+
+    def push(self, i):
+        self.queue.append(i)
+
+    def requeue(self, i, time):
+        self.queue.append(i)
+
+    def pop(self, time):
+        return self.queue.popleft()
+
+    def slice(self, i):
+        return min(self.quantum, self.remaining[i])
+
+    def ran(self, i, run):
+        pass
+
+    def finish(self, i):
+        pass
+
+def _smp_engine(state, params, ready, cores, preemptive=False):
+    """
+    Free cores take the next process from `ready` (lowest core id first) and
+    run it for ready.slice(i); when the slice ends the process is requeued
+    (after arrivals up to then, as on one core) or completes. With
+    `preemptive`, whenever no core is free the worst running process is
+    preempted if the best ready one has a strictly smaller key (a core still
+    switching is preempted once the switch ends).
+    A dispatch costs the context switch (state.dispatcher, per core), plus
+    migration_cost when the process last ran on another core; with
+    queue_lock > 0 every dispatch also holds the shared run-queue lock for
+    that long, so dispatches serialize (the contention per-core queues
+    avoid). The whole overhead is one CS segment on the core.
+    """
+    switch = state.dispatcher.switch
+    migration_cost = int(params.get("migration_cost", 0))
+    queue_lock = int(params.get("queue_lock", 0))
+    remaining, started = state.remaining, state.started
+    last_core = state.column(NOT_SET)
+    lock_free, migrations = 0, 0
+    idle = list(range(cores))  # heap of free core ids
+    busy = []                  # heap of (slice end or wake-up time, core, serial)
+    running = [None] * cores   # core -> (i, start, end) of its current slice
+    prev = [None] * cores      # core -> process it last dispatched
+    came_from = [NOT_SET] * cores  # core -> previous last_core of the running process
+    free_from = [0] * cores    # core -> when it last became free
+    serial = [0] * cores       # bumped per slice, so entries of ended slices go stale
+    victims = []               # heap of (-running key, core, serial)
+    time = 0
+    while True:
+        while True:
+            while ready and idle:
+                c = heapq.heappop(idle)
+                i = ready.pop(time)
+                if time > free_from[c]:
+                    yield IDLE, free_from[c], time, c
+                start = time
+                if queue_lock:
+                    start = lock_free = max(start, lock_free) + queue_lock
+                start = switch(prev[c], i, start)
+                came_from[c] = last_core[i]
+                if last_core[i] != c:
+                    if last_core[i] != NOT_SET:
+                        migrations += 1
+                        start += migration_cost
+                    last_core[i] = c
+                prev[c] = i
+                if start > time:
+                    yield CS, time, start, c
+                end = start + ready.slice(i)
+                running[c] = (i, start, end)
+                serial[c] += 1
+                heapq.heappush(busy, (end, c, serial[c]))
+                if preemptive:
+                    heapq.heappush(victims, (-ready.running_key(i, start), c, serial[c]))
+            if not (preemptive and ready and victims):
+                break
+            # Preempt the worst running process if the best ready one beats it;
+            # the freed core then takes the best ready process and we look again.
+            switching = []
+            while victims:
+                neg_key, c, s = victims[0]
+                if s != serial[c]:
+                    heapq.heappop(victims)  # ended or already preempted
+                    continue
+                if not ready.head_key() < ready.key_at(-neg_key, time):
+                    break
+                heapq.heappop(victims)
+                i, start, _ = running[c]
+                if start > time:  # still switching in: preempt when the switch ends
+                    switching.append((neg_key, c, s))
+                    heapq.heappush(busy, (start, c, s))
+                    continue
+                running[c] = None
+                serial[c] += 1
+                if time > start:
+                    if started[i] == NOT_SET:
+                        started[i] = start
+                    yield i, start, time, c
+                    remaining[i] -= time - start
+                elif came_from[c] != c and (came_from[c] == NOT_SET or not migration_cost):
+                    # never ran here and the move cost nothing: not a migration after all
+                    # (a charged migration_cost stands, so it is never paid twice for one move)
+                    last_core[i] = came_from[c]
+                    migrations -= came_from[c] != NOT_SET
+                ready.requeue(i, time)
+                free_from[c] = time
+                heapq.heappush(idle, c)
+                break
+            for entry in switching:
+                heapq.heappush(victims, entry)
+            if not idle:
+                break
+
+        next_time = state.next_arrival
+        if busy and (next_time is None or busy[0][0] < next_time):
+            next_time = busy[0][0]
+        if next_time is None:
+            break
+        time = max(time, next_time)
+        while state.next_arrival is not None and state.next_arrival <= time:
+            ready.push(state.pop())
+        while busy and busy[0][0] <= time:
+            _, c, s = heapq.heappop(busy)
+            if s != serial[c] or running[c][2] > time:
+                continue  # stale, or a wake-up at the end of a switch
+            i, start, end = running[c]
+            running[c] = None
+            serial[c] += 1
+            if started[i] == NOT_SET:
+                started[i] = start
+            yield i, start, end, c
+            remaining[i] -= end - start
+            ready.ran(i, end - start)
+            if remaining[i] > 0:
+                ready.requeue(i, time)
+            else:
+                ready.finish(i)
+                state.finish(i, end)
+            free_from[c] = end
+            heapq.heappush(idle, c)
+
+    state.extra["topology"] = {"mode": "global", "migrations": migrations,
+                               "migration_cost": migration_cost, "queue_lock": queue_lock}
+
+def _mlq_smp_engine(state, params, cores):
+    """
+    Static MLQ on N cores: the (queue, arrival, pid) order of the single-core
+    run is list-scheduled onto the earliest free core. Needs the whole input.
+    """
+    queues = params.get("queues", 3)
+    switch = state.dispatcher.switch
+    pid, arrival, remaining, started = state.pid, state.arrival, state.remaining, state.started
+    runnable = []
+    while state.next_arrival is not None:
+        i = state.pop()
+        if 0 <= state.queue_level[i] < queues:
+            runnable.append((state.queue_level[i], arrival[i], pid[i], i))
+        else:
+            state.finish(i, NOT_SET)
+    runnable.sort()
+    free = [(0, c) for c in range(cores)]
+    prev = [None] * cores
+    for _, arr, _, i in runnable:
+        free_at, c = heapq.heappop(free)
+        time = max(free_at, arr)
+        if time > free_at:
+            yield IDLE, free_at, time, c
+        start = switch(prev[c], i, time)
+        if start > time:
+            yield CS, time, start, c
+        started[i], end = start, start + remaining[i]
+        yield i, start, end, c
+        state.finish(i, end)
+        prev[c] = i
+        heapq.heappush(free, (end, c))
+
+def _smp_engine_for(state, alg: str, params, cores):
+    topology = params.get("topology", "global")
+    if topology == "per_core":
+        return _percore_engine_for(state, alg, params, cores)
+    if topology != "global":
+        raise ValueError(f"Unknown topology: {topology} (expected global or per_core)")
+    if alg == "FCFS":
+        return _smp_engine(state, params, _ReadyHeap(state), cores)
+    elif alg == "SJF":
+        return _smp_engine(state, params, _ReadyHeap(state, "burst"), cores)
+    elif alg == "SRTF":
+        return _smp_engine(state, params, _ReadyHeap(state, "remaining"), cores, preemptive=True)
+    elif alg == "RR":
+        return _smp_engine(state, params, _ReadyFifo(state, int(params.get("quantum", 4))), cores)
+    elif alg == "PRIORITY":
+        preemptive = params.get("preemptive", True)
+        return _smp_engine(state, params, _ReadyHeap(state, "priority"), cores, preemptive=preemptive)
+    elif alg == "MLQ":
+        return _mlq_smp_engine(state, params, cores)
+    elif alg == "MLFQ":
+        return _mlfq_smp_engine(state, params, cores)
+    raise ValueError(f"Unknown algorithm: {alg}")
+
+def _mlfq_smp_engine(state, params, cores):
+    ready = _MlfqQueues(state, params)
+    yield from _smp_engine(state, params, ready, cores)
+    state.extra["mlfq"] = ready.summary()
+
+class _StampedFifo(_ReadyFifo):
+    """FIFO whose entries carry a shared sequence stamp, so two of them pop in merged order (_CoreQueue)."""
+    def __init__(self, state, quantum, counter):
+        super().__init__(state, quantum)
+        self.counter = counter
+
+    def push(self, i):
+        self.queue.append((next(self.counter), i))
+
+    def requeue(self, i, time):
+        self.push(i)
+
+    def pop(self, time):
+        return self.queue.popleft()[1]
+
+    def head(self):
+        return self.queue[0][0]
+
+    def steal(self):
+        """Take the most recently queued process (the coldest one to leave behind)."""
+        return self.queue.pop()[1]
+
+class _CoreQueue:
+    """One core's run queue: pinned and movable processes in two policy queues, popped in merged order."""
+    __slots__ = ("pinned", "movable")
+
+    def __init__(self, make_queue):
+        self.pinned, self.movable = make_queue(), make_queue()
+
+    def __len__(self):
+        return len(self.pinned) + len(self.movable)
+
+    def push(self, i, pinned):
+        (self.pinned if pinned else self.movable).push(i)
+
+    def pop(self, time):
+        if not self.pinned:
+            return self.movable.pop(time)
+        if not self.movable or self.pinned.head() < self.movable.head():
+            return self.pinned.pop(time)
+        return self.movable.pop(time)
+
+    def slice(self, i):
+        return self.movable.slice(i)
+
+    def head_key(self):
+        return min(q.head_key() for q in (self.pinned, self.movable) if q)
+
+    def running_key_at(self, i, start, time):
+        return self.movable.key_at(self.movable.running_key(i, start), time)
+
+def _percore_engine(state, params, make_queue, cores, preemptive=False):
+    """
+    Per-core run queues. An arrival goes to its affinity core (pinned: it
+    never migrates) or else to the least-loaded core (queued + running); a
+    process whose slice ends is requeued on the core it ran on. A core whose
+    queue is empty steals a movable process from the core with the most of
+    them (params "steal", default on), and every balance_period time units
+    the balancer moves movable processes from the busiest queue to the
+    least-loaded core until their loads differ by at most one. Running on
+    another core than last time costs migration_cost on top of the context
+    switch. Preemptive policies preempt within a core only.
+    """
+    switch = state.dispatcher.switch
+    migration_cost = int(params.get("migration_cost", 0))
+    stealing = bool(params.get("steal", True))
+    balance_period = int(params.get("balance_period") or 0)
+    pid, remaining, started, affinity = state.pid, state.remaining, state.started, state.affinity
+    queues = [_CoreQueue(make_queue) for _ in range(cores)]
+    last_core = state.column(NOT_SET)
+    load = [0] * cores                       # queued + running, for placement
+    least = [(0, c) for c in range(cores)]   # lazy min-heap of (load, core)
+    most = []                                # lazy max-heap of (-movable queued, core)
+    idle = list(range(cores))                # lazy heap of cores waiting for work
+    waiting = [True] * cores
+    busy = []                                # heap of (slice end or wake-up time, core, serial)
+    running = [None] * cores                 # core -> (i, start, end) of its current slice
+    prev = [None] * cores                    # core -> process it last dispatched
+    came_from = [NOT_SET] * cores            # core -> previous last_core of the running process
+    free_from = [0] * cores                  # core -> when it last became free
+    serial = [0] * cores
+    out = []                                 # IDLE/CS segments of dispatches, yielded by the main loop
+    per_core = [{"dispatches": 0, "migrations_in": 0, "steals": 0, "queue_area": 0} for _ in range(cores)]
+    area_since = [0] * cores
+    counts = {"migrations": 0, "steals": 0, "balance_moves": 0}
+    queued, time = 0, 0
+    next_balance = balance_period if balance_period > 0 else None
+
+    def account(c):
+        per_core[c]["queue_area"] += len(queues[c]) * (time - area_since[c])
+        area_since[c] = time
+
+    def add_load(c, delta):
+        nonlocal least
+        load[c] += delta
+        heapq.heappush(least, (load[c], c))
+        if len(least) > 4 * cores + 64:  # drop the stale entries
+            least = [(l, c) for c, l in enumerate(load)]
+            heapq.heapify(least)
+
+    def least_loaded():
+        while least[0][0] != load[least[0][1]]:
+            heapq.heappop(least)
+        return least[0][1]
+
+    def note_movable(c):
+        nonlocal most
+        heapq.heappush(most, (-len(queues[c].movable), c))
+        if len(most) > 4 * cores + 64:
+            most = [(-len(q.movable), c) for c, q in enumerate(queues) if q.movable]
+            heapq.heapify(most)
+
+    def busiest():
+        while most:
+            neg, c = most[0]
+            if -neg == len(queues[c].movable) and neg:
+                return c
+            heapq.heappop(most)
+        return None
+
+    def enqueue(c, i):
+        nonlocal queued
+        account(c)
+        pinned = affinity[i] != NOT_SET
+        queues[c].push(i, pinned)
+        queued += 1
+        add_load(c, 1)
+        if not pinned:
+            note_movable(c)
+
+    def dequeue(c):
+        nonlocal queued
+        account(c)
+        i = queues[c].pop(time)
+        queued -= 1
+        add_load(c, -1)
+        note_movable(c)
+        return i
+
+    def take_movable(c):
+        nonlocal queued
+        account(c)
+        i = queues[c].movable.steal()
+        queued -= 1
+        add_load(c, -1)
+        note_movable(c)
+        return i
+
+    def steal(thief):
+        victim = busiest()
+        if victim is None:
+            return None
+        counts["steals"] += 1
+        per_core[thief]["steals"] += 1
+        return take_movable(victim)
+
+    def dispatch(c, i):
+        waiting[c] = False
+        if time > free_from[c]:
+            out.append((IDLE, free_from[c], time, c))
+        start = switch(prev[c], i, time)
+        came_from[c] = last_core[i]
+        if last_core[i] != c:
+            if last_core[i] != NOT_SET:
+                counts["migrations"] += 1
+                per_core[c]["migrations_in"] += 1
+                start += migration_cost
+            last_core[i] = c
+        prev[c] = i
+        if start > time:
+            out.append((CS, time, start, c))
+        end = start + queues[c].slice(i)
+        running[c] = (i, start, end)
+        serial[c] += 1
+        heapq.heappush(busy, (end, c, serial[c]))
+        add_load(c, 1)
+        per_core[c]["dispatches"] += 1
+
+    def check(c):
+        """Start waiting core c, or preempt its process if the head of its queue beats it."""
+        if waiting[c]:
+            if queues[c]:
+                dispatch(c, dequeue(c))
+            return
+        if not preemptive or running[c] is None or not queues[c]:
+            return
+        i, start, end = running[c]
+        q = queues[c]
+        if end <= time or not q.head_key() < q.running_key_at(i, start, time):
+            return
+        if start > time:  # still switching in: look again when the switch ends
+            heapq.heappush(busy, (start, c, serial[c]))
+            return
+        running[c] = None
+        serial[c] += 1
+        add_load(c, -1)
+        if time > start:
+            if started[i] == NOT_SET:
+                started[i] = start
+            out.append((i, start, time, c))
+            remaining[i] -= time - start
+        elif came_from[c] != c and (came_from[c] == NOT_SET or not migration_cost):
+            # never ran here and the move cost nothing: not a migration after all
+            # (a charged migration_cost stands, so it is never paid twice for one move)
+            last_core[i] = came_from[c]
+            if came_from[c] != NOT_SET:
+                counts["migrations"] -= 1
+                per_core[c]["migrations_in"] -= 1
+        enqueue(c, i)
+        free_from[c] = time
+        dispatch(c, dequeue(c))
+
+    def core_free(c):
+        if queues[c]:
+            dispatch(c, dequeue(c))
+            return
+        i = steal(c) if stealing else None
+        if i is None:
+            waiting[c] = True
+            heapq.heappush(idle, c)
+        else:
+            dispatch(c, i)
+
+    def place(i):
+        c = affinity[i]
+        if c == NOT_SET:
+            c = least_loaded()
+        elif not 0 <= c < cores:
+            raise ValueError(f"Process {pid[i]} has affinity {c} but only {cores} cores exist")
+        enqueue(c, i)
+        return c
+
+    def balance():
+        while True:
+            src = busiest()
+            if src is None:
+                return
+            dst = least_loaded()
+            if load[src] - load[dst] <= 1:
+                return
+            enqueue(dst, take_movable(src))
+            counts["balance_moves"] += 1
+            if waiting[dst]:
+                dispatch(dst, dequeue(dst))
+
+    while True:
+        while stealing and idle and queued:
+            c = idle[0]
+            if not waiting[c]:
+                heapq.heappop(idle)
+                continue
+            i = steal(c)
+            if i is None:
+                break
+            heapq.heappop(idle)
+            dispatch(c, i)
+        if out:
+            yield from out
+            out.clear()
+
+        next_time = state.next_arrival
+        if busy and (next_time is None or busy[0][0] < next_time):
+            next_time = busy[0][0]
+        if next_balance is not None and queued and (next_time is None or next_balance < next_time):
+            next_time = next_balance
+        if next_time is None:
+            break
+        time = max(time, next_time)
+
+        placed = set()
+        while state.next_arrival is not None and state.next_arrival <= time:
+            placed.add(place(state.pop()))
+        for c in sorted(placed):  # all arrivals at `time` are queued before any is picked
+            check(c)
+
+        woken = []
+        while busy and busy[0][0] <= time:
+            _, c, s = heapq.heappop(busy)
+            if s != serial[c]:
+                continue
+            i, start, end = running[c]
+            if end > time:  # a wake-up at the end of a switch
+                woken.append(c)
+                continue
+            running[c] = None
+            serial[c] += 1
+            add_load(c, -1)
+            if started[i] == NOT_SET:
+                started[i] = start
+            yield i, start, end, c
+            remaining[i] -= end - start
+            if remaining[i] > 0:
+                enqueue(c, i)
+            else:
+                state.finish(i, end)
+            free_from[c] = end
+            core_free(c)
+        for c in woken:
+            check(c)
+
+        if next_balance is not None and time >= next_balance:
+            balance()
+            next_balance = (time // balance_period + 1) * balance_period
+        if out:
+            yield from out
+            out.clear()
+
+    for c in range(cores):
+        account(c)
+    state.extra["topology"] = dict(
+        counts, mode="per_core", migration_cost=migration_cost, steal=stealing, balance_period=balance_period,
+        per_core=[
+            {"dispatches": pc["dispatches"], "migrations_in": pc["migrations_in"], "steals": pc["steals"],
+             "avg_queue_length": pc["queue_area"] / time if time else 0}
+            for pc in per_core
+        ])
+
+def _percore_engine_for(state, alg: str, params, cores):
+    if alg == "FCFS":
+        return _percore_engine(state, params, lambda: _ReadyHeap(state), cores)
+    elif alg == "SJF":
+        return _percore_engine(state, params, lambda: _ReadyHeap(state, "burst"), cores)
+    elif alg == "SRTF":
+        return _percore_engine(state, params, lambda: _ReadyHeap(state, "remaining"), cores, preemptive=True)
+    elif alg == "RR":
+        quantum, counter = int(params.get("quantum", 4)), itertools.count()
+        return _percore_engine(state, params, lambda: _StampedFifo(state, quantum, counter), cores)
+    elif alg == "PRIORITY":
+        preemptive = params.get("preemptive", True)
+        return _percore_engine(state, params, lambda: _ReadyHeap(state, "priority"), cores, preemptive=preemptive)
+    elif alg in ("MLQ", "MLFQ"):
+        raise ValueError(f"{alg} has no per_core topology (supported: FCFS, SJF, SRTF, RR, PRIORITY)")
+    raise ValueError(f"Unknown algorithm: {alg}")
+
+# ------------------------- #
+# Scheduling Implementations
+# ------------------------- #
+def _sequential_starts(arrival, burst, gap):
+    """
+    Start times of a non-preemptive run in the given order, where each start
+    after the first is max(arrival, previous end) + gap (the context switch)
+    and the clock starts at 0.
+    Closed form: shifting arrivals after the first by gap gives
+    start_i = max(arrival'_i, previous end + gap), and with
+    P_i = sum_{k<i}(burst_k + gap), start_i = P_i + max(0, max_{k<=i}(arrival'_k - P_k)).
+    """
+    shifted = arrival + gap
+    shifted[:1] = arrival[:1]
+    offset = np.zeros(len(arrival), dtype=np.int64)
+    np.cumsum((burst + gap)[:-1], out=offset[1:])
+    return offset + np.maximum(np.maximum.accumulate(shifted - offset), 0)
+
+def _sequential_starts_py(arrival, burst, gap):
+    """Loop version of _sequential_starts (reference for equivalence tests)."""
+    starts, time = [], 0
+    for k, (arr, b) in enumerate(zip(arrival.tolist(), burst.tolist())):
+        time = max(time, arr) + (gap if k else 0)
+        starts.append(time)
+        time += b
+    return np.asarray(starts, dtype=np.int64)
+
+def _run_in_order(table: ProcessTable, run_order: np.ndarray, params, metrics_order=None):
+    """Timeline (with IDLE/CS segments), metrics and dispatcher summary of running `run_order` back to back (FCFS and static MLQ)."""
+    dispatcher = Dispatcher(params.get("context_switch", 0))
+    gap = max(dispatcher.context_switch_time, 0)
+    kernel = _sequential_starts if params.get("vectorized", True) else _sequential_starts_py
+    with phase("scheduler_engine"):
+        arrival, burst = table.arrival[run_order], table.burst[run_order]
+        start = kernel(arrival, burst, gap) if len(run_order) else np.zeros(0, np.int64)
+        end = start + burst
+        started = np.full(len(table), NOT_SET, np.int64)
+        completed = np.full(len(table), NOT_SET, np.int64)
+        started[run_order], completed[run_order] = start, end
+        dispatcher.add_switches(max(len(run_order) - 1, 0))
+
+        # Each dispatch is [IDLE][CS]run: idle from the previous end to the
+        # dispatch time, then the switch; interleave the three and drop the empty ones.
+        prev_end = np.zeros_like(start)
+        prev_end[1:] = end[:-1]
+        switch_at = start - np.where(np.arange(len(start)) > 0, gap, 0)
+        code = np.column_stack((np.full(len(start), IDLE), np.full(len(start), CS), run_order))
+        seg_start = np.column_stack((prev_end, switch_at, start))
+        seg_end = np.column_stack((switch_at, start, end))
+        keep = (seg_end > seg_start) | (code >= 0)
+        timeline = Timeline.from_arrays(table.pid, code[keep], seg_start[keep], seg_end[keep])
+    order = run_order if metrics_order is None else metrics_order
+    with phase("scheduler_metrics"):
+        metrics = compute_table_metrics(table, started, completed, timeline, order)
+    return {"timeline": timeline, "metrics": metrics, "dispatcher_summary": dispatcher.summary()}
+
+def schedule_fcfs(process_list: List[Process], params):
+    table = as_process_table(process_list)
+    return _run_in_order(table, table.sort_index(), params)
+
+def _run_engine(table: ProcessTable, engine, params, order, metrics_order=None, **kwargs):
+    """Run an engine over the table rows in `order` and collect its Timeline, metrics and dispatcher summary."""
+    state = _TableRun(table, order, params.get("context_switch", 0))
+    timeline = Timeline(table.pid)
+    append = timeline.append
+    segments = engine(state, params, **kwargs)
+    with phase("scheduler_engine"):
+        if params.get("coalesce"):
+            codes, ends = timeline.code, timeline.end
+            for code, start, end in segments:
+                if codes and code == codes[-1] and start == ends[-1]:
+                    ends[-1] = end
+                else:
+                    append(code, start, end)
+        else:
+            for code, start, end in segments:
+                append(code, start, end)
+    with phase("scheduler_metrics"):
+        metrics = compute_table_metrics(table, state.started, state.completed, timeline, metrics_order)
+    metrics.update(state.extra)
+    return {"timeline": timeline, "metrics": metrics, "dispatcher_summary": state.dispatcher.summary()}
+
+def schedule_sjf_nonpreemptive(process_list: List[Process], params):
+    table = as_process_table(process_list)
+    events = table.order(by_pid=False)
+    return _run_engine(table, _nonpreemptive_engine, params, events, events, key="burst")
+
+def schedule_srtf(process_list: List[Process], params):
+    table = as_process_table(process_list)
+    return _run_engine(table, _preemptive_engine, params, table.order(by_pid=False), key="remaining")
+
+def schedule_round_robin(process_list: List[Process], params):
+    table = as_process_table(process_list)
+    order = table.order()
+    return _run_engine(table, _round_robin_engine, params, order, order)
+
+def schedule_priority_generic(process_list: List[Process], params, preemptive=True):
+    table = as_process_table(process_list)
+    engine = _preemptive_engine if preemptive else _nonpreemptive_engine
+    return _run_engine(table, engine, params, table.order(by_pid=False), key="priority")
+
+def schedule_mlq(process_list: List[Process], params):
+    """Static MLQ: queue 0 runs to exhaustion (FCFS), then queue 1, ...; levels >= queues never run."""
+    queues = params.get("queues", 3)
+    table = as_process_table(process_list)
+    in_range = (table.queue_level >= 0) & (table.queue_level < queues)
+    run_order = np.lexsort((np.asarray(table.pid), table.arrival, table.queue_level))
+    run_order = run_order[in_range[run_order]]
+    return _run_in_order(table, run_order, params, metrics_order=table.sort_index())
+
+def schedule_mlfq(process_list: List[Process], params):
+    """Multilevel Feedback Queue (see _mlfq_engine for params); adds metrics["mlfq"]."""
+    table = as_process_table(process_list)
+    order = table.order()
+    return _run_engine(table, _mlfq_engine, params, order, order)
+
+# ------------------------- #
+# Public API
+# ------------------------- #
+def schedule_smp(process_list, algorithm: str, params):
+    """
+    Run `algorithm` on params["cores"] cores. params["topology"] picks one
+    global ready queue ("global", default; queue_lock serializes dispatches)
+    or per-core run queues ("per_core"; steal, balance_period), and both
+    charge migration_cost when a process changes cores. The timeline has a
+    core column (sorted by start, then core); metrics add cores, makespan,
+    per_core, imbalance and topology, and cpu_utilization covers all cores.
+    """
+    cores = int(params.get("cores", 1))
+    if cores <= 0:
+        raise ValueError("cores must be > 0")
+    table = as_process_table(process_list)
+    order = table.order()
+    state = _TableRun(table, order, params.get("context_switch", 0))
+    timeline = Timeline(table.pid, cores=True)
+    code, start, end, core = timeline.code, timeline.start, timeline.end, timeline.core
+    coalesce = bool(params.get("coalesce"))
+    last = [-1] * cores  # position of each core's latest segment
+    with phase("scheduler_engine"):
+        for i, s, e, c in _smp_engine_for(state, algorithm.strip().upper(), params, cores):
+            k = last[c]
+            if coalesce and k >= 0 and code[k] == i and end[k] == s:
+                end[k] = e
+                continue
+            last[c] = len(code)
+            code.append(i)
+            start.append(s)
+            end.append(e)
+            core.append(c)
+        code, start, end = timeline.arrays()
+        core = timeline.cores()
+        by_start = np.lexsort((core, start))
+        timeline = Timeline.from_arrays(table.pid, code[by_start], start[by_start], end[by_start], core[by_start])
+    with phase("scheduler_metrics"):
+        metrics = compute_table_metrics(table, state.started, state.completed, timeline, order, cores=cores)
+    metrics.update(state.extra)
+    metrics["cores"] = cores
+    metrics["makespan"] = metrics["total_time"]
+    metrics["per_core"] = per_core = core_stats(timeline, cores)
+    topology = metrics.get("topology")
+    if topology and "per_core" in topology:
+        for row, extra in zip(per_core, topology.pop("per_core")):
+            row.update(extra)
+    mean_busy = sum(row["busy_time"] for row in per_core) / cores
+    # 0 = every core did the same work; 1 = the busiest core did twice the mean
+    metrics["imbalance"] = max(row["busy_time"] for row in per_core) / mean_busy - 1 if mean_busy else 0
+    return {"timeline": timeline, "metrics": metrics, "dispatcher_summary": state.dispatcher.summary()}
+
+def core_scaling(process_list, algorithm: str, params: Optional[Dict[str, Any]] = None, core_counts=(1, 2, 4, 8)):
+    """
+    Makespan, throughput and utilization of `algorithm` for each core count;
+    speedup and efficiency are relative to the first entry of core_counts.
+    """
+    table = as_process_table(process_list)
+    rows, base = [], None
+    for cores in core_counts:
+        m = schedule(table, algorithm, dict(params or {}, cores=cores))["metrics"]
+        base = base or (core_counts[0], m["total_time"])
+        speedup = base[1] / m["total_time"] if m["total_time"] else 0
+        rows.append({
+            "cores": cores, "makespan": m["total_time"], "throughput": m["throughput"],
+            "cpu_utilization": m["cpu_utilization"], "avg_waiting": m["avg_waiting"],
+            "avg_turnaround": m["avg_turnaround"], "speedup": speedup,
+            "efficiency": speedup * base[0] / cores
+        })
+    return rows
+
+def grid_points(grid) -> List[Dict[str, Any]]:
+    """Cartesian product of {param: [values]} as a list of param dicts; a list of dicts is copied as is."""
+    if isinstance(grid, Mapping):
+        names = list(grid)
+        return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+    return [dict(point) for point in grid]
+
+def sweep_row(result) -> Dict[str, Any]:
+    """Aggregate metrics of one schedule() result (the per-point row of sweep())."""
+    m = result["metrics"]
+    response = m["per_process"].columns[2]
+    response = response[response != NOT_SET]
+    return {
+        "avg_waiting": m["avg_waiting"], "avg_turnaround": m["avg_turnaround"],
+        "avg_response": float(response.mean()) if len(response) else 0.0,
+        "p99_response": float(np.percentile(response, 99)) if len(response) else 0.0,
+        "cpu_utilization": m["cpu_utilization"], "throughput": m["throughput"],
+        "total_time": m["total_time"],
+        "context_switches": result["dispatcher_summary"]["context_switches"],
+        "context_switch_time": result["dispatcher_summary"]["context_switch_time_total"]
+    }
+
+def sweep(process_list, algorithm: str, grid, params: Optional[Dict[str, Any]] = None):
+    """
+    Run `algorithm` at every point of `grid` ({param: [values]} or a list of
+    param dicts, e.g. quantum, context_switch or MLFQ quanta) on top of
+    params. The table is built and sorted once and shared by all points.
+    Returns one row per point: the point's values plus sweep_row() metrics.
+    """
+    table = as_process_table(process_list)
+    table.sort_index()
+    table.sort_index(by_pid=False)
+    rows = []
+    for point in grid_points(grid):
+        result = schedule(table, algorithm, dict(params or {}, **point))
+        rows.append(dict(point, **sweep_row(result)))
+    return rows
+
+def schedule(process_list, algorithm: str, params: Optional[Dict[str, Any]] = None):
+    """
+    process_list: ProcessTable or list of Process (copied into a table).
+    params["cores"] > 1 runs the multi-core simulation (schedule_smp).
+    params["coalesce"] merges adjacent segments of the same process (on the
+    same core) as they are produced, e.g. SRTF slices split at arrivals
+    without a preemption, or RR quanta of a process running alone.
+    """
+    if params is None:
+        params = {}
+    if int(params.get("cores", 1)) > 1:
+        return schedule_smp(process_list, algorithm, params)
+    alg = algorithm.strip().upper()
+    if alg == "FCFS":
+        return schedule_fcfs(process_list, params)
+    elif alg == "SJF":
+        return schedule_sjf_nonpreemptive(process_list, params)
+    elif alg == "SRTF":
+        return schedule_srtf(process_list, params)
+    elif alg == "RR":
+        return schedule_round_robin(process_list, params)
+    elif alg == "PRIORITY":
+        return schedule_priority_generic(process_list, params, params.get("preemptive", True))
+    elif alg == "MLQ":
+        return schedule_mlq(process_list, params)
+    elif alg == "MLFQ":
+        return schedule_mlfq(process_list, params)
+    else:
+        raise ValueError(f"Unknown algorithm: {alg}")
+
+def _stream_engine(state, alg: str, params):
+    if alg == "FCFS":
+        return _nonpreemptive_engine(state, params)
+    elif alg == "SJF":
+        return _nonpreemptive_engine(state, params, key="burst")
+    elif alg == "SRTF":
+        return _preemptive_engine(state, params, key="remaining")
+    elif alg == "RR":
+        return _round_robin_engine(state, params)
+    elif alg == "PRIORITY":
+        if params.get("preemptive", True):
+            return _preemptive_engine(state, params, key="priority")
+        return _nonpreemptive_engine(state, params, key="priority")
+    elif alg == "MLQ":
+        return _mlq_stream_engine(state, params)
+    elif alg == "MLFQ":
+        return _mlfq_engine(state, params)
+    raise ValueError(f"Unknown algorithm: {alg}")
+
+# Policies whose table mode admits equal arrivals by pid (ProcessTable.order());
+# the others keep input order (order(by_pid=False)). Multi-core runs always use pid.
+_PID_TIE_BREAK = ("FCFS", "RR", "MLQ", "MLFQ")
+
+def schedule_stream(processes, algorithm: str, params: Optional[Dict[str, Any]] = None):
+    """
+    Streaming mode of schedule(). `processes` is an iterable of Process objects
+    or {pid, arrival, burst, priority, queue_level} dicts sorted by arrival
+    (ValueError otherwise); it is consumed lazily. Yields event dicts:
+      {"type": "segment", "pid", "start", "end"}          as segments are produced (pid "CS"/"IDLE"
+                                                          for context switches and idle time)
+      {"type": "process", "pid", "waiting", "turnaround", "response", "completion"}
+                                                          when a process completes
+      {"type": "summary", "metrics": {...}, "dispatcher_summary": {...}}
+                                                          last, the aggregate metrics
+    Only the ready set and running totals are kept in memory (static MLQ also
+    holds queues > 0 until the input ends, since they only run after queue 0).
+    Ties in arrival are broken as in schedule(): by pid for FCFS, RR, MLQ,
+    MLFQ and multi-core runs, by input order for SJF, SRTF and PRIORITY.
+    Unlike schedule(), averages count every process, even with repeated pids.
+    With params["cores"] > 1, segment events carry a "core" and utilization
+    covers all cores. With params["coalesce"], a segment is held back until
+    the next segment on its core shows it cannot grow (or a process completes).
+    """
+    params = params or {}
+    cores = int(params.get("cores", 1))
+    alg = algorithm.strip().upper()
+    state = _StreamRun(processes, params.get("context_switch", 0),
+                       ties_by_pid=cores > 1 or alg in _PID_TIE_BREAK)
+    if cores > 1:
+        engine = _smp_engine_for(state, alg, params, cores)
+    else:
+        engine = _stream_engine(state, alg, params)
+    pids, finished = state.pid, state.finished
+    totals = {"count": 0, "waiting": 0, "turnaround": 0, "busy": 0, "end": 0}
+    coalesce = bool(params.get("coalesce"))
+    pending = {}  # core -> (code, event) of the segment that may still grow
+
+    def completions():
+        for pid, arrival, burst, first, done in finished:
+            turnaround = done - arrival if done != NOT_SET else 0
+            totals["count"] += 1
+            totals["waiting"] += turnaround - burst
+            totals["turnaround"] += turnaround
+            yield {"type": "process", "pid": pid, "waiting": turnaround - burst, "turnaround": turnaround,
+                   "response": first - arrival if first != NOT_SET else None,
+                   "completion": done if done != NOT_SET else None}
+        finished.clear()
+
+    for code, start, end, *core in engine:
+        if finished:
+            # a completed process's last segment goes out before its completion event
+            done = [key for key, (code_, _) in pending.items() if code_ >= 0 and code_ not in pids]
+            yield from sorted((pending.pop(key)[1] for key in done), key=lambda e: e["start"])
+            yield from completions()
+        totals["end"] = max(totals["end"], end)
+        if code >= 0:
+            totals["busy"] += end - start
+        key = core[0] if core else None
+        if coalesce:
+            last = pending.get(key)
+            if last is not None:
+                if last[0] == code and last[1]["end"] == start:
+                    last[1]["end"] = end
+                    continue
+                yield last[1]
+        if code >= 0:
+            event = {"type": "segment", "pid": pids[code], "start": start, "end": end}
+        else:
+            event = {"type": "segment", "pid": _SPECIAL_NAMES[code], "start": start, "end": end}
+        if core:
+            event["core"] = key
+        if coalesce:
+            pending[key] = (code, event)
+        else:
+            yield event
+    yield from sorted((event for _, event in pending.values()), key=lambda e: e["start"])
+    yield from completions()
+
+    count, total_time = totals["count"], totals["end"]
+    metrics = {
+        "processes": count,
+        "avg_waiting": totals["waiting"] / count if count else 0,
+        "avg_turnaround": totals["turnaround"] / count if count else 0,
+        "throughput": count / total_time if total_time > 0 else 0,
+        "cpu_utilization": totals["busy"] / (cores * total_time) if total_time > 0 else 0,
+        "total_time": total_time
+    }
+    metrics.update(state.extra)
+    yield {"type": "summary", "metrics": metrics, "dispatcher_summary": state.dispatcher.summary()}
+
+def iter_csv_records(csv_path: str, default_burst=0, default_priority=0):
+    """Yield {pid, arrival, burst, priority, queue_level, affinity} rows of a workload CSV one at a time."""
+    def pick(row, names, default):
+        for name in names:
+            value = (row.get(name) or "").strip()
+            if value:
+                return value
+        return default
+    with open(csv_path, newline="") as f:
+        for i, row in enumerate(csv.DictReader(f, skipinitialspace=True)):
+            yield {
+                "pid": pick(row, ("PID", "pid"), f"P{i + 1}"),
+                "arrival": int(float(pick(row, ("ArrivalTime", "arrival"), 0))),
+                "burst": int(float(pick(row, ("BurstTime", "burst"), default_burst))),
+                "priority": int(float(pick(row, ("Priority", "priority"), default_priority))),
+                "queue_level": int(float(pick(row, ("QueueLevel", "queue_level"), 0))),
+                "affinity": int(float(pick(row, ("Affinity", "affinity"), NOT_SET)))
+            }
+
+def write_stream(events, f):
+    """Write schedule_stream() events to an open file as JSON Lines; returns the summary metrics."""
+    encode = json.JSONEncoder(default=json_default, separators=(",", ":")).encode
+    quote = json.encoder.encode_basestring_ascii
+    summary = None
+    for event in events:
+        if event["type"] == "segment" and "core" not in event:  # the bulk of the stream: format directly
+            f.write('{"type":"segment","pid":%s,"start":%d,"end":%d}\n'
+                    % (quote(event["pid"]), event["start"], event["end"]))
+            continue
+        f.write(encode(event) + "\n")
+        if event["type"] == "summary":
+            summary = event["metrics"]
+    return summary
+
+# ------------------------- #
+# CLI Entry Point
+# ------------------------- #
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="CPU Scheduling Core Engine")
+    parser.add_argument('--input', required=True, help='CSV or JSON input file')
+    parser.add_argument('--alg', required=True, help='Algorithm name (FCFS, SJF, SRTF, RR, PRIORITY, MLQ, MLFQ)')
+    parser.add_argument('--quantum', type=int, default=4)
+    parser.add_argument('--context-switch', type=int, default=0)
+    parser.add_argument('--queues', type=int, default=3)
+    parser.add_argument('--out', default=None, help='Output JSON filename (optional)')
+    parser.add_argument('--preemptive', action='store_true')
+    parser.add_argument('--cores', type=int, default=1, help='Simulated CPU cores (global ready queue)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream events as JSON Lines (input must be sorted by arrival)')
+    parser.add_argument('--coalesce', action='store_true', help='Merge adjacent segments of the same process')
+    parser.add_argument('--rle', action='store_true', help='Write the timeline in run-length form')
+    args = parser.parse_args()
+
+    OUTPUT_DIR = "outputs"
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    params = {
+        "quantum": args.quantum,
+        "context_switch": args.context_switch,
+        "queues": args.queues,
+        "preemptive": args.preemptive,
+        "cores": args.cores,
+        "coalesce": args.coalesce
+    }
+
+    if args.stream:
+        if args.input.endswith(".csv"):
+            records = iter_csv_records(args.input)
+        else:
+            with open(args.input, 'r') as f:
+                records = json.load(f)
+        out_path = os.path.join(OUTPUT_DIR, args.out or f"{args.alg.lower()}_output.jsonl")
+        with open(out_path, 'w') as f:
+            summary = write_stream(schedule_stream(records, args.alg, params), f)
+        print(f"\n✅ JSON Lines stream saved to: {out_path}")
+        print("\n=== Aggregate Metrics ===")
+        print(f"Average Waiting Time: {summary['avg_waiting']:.2f}")
+        print(f"Average Turnaround Time: {summary['avg_turnaround']:.2f}")
+        print(f"CPU Utilization: {summary['cpu_utilization']*100:.2f}%")
+        print(f"Throughput: {summary['throughput']:.3f}")
+        raise SystemExit(0)
+
+    if args.input.endswith(".csv"):
+        procs = load_process_table(args.input)
+    else:
+        with open(args.input, 'r') as f:
+            data = json.load(f)
+        procs = ProcessTable.from_records(data)
+
+    result = schedule(procs, args.alg, params)
+    if args.rle:
+        result["timeline"] = result["timeline"].to_rle()
+
+    out_file = args.out or f"{args.alg.lower()}_output.json"
+    out_path = os.path.join(OUTPUT_DIR, out_file)
+    with open(out_path, 'w') as f:
+        json.dump(result, f, indent=2, default=json_default)
+    print(f"\n✅ JSON result saved to: {out_path}")
+
+    df = pd.DataFrame(result["metrics"]["per_process"].to_dict()).T
+    print("\n=== Per Process Metrics ===")
+    print(df)
+    print("\n=== Aggregate Metrics ===")
+    print(f"Average Waiting Time: {result['metrics']['avg_waiting']:.2f}")
+    print(f"Average Turnaround Time: {result['metrics']['avg_turnaround']:.2f}")
+    print(f"CPU Utilization: {result['metrics']['cpu_utilization']*100:.2f}%")
+    print(f"Throughput: {result['metrics']['throughput']:.3f}")
+
+    metrics_csv_path = os.path.join(OUTPUT_DIR, f"{args.alg.lower()}_metrics.csv")
+    df.to_csv(metrics_csv_path, index_label="PID")
+    print(f"\n📊 Metrics CSV exported to: {metrics_csv_path}")
     print("\n✅ Execution completed successfully.\n")
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+timeline_index.py — Multi-resolution Timeline Index
+----------------------------------------------------
+Level-of-detail view of one run's timeline for zoomable Gantt charts. The
+index is built once per run in O(segments + bins) and answers a window
+query with at most about `resolution` entries, whatever the trace length:
+
+  level 0    base bins of width w0 = ceil(total_time / BASE_BINS)
+  level k    bins of width w0 * 2^k, each one merging two level k-1 bins
+
+Every bin keeps its busy / idle / context-switch time, the number of
+segments starting in it and its dominant process (most busy time). Level 0
+is exact; above it a bin takes the dominant process of its heavier child
+(or of both when they agree), which is an approximation but fine for drawing.
+A window holding no more than `resolution` segments gets the segments
+themselves instead of bins.
+
+Multi-core timelines are aggregated over all cores (fractions are of
+cores * bin width). save()/load() persist an index as .npz next to the
+run's results, so it is only computed once.
+
+Configuration (environment variables):
+  VSM_TIMELINE_BASE_BINS   number of level-0 bins (default: 65536)
+"""
+
+import math
+import os
+
+import numpy as np
+
+from scheduler_core import CS, IDLE, Timeline
+
+BASE_BINS = int(os.environ.get("VSM_TIMELINE_BASE_BINS", 1 << 16))
+
+_LEVEL_COLUMNS = ("busy", "idle", "cs", "count", "dom_code", "dom_time")
+
+def _merge(level):
+    """Next coarser level: pairs of bins merged (an odd last bin is kept as is)."""
+    n = len(level["busy"])
+    if n % 2:
+        level = {k: np.append(v, -1 if k == "dom_code" else 0) for k, v in level.items()}
+    a = {k: v[0::2] for k, v in level.items()}
+    b = {k: v[1::2] for k, v in level.items()}
+    same = a["dom_code"] == b["dom_code"]
+    first = a["dom_time"] >= b["dom_time"]
+    merged = {k: a[k] + b[k] for k in ("busy", "idle", "cs", "count")}
+    merged["dom_code"] = np.where(same | first, a["dom_code"], b["dom_code"])
+    merged["dom_time"] = np.where(same, a["dom_time"] + b["dom_time"], np.maximum(a["dom_time"], b["dom_time"]))
+    return merged
+
+class TimelineIndex:
+    __slots__ = ("pids", "bin_width", "total_time", "cores", "levels",
+                 "code", "start", "end", "core", "end_prefix")
+
+    def __init__(self, pids, bin_width, total_time, cores, levels, code, start, end, core=None):
+        self.pids = list(pids)
+        self.bin_width = int(bin_width)
+        self.total_time = int(total_time)
+        self.cores = int(cores)
+        self.levels = levels  # [{column: array}], finest first
+        # Segments sorted by start, for windows small enough to return as is
+        self.code, self.start, self.end, self.core = code, start, end, core
+        # Running max of the segment ends: segments before searchsorted(end_prefix, t) end by t
+        self.end_prefix = np.maximum.accumulate(end) if len(end) else end
+
+    # ---- build ---- #
+    @classmethod
+    def build(cls, timeline, base_bins=BASE_BINS) -> "TimelineIndex":
+        timeline = Timeline.from_entries(timeline)
+        code, start, end = timeline.arrays()
+        core = timeline.cores()
+        order = np.argsort(start, kind="stable")
+        code, start, end = code[order], start[order], end[order]
+        core = core[order] if core is not None else None
+        cores = int(core.max()) + 1 if core is not None and len(core) else 1
+        total = int(end.max()) if len(end) else 0
+
+        width = max(1, math.ceil(total / max(int(base_bins), 1)))
+        nbins = max(1, math.ceil(total / width))
+        # Split segments at bin edges: at most segments + bins * cores pieces
+        first = np.minimum(start // width, nbins - 1)
+        last = np.maximum(first, (end - 1) // width)
+        spans = last - first + 1
+        seg = np.repeat(np.arange(len(code)), spans)
+        offsets = np.cumsum(spans) - spans
+        piece_bin = first[seg] + (np.arange(len(seg)) - offsets[seg])
+        piece_dur = np.minimum(end[seg], (piece_bin + 1) * width) - np.maximum(start[seg], piece_bin * width)
+        piece_code = code[seg]
+
+        def total_of(mask):
+            return np.bincount(piece_bin[mask], weights=piece_dur[mask], minlength=nbins).astype(np.int64)
+
+        busy_mask = piece_code >= 0
+        level = {
+            "busy": total_of(busy_mask),
+            "idle": total_of(piece_code == IDLE),
+            "cs": total_of(piece_code == CS),
+            "count": np.bincount(first, minlength=nbins).astype(np.int64),
+            "dom_code": np.full(nbins, -1, dtype=np.int64),
+            "dom_time": np.zeros(nbins, dtype=np.int64)
+        }
+        # Dominant process per bin: busy time summed per (bin, code), then the max per bin
+        if busy_mask.any():
+            keys, inverse = np.unique(piece_bin[busy_mask] * len(timeline.pids) + piece_code[busy_mask],
+                                      return_inverse=True)
+            sums = np.bincount(inverse, weights=piece_dur[busy_mask]).astype(np.int64)
+            bins, codes = np.divmod(keys, len(timeline.pids))
+            ranked = np.lexsort((sums, bins))
+            tops = ranked[np.append(bins[ranked][1:] != bins[ranked][:-1], True)]
+            level["dom_code"][bins[tops]] = codes[tops]
+            level["dom_time"][bins[tops]] = sums[tops]
+
+        levels = [level]
+        while len(levels[-1]["busy"]) > 1:
+            levels.append(_merge(levels[-1]))
+        return cls(timeline.pids, width, total, cores, levels, code, start, end, core)
+
+    # ---- query ---- #
+    def query(self, start=None, end=None, resolution=1000):
+        """
+        Entries visible in [start, end): {"mode": "segments", "segments": [...]}
+        when at most `resolution` segments overlap the window, else
+        {"mode": "bins", "level", "bin_width", "bins": [...]} at the finest
+        level with no more than about `resolution` bins in the window.
+        """
+        resolution = max(int(resolution), 1)
+        t0 = max(int(start) if start is not None else 0, 0)
+        t1 = min(int(end) if end is not None else self.total_time, self.total_time)
+        info = {"start": t0, "end": max(t1, t0), "total_time": self.total_time, "cores": self.cores,
+                "segments_total": len(self.code), "resolution": resolution}
+
+        lo = int(np.searchsorted(self.end_prefix, t0, side="right"))
+        hi = int(np.searchsorted(self.start, t1, side="left"))
+        if t1 <= t0 or hi - lo <= resolution:
+            return dict(info, mode="segments", segments=self._segments(lo, hi, t0) if t1 > t0 else [])
+
+        k = max(0, math.ceil(math.log2((t1 - t0) / (resolution * self.bin_width))))
+        k = min(k, len(self.levels) - 1)
+        width = self.bin_width << k
+        b0, b1 = t0 // width, min(-(-t1 // width), len(self.levels[k]["busy"]))
+        return dict(info, mode="bins", level=k, bin_width=width, bins=self._bins(self.levels[k], b0, b1, width))
+
+    def _segments(self, lo, hi, t0):
+        rows = np.arange(lo, hi)[self.end[lo:hi] > t0]
+        code = self.code[rows].tolist()
+        names = [self.pids[c] if c >= 0 else ("IDLE" if c == IDLE else "CS") for c in code]
+        start, end = self.start[rows].tolist(), self.end[rows].tolist()
+        if self.core is None:
+            return [{"pid": p, "start": s, "end": e} for p, s, e in zip(names, start, end)]
+        core = self.core[rows].tolist()
+        return [{"pid": p, "start": s, "end": e, "core": c} for p, s, e, c in zip(names, start, end, core)]
+
+    def _bins(self, level, b0, b1, width):
+        starts = np.arange(b0, b1, dtype=np.int64) * width
+        ends = np.minimum(starts + width, self.total_time)
+        capacity = np.maximum((ends - starts) * self.cores, 1)
+        busy, idle, cs = (np.round(level[k][b0:b1] / capacity, 4).tolist() for k in ("busy", "idle", "cs"))
+        pids = [self.pids[c] if c >= 0 else None for c in level["dom_code"][b0:b1].tolist()]
+        return [{"start": s, "end": e, "pid": p, "busy": bu, "idle": i, "cs": c, "segments": n}
+                for s, e, p, bu, i, c, n in zip(starts.tolist(), ends.tolist(), pids, busy, idle, cs,
+                                                level["count"][b0:b1].tolist())]
+
+    # ---- persistence ---- #
+    def save(self, path):
+        """Write the index as .npz (atomically: other readers never see a partial file)."""
+        arrays = {"pids": np.array(self.pids, dtype=str),
+                  "meta": np.array([self.bin_width, self.total_time, self.cores], dtype=np.int64),
+                  "level_sizes": np.array([len(level["busy"]) for level in self.levels], dtype=np.int64),
+                  "code": self.code, "start": self.start, "end": self.end}
+        for column in _LEVEL_COLUMNS:
+            arrays[column] = np.concatenate([level[column] for level in self.levels])
+        if self.core is not None:
+            arrays["core"] = self.core
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path) -> "TimelineIndex":
+        with np.load(path) as data:
+            width, total, cores = data["meta"].tolist()
+            bounds = np.cumsum(np.append(0, data["level_sizes"]))
+            columns = {column: data[column] for column in _LEVEL_COLUMNS}
+            levels = [{column: values[a:b] for column, values in columns.items()}
+                      for a, b in zip(bounds[:-1], bounds[1:])]
+            return cls(data["pids"].tolist(), width, total, cores, levels, data["code"], data["start"],
+                       data["end"], data["core"] if "core" in data else None)
@@ -0,0 +1,311 @@
+"""
+worker_pool.py — Parallel Algorithm Execution
+----------------------------------------------
+Long-lived process pool used by api_server to run the algorithms of one
+request side by side. Workers are started once (and pre-import the
+scheduling stack), so a request only pays for pickling the workload.
+
+Timeouts are counted per task from when the pool hands it to a worker, so
+time spent queued behind other requests does not count. A worker cannot be
+interrupted, so a timed-out (or cancelled) task retires the whole pool: new
+work goes to a fresh pool, and the old workers (including the stuck one) are
+terminated once the other tasks still running on them have finished.
+
+Configuration (environment variables):
+  VSM_POOL_WORKERS   worker processes (default: number of CPUs, 1 disables the pool)
+  VSM_ALG_TIMEOUT    per-algorithm timeout in seconds (default: 300)
+  VSM_SWEEP_TIMEOUT  timeout of a parameter sweep / optimizer run in seconds (default: 3600)
+  VSM_RENDER_TIMEOUT timeout of rendering one chart / report in seconds (default: 300)
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import itertools
+import threading
+import time
+import weakref
+
+import runtime
+import metrics_analyzer
+from phase_timer import recording
+
+POOL_WORKERS = int(os.environ.get("VSM_POOL_WORKERS") or os.cpu_count() or 1)
+ALG_TIMEOUT = float(os.environ.get("VSM_ALG_TIMEOUT") or 300)
+SWEEP_TIMEOUT = float(os.environ.get("VSM_SWEEP_TIMEOUT") or 3600)
+RENDER_TIMEOUT = float(os.environ.get("VSM_RENDER_TIMEOUT") or 300)
+
+POLL_INTERVAL = 0.05  # seconds between checks for tasks a worker has picked up
+
+_pool = None
+_inflight = {}     # unfinished futures of the current pool -> submission number
+_retired = {}      # retired pool -> its timed-out futures (not waited for)
+_queued = weakref.WeakKeyDictionary()  # future -> (its pool's _inflight, submission number)
+_submissions = itertools.count()
+_pool_lock = threading.Lock()
+_render_lock = threading.Lock()  # pyplot is not thread-safe: inline renders run one at a time
+
+def _warm_worker():
+    # Importing here keeps pandas/scheduler_core loaded for the pool lifetime
+    import scheduler_core  # noqa: F401
+
+def _start_method():
+    methods = multiprocessing.get_all_start_methods()
+    return "forkserver" if "forkserver" in methods else "spawn"
+
+def _get_pool_locked():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=POOL_WORKERS,
+            mp_context=multiprocessing.get_context(_start_method()),
+            initializer=_warm_worker
+        )
+    return _pool
+
+def get_pool():
+    """Return the shared pool, creating (and warming) it on first use."""
+    with _pool_lock:
+        return _get_pool_locked()
+
+def submit(fn, *args, **kwargs):
+    """Submit fn(*args, **kwargs) to the shared pool; returns (pool, future)."""
+    with _pool_lock:
+        pool = _get_pool_locked()
+        future = pool.submit(fn, *args, **kwargs)
+        inflight = _inflight
+        inflight[future] = next(_submissions)
+        _queued[future] = (inflight, inflight[future])
+    future.add_done_callback(lambda done: _discard(inflight, done))
+    return pool, future
+
+def _discard(inflight, future):
+    with _pool_lock:
+        inflight.pop(future, None)
+
+def _on_worker(future):
+    """
+    True once a worker runs `future`. The pool already marks the next task it
+    queues for the workers as running; workers take tasks in submission order,
+    so a task is on a worker when fewer than POOL_WORKERS earlier ones still run.
+    """
+    if not future.running():
+        return False
+    with _pool_lock:
+        inflight, number = _queued.get(future, ({}, 0))
+        earlier = sum(1 for other, n in inflight.items() if n < number and other.running() and not other.done())
+    return earlier < POOL_WORKERS
+
+def shutdown_pool():
+    global _pool, _inflight
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool, _inflight = None, {}
+
+def _terminate(pool):
+    terminate = getattr(pool, "terminate_workers", None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+        return
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def retire_pool(pool, stuck=()):
+    """
+    Stop submitting to `pool` and terminate its workers in the background once
+    its tasks other than the `stuck` (timed-out) ones are done. Retiring an
+    already retired pool only adds to its stuck tasks.
+    """
+    global _pool, _inflight
+    with _pool_lock:
+        if pool in _retired:
+            _retired[pool].update(stuck)
+            return
+        if _pool is not pool:
+            return
+        others, _pool, _inflight = list(_inflight), None, {}
+        stuck = _retired[pool] = set(stuck)
+    print(f"[WARN] Retiring the worker pool ({len(stuck)} timed-out or cancelled task(s), {len(others) - len(stuck)} still running)")
+
+    def reap():
+        # The other tasks have their own timeouts, none longer than this
+        deadline = time.monotonic() + max(ALG_TIMEOUT, SWEEP_TIMEOUT, RENDER_TIMEOUT)
+        while True:
+            with _pool_lock:
+                running = [future for future in others if not future.done() and future not in stuck]
+            remaining = deadline - time.monotonic()
+            if not running or remaining <= 0:
+                break
+            wait(running, timeout=min(remaining, 1.0), return_when=FIRST_COMPLETED)
+        with _pool_lock:
+            del _retired[pool]
+        _terminate(pool)
+
+    threading.Thread(target=reap, name="vsm-pool-reaper", daemon=True).start()
+
+def as_finished(futures, timeout, checkpoint=None):
+    """
+    Yield (key, future) for {key: future} as each future finishes, or
+    (key, None) once it has been running in a worker for `timeout` seconds.
+    checkpoint() is called at every poll; what it raises propagates.
+    """
+    pending, deadlines = dict(futures), {}
+    while pending:
+        if checkpoint is not None:
+            checkpoint()
+        now = time.monotonic()
+        for key, future in list(pending.items()):
+            if future.done():
+                del pending[key]
+                yield key, future
+            elif key not in deadlines:
+                if _on_worker(future):
+                    deadlines[key] = now + timeout
+            elif now >= deadlines[key]:
+                del pending[key]
+                yield key, None
+        if pending:
+            wait(list(pending.values()), timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+
+def _result(pool, future, timeout, message, checkpoint=None):
+    """
+    Result of one pool task; raises TimeoutError (and retires the pool) past
+    the timeout. If checkpoint() raises while waiting (e.g. a cancelled job),
+    a task already on a worker is stopped the same way and the error propagates.
+    """
+    try:
+        for _, done in as_finished({0: future}, timeout, checkpoint):
+            if done is None:
+                retire_pool(pool, [future])
+                raise TimeoutError(message)
+            return done.result()
+    except BrokenProcessPool:
+        shutdown_pool()
+        raise
+    except Exception:
+        if not future.done() and not future.cancel():  # still running: stop it (no-op after a timeout)
+            retire_pool(pool, [future])
+        raise
+    finally:
+        future.cancel()
+
+def run_algorithms(workload, algorithms, context_switch, params=None, timeout=None, inline=False,
+                   on_result=None):
+    """
+    Run runtime.run_schedule() for every algorithm and return
+    {algorithm: result dict} where failed/timed-out entries are {"error": msg}.
+    The timeout applies to each algorithm, counted from when it starts in a
+    worker (not enforced inline).
+    inline=True runs in the calling process (e.g. so a profiler sees the work).
+    on_result(algorithm) is called as each algorithm finishes; if it raises
+    (e.g. a cancelled job), algorithms that have not started are cancelled.
+    """
+    timeout = ALG_TIMEOUT if timeout is None else timeout
+    on_result = on_result or (lambda algorithm: None)
+    if inline or POOL_WORKERS <= 1:
+        results = {}
+        for algorithm in algorithms:
+            try:
+                results[algorithm] = runtime.run_schedule(workload, algorithm, context_switch, params)
+            except Exception as e:
+                results[algorithm] = {"error": str(e)}
+            on_result(algorithm)
+        return results
+
+    futures, pools = {}, {}
+    for algorithm in algorithms:
+        pools[algorithm], futures[algorithm] = submit(runtime.run_schedule, workload, algorithm,
+                                                      context_switch, params)
+    results = {}
+    try:
+        for algorithm, future in as_finished(futures, timeout):
+            if future is None:
+                retire_pool(pools[algorithm], [futures[algorithm]])
+                results[algorithm] = {"error": f"{algorithm} timed out after {timeout:g}s"}
+            else:
+                try:
+                    results[algorithm] = future.result()
+                except BrokenProcessPool as e:
+                    shutdown_pool()
+                    results[algorithm] = {"error": f"worker pool failed: {e}"}
+                except Exception as e:
+                    results[algorithm] = {"error": str(e)}
+            on_result(algorithm)
+    except BaseException:
+        for future in futures.values():
+            future.cancel()
+        raise
+    return {algorithm: results[algorithm] for algorithm in algorithms}
+
+def run_sweep(workload, algorithm, grid, context_switch, params=None, timeout=None):
+    """
+    Parameter sweep (runtime.run_sweep) with the grid points spread over the
+    pool. The workload is converted and sorted once here; every worker gets
+    the table once with an interleaved share of the points, so cheap and
+    expensive settings (small vs. large quanta) are mixed in each share.
+    Returns the rows in grid order; raises TimeoutError when a share runs
+    longer than the timeout.
+    """
+    timeout = SWEEP_TIMEOUT if timeout is None else timeout
+    table = runtime.to_process_table(workload)
+    table.sort_index()
+    table.sort_index(by_pid=False)
+    points = runtime.scheduler_core.grid_points(grid)
+    shares = min(POOL_WORKERS, len(points))
+    if shares <= 1:
+        return runtime.run_sweep(table, algorithm, points, context_switch, params)
+
+    submitted = [submit(runtime.run_sweep, table, algorithm, points[k::shares], context_switch, params)
+                 for k in range(shares)]
+    futures = {k: future for k, (_, future) in enumerate(submitted)}
+    rows = [None] * len(points)
+    try:
+        for k, future in as_finished(futures, timeout):
+            if future is None:
+                retire_pool(submitted[k][0], list(futures.values()))  # the whole sweep is abandoned
+                raise TimeoutError(f"{algorithm} sweep timed out after {timeout:g}s")
+            rows[k::shares] = future.result()
+    except BrokenProcessPool:
+        shutdown_pool()
+        raise
+    finally:
+        for future in futures.values():
+            future.cancel()
+    return rows
+
+def run_optimizer(workload, algorithm, context_switch, params=None, timeout=None, checkpoint=None, **options):
+    """
+    runtime.run_optimizer() in a pool worker (inline when the pool is
+    disabled). The search is sequential, so it occupies one worker.
+    checkpoint() is checked between evaluations inline; a worker cannot call
+    back, so there it is polled while waiting and a raise stops the search by
+    retiring the pool, as a timeout does. Raises TimeoutError past the timeout.
+    """
+    timeout = SWEEP_TIMEOUT if timeout is None else timeout
+    table = runtime.to_process_table(workload)
+    if POOL_WORKERS <= 1:
+        return runtime.run_optimizer(table, algorithm, context_switch, params, checkpoint=checkpoint, **options)
+    pool, future = submit(runtime.run_optimizer, table, algorithm, context_switch, params, **options)
+    return _result(pool, future, timeout, f"{algorithm} optimization timed out after {timeout:g}s", checkpoint)
+
+def _render(scheduler_output_dir, algorithms, metrics_dir, run_id, filename):
+    with recording() as timings:
+        files = metrics_analyzer.render_artifact(scheduler_output_dir, algorithms, metrics_dir, run_id, filename)
+    return {"files": files, "timings": timings.as_ms()}
+
+def render_artifact(scheduler_output_dir, algorithms, metrics_dir, run_id, filename, timeout=None):
+    """
+    metrics_analyzer.render_artifact() in a pool worker (inline, one render
+    at a time, when the pool is disabled). Returns {"files", "timings"};
+    raises TimeoutError past the timeout.
+    """
+    timeout = RENDER_TIMEOUT if timeout is None else timeout
+    args = (scheduler_output_dir, list(algorithms), metrics_dir, run_id, filename)
+    if POOL_WORKERS <= 1:
+        with _render_lock:
+            return _render(*args)
+    pool, future = submit(_render, *args)
+    return _result(pool, future, timeout, f"Rendering {filename} timed out after {timeout:g}s")